@@ -1,39 +1,115 @@
+import argparse
 import atexit
 import os
+import sys
 
 from flask import Flask
 
 from lib.aruco_logger import ArucoPipelineLogger
 from lib.axis_config_sender import send_axis_config
-from lib.bitmask import init_bitmask
-from lib.camera import init_camera, init_ip_camera, init_rpi_camera
+from lib.bitmask import DEFAULT_MIN_SEND_GAP, init_bitmask
+from lib.camera import (
+    DEFAULT_ARUCO_PROFILE,
+    DEFAULT_ARUCO_RATE_HZ,
+    ffmpeg_capture_options,
+    init_camera,
+    init_ip_camera,
+    init_rpi_camera,
+)
+from lib.camera_process import CAMERA_PROCESS_ARG, start_camera_process
+from lib.camera_process import main as camera_process_main
+from lib.control_process import CONTROL_PROCESS_ARG, init_control_process
+from lib.control_process import main as control_process_main
+from lib.control_telemetry import HISTORY_CAPACITY as CONTROL_HISTORY_CAPACITY
 from lib.control_telemetry import init_control_telemetry
 from lib.controller import Controller
+from lib.event_bus import init_event_bus
 from lib.json_data_handler import JSONDataHandler
 from lib.log_udp_receiver import init_log_stream
-from lib.net_transport import DEFAULT_ROV_HOST
+from lib.mjpeg_server import DEFAULT_MAX_CLIENTS as MJPEG_DEFAULT_MAX_CLIENTS
+from lib.mjpeg_server import init_mjpeg_server
+from lib.net_transport import DEFAULT_ROV_HOST, init_udp_reactor
 from lib.ninedof_receiver import init_imu_receiver
 from lib.resource_receiver import init_resource_receiver
 from lib.runtime_paths import data_dir, data_path, ensure_data_dir
 from lib.setpoint_override import init_setpoint_override
 from lib.system_control_client import SystemControlClient
+from lib.telemetry_store import init_telemetry_store
+from lib.wsgi_server import (
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_REQUEST_WORKERS,
+    DEFAULT_STREAM_WORKERS,
+    serve_production,
+)
 from routes import register_routes
 
+# The packaged executable doubles as the camera and control child processes
+# (see lib.camera_process and lib.control_process).
+if __name__ == "__main__" and sys.argv[1:2] == [CAMERA_PROCESS_ARG]:
+    sys.exit(camera_process_main(sys.argv[2:]))
+if __name__ == "__main__" and sys.argv[1:2] == [CONTROL_PROCESS_ARG]:
+    sys.exit(control_process_main(sys.argv[2:]))
+
 app = Flask(__name__, static_folder="static", template_folder="static/templates")
 ensure_data_dir()
 
-# Start background UDP sender (20 Hz)
-app.config["BITMASK"] = init_bitmask(rate_hz=20.0, host=DEFAULT_ROV_HOST, port=12345)
+# Receivers publish live updates here; /api/stream forwards them to browsers as SSE.
+app.config["EVENT_BUS"] = init_event_bus()
+
+# Receivers write the latest telemetry into memory; data.json is flushed in the background.
+telemetry_flush_interval = float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "1.0"))
+app.config["TELEMETRY_STORE"] = init_telemetry_store(
+    flush_interval=telemetry_flush_interval, event_bus=app.config["EVENT_BUS"]
+)
+
+# All UDP receivers share one selector thread unless UDP_REACTOR is disabled.
+udp_reactor_enabled = os.getenv("UDP_REACTOR", "true").strip().lower() in {"1", "true", "yes", "on"}
+app.config["UDP_REACTOR"] = init_udp_reactor() if udp_reactor_enabled else None
+
+# UPLINK_SEND_ON_CHANGE=true also sends a changed command immediately instead of on the next 20 Hz tick,
+# at most one packet per UPLINK_MIN_SEND_GAP_MS; the 20 Hz sends continue as a keepalive.
+uplink_send_on_change = os.getenv("UPLINK_SEND_ON_CHANGE", "false").strip().lower() in {"1", "true", "yes", "on"}
+uplink_min_send_gap = float(os.getenv("UPLINK_MIN_SEND_GAP_MS", str(DEFAULT_MIN_SEND_GAP * 1000.0))) / 1000.0
 
-# Initialize and start controller handler (60 Hz)
-app.config["CONTROLLER"] = Controller(bitmask_client=app.config["BITMASK"], rate_hz=60.0)
-app.config["CONTROLLER"].start()
+# CONTROL_PROCESS=true moves the controller loop and the uplink sender into their own process,
+# optionally pinned to CONTROL_PROCESS_CPU and with raised priority, away from camera and web work.
+app.config["CONTROL_PROCESS"] = None
+if os.getenv("CONTROL_PROCESS", "false").strip().lower() in {"1", "true", "yes", "on"}:
+    control_process_cpu = os.getenv("CONTROL_PROCESS_CPU", "").strip()
+    app.config["CONTROL_PROCESS"] = init_control_process(
+        rate_hz=20.0,
+        host=DEFAULT_ROV_HOST,
+        port=12345,
+        controller_hz=60.0,
+        cpu=int(control_process_cpu) if control_process_cpu else None,
+        high_priority=os.getenv("CONTROL_PROCESS_HIGH_PRIORITY", "true").strip().lower() in {"1", "true", "yes", "on"},
+        send_on_change=uplink_send_on_change,
+        min_send_gap=uplink_min_send_gap,
+    )
+    app.config["BITMASK"] = app.config["CONTROL_PROCESS"].bitmask
+    app.config["CONTROLLER"] = app.config["CONTROL_PROCESS"].controller
+else:
+    # Start background UDP sender (20 Hz)
+    app.config["BITMASK"] = init_bitmask(
+        rate_hz=20.0,
+        host=DEFAULT_ROV_HOST,
+        port=12345,
+        send_on_change=uplink_send_on_change,
+        min_send_gap=uplink_min_send_gap,
+    )
+    # Initialize and start controller handler (60 Hz)
+    app.config["CONTROLLER"] = Controller(bitmask_client=app.config["BITMASK"], rate_hz=60.0)
+    app.config["CONTROLLER"].start()
+app.config["BITMASK"].set_event_bus(app.config["EVENT_BUS"])
 
 # Start background IMU receiver (UDP port 5002)
-app.config["IMU"] = init_imu_receiver(port=5002)
+app.config["IMU"] = init_imu_receiver(
+    port=5002, data_handler=app.config["TELEMETRY_STORE"], reactor=app.config["UDP_REACTOR"]
+)
 
 # Tracks ordered ARUCO markers for the pipeline challenge.
-app.config["ARUCO_LOGGER"] = ArucoPipelineLogger()
+app.config["ARUCO_LOGGER"] = ArucoPipelineLogger(event_bus=app.config["EVENT_BUS"])
 
 # Load saved IMU axis mapping from config
 _config = JSONDataHandler(file_path=data_path("config.json"))
@@ -55,6 +131,24 @@ send_axis_config(
     host=DEFAULT_ROV_HOST,
 )
 
+# ARUCO detection runs beside each camera's capture thread at most this often (0 = as fast as it keeps up).
+app.config["ARUCO_DETECT_HZ"] = float(os.getenv("ARUCO_DETECT_HZ", str(DEFAULT_ARUCO_RATE_HZ)))
+# Per-camera detector profile: "accurate" (full frame every time), "balanced" or "fast" (downscaled, ROI tracking).
+aruco_profile_default = os.getenv("ARUCO_PROFILE", DEFAULT_ARUCO_PROFILE)
+# Cameras skip detection and JPEG encoding while nobody watches and the ARUCO log is off;
+# with CAMERA_IDLE_RELEASE_S > 0 they also close the capture after that many idle seconds.
+app.config["CAMERA_IDLE_RELEASE_S"] = float(os.getenv("CAMERA_IDLE_RELEASE_S", "0") or "0")
+# CAMERA_PROCESSES=true runs each camera's capture, detection and encoding in its own process, so
+# decoding and ARUCO work cannot hold the GIL against the control loop; frames come back via shared memory.
+app.config["CAMERA_PROCESSES"] = os.getenv("CAMERA_PROCESSES", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _start_camera(kind, init_in_process, **kwargs):
+    if app.config["CAMERA_PROCESSES"]:
+        return start_camera_process(kind, **kwargs)
+    return init_in_process(**kwargs)
+
+
 # Initialize RPi camera stream receiver.
 # The receiver listens locally (0.0.0.0) and accepts RTP/H264 from the RPi sender.
 rpi_cam_port = int(os.getenv("RPI_CAMERA_PORT", "6969"))
@@ -64,7 +158,10 @@ rpi_cam_out_width = int(os.getenv("RPI_CAMERA_OUT_WIDTH", "960"))
 rpi_cam_out_height = int(os.getenv("RPI_CAMERA_OUT_HEIGHT", "540"))
 rpi_cam_jpeg_quality = int(os.getenv("RPI_CAMERA_JPEG_QUALITY", "70"))
 rpi_cam_flip_180 = os.getenv("RPI_CAMERA_FLIP_180", "false").strip().lower() in {"1", "true", "yes", "on"}
-app.config["RPI_CAMERA"] = init_rpi_camera(
+rpi_cam_aruco_profile = os.getenv("RPI_CAMERA_ARUCO_PROFILE", aruco_profile_default)
+app.config["RPI_CAMERA"] = _start_camera(
+    "rpi",
+    init_rpi_camera,
     host=rpi_cam_bind,
     port=rpi_cam_port,
     latency_ms=rpi_cam_latency_ms,
@@ -73,6 +170,9 @@ app.config["RPI_CAMERA"] = init_rpi_camera(
     jpeg_quality=rpi_cam_jpeg_quality,
     flip_180=rpi_cam_flip_180,
     marker_logger=app.config["ARUCO_LOGGER"],
+    aruco_rate_hz=app.config["ARUCO_DETECT_HZ"],
+    aruco_profile=rpi_cam_aruco_profile,
+    idle_release_s=app.config["CAMERA_IDLE_RELEASE_S"],
 )
 
 # Initialize IP camera (SMTSEC SIP-K327GS) via RTSP
@@ -87,6 +187,15 @@ ip_cam_out_width = int(os.getenv("IP_CAMERA_OUT_WIDTH", "960"))
 ip_cam_out_height = int(os.getenv("IP_CAMERA_OUT_HEIGHT", "540"))
 ip_cam_jpeg_quality = int(os.getenv("IP_CAMERA_JPEG_QUALITY", "70"))
 ip_cam_flip_180 = os.getenv("IP_CAMERA_FLIP_180", "false").strip().lower() in {"1", "true", "yes", "on"}
+ip_cam_aruco_profile = os.getenv("IP_CAMERA_ARUCO_PROFILE", aruco_profile_default)
+# Low-latency FFmpeg capture: RTSP transport (tcp/udp, empty = FFmpeg default), no input buffering,
+# and optionally a smaller probe size / analyze duration so the stream opens faster.
+ip_cam_capture_options = ffmpeg_capture_options(
+    transport=os.getenv("IP_CAMERA_RTSP_TRANSPORT", "tcp").strip().lower(),
+    low_latency=os.getenv("IP_CAMERA_LOW_LATENCY", "true").strip().lower() in {"1", "true", "yes", "on"},
+    probesize=os.getenv("IP_CAMERA_PROBESIZE") or None,
+    analyzeduration_us=os.getenv("IP_CAMERA_ANALYZEDURATION_US") or None,
+)
 app.config["IP_CAMERA_ACTIVE_IP"] = ip_cam_active_ip
 app.config["IP_CAMERA_ACTIVE_URL"] = ip_cam_url
 app.config["IP_CAMERA_SETTINGS"] = {
@@ -94,28 +203,60 @@ app.config["IP_CAMERA_SETTINGS"] = {
     "out_height": ip_cam_out_height,
     "jpeg_quality": ip_cam_jpeg_quality,
     "flip_180": ip_cam_flip_180,
+    "aruco_profile": ip_cam_aruco_profile,
+    "capture_options": ip_cam_capture_options,
 }
-app.config["IP_CAMERA"] = init_ip_camera(
+app.config["IP_CAMERA"] = _start_camera(
+    "ip",
+    init_ip_camera,
     url=ip_cam_url,
     out_width=ip_cam_out_width,
     out_height=ip_cam_out_height,
     jpeg_quality=ip_cam_jpeg_quality,
     flip_180=ip_cam_flip_180,
     marker_logger=app.config["ARUCO_LOGGER"],
+    aruco_rate_hz=app.config["ARUCO_DETECT_HZ"],
+    aruco_profile=ip_cam_aruco_profile,
+    idle_release_s=app.config["CAMERA_IDLE_RELEASE_S"],
+    capture_options=ip_cam_capture_options,
 )
 
 # Initialize default local camera for the legacy Camera 1 feed.
 # Opening and reconnecting happen in the receiver thread so app startup can continue.
 default_cam_device = int(os.getenv("DEFAULT_CAMERA_DEVICE", "0"))
 default_cam_jpeg_quality = int(os.getenv("DEFAULT_CAMERA_JPEG_QUALITY", "70"))
-app.config["DEFAULT_CAMERA"] = init_camera(
+default_cam_aruco_profile = os.getenv("DEFAULT_CAMERA_ARUCO_PROFILE", aruco_profile_default)
+app.config["DEFAULT_CAMERA"] = _start_camera(
+    "default",
+    init_camera,
     device_index=default_cam_device,
     jpeg_quality=default_cam_jpeg_quality,
     marker_logger=app.config["ARUCO_LOGGER"],
+    aruco_rate_hz=app.config["ARUCO_DETECT_HZ"],
+    aruco_profile=default_cam_aruco_profile,
+    idle_release_s=app.config["CAMERA_IDLE_RELEASE_S"],
 )
 
+# Optionally serve all camera feeds from one asyncio loop on MJPEG_STREAM_PORT; the Flask
+# feed routes then redirect there instead of holding a worker thread per viewer.
+mjpeg_stream_port = int(os.getenv("MJPEG_STREAM_PORT", "0") or "0")
+app.config["MJPEG_SERVER"] = None
+if mjpeg_stream_port:
+    app.config["MJPEG_SERVER"] = init_mjpeg_server(
+        {
+            "/video_feed": app.config["DEFAULT_CAMERA"],
+            "/rpi_video_feed": app.config["RPI_CAMERA"],
+            "/ip_video_feed": app.config["IP_CAMERA"],
+        },
+        host=os.getenv("DASHBOARD_HOST", "127.0.0.1"),
+        port=mjpeg_stream_port,
+        max_clients=int(os.getenv("MJPEG_MAX_CLIENTS", str(MJPEG_DEFAULT_MAX_CLIENTS))),
+    )
+
 # Start background resource monitor receiver (UDP port 12346)
-app.config["RESOURCE"] = init_resource_receiver(port=12346)
+app.config["RESOURCE"] = init_resource_receiver(
+    port=12346, data_handler=app.config["TELEMETRY_STORE"], reactor=app.config["UDP_REACTOR"]
+)
 app.config["BITMASK"].set_resource_monitor(app.config["RESOURCE"])
 
 # Initialize setpoint override client (UDP port 5007)
@@ -124,10 +265,19 @@ app.config["CONTROLLER"].set_setpoint_client(app.config["SETPOINT_OVERRIDE"])
 app.config["CONTROLLER"].set_pid_rates(_config.get_section("pid_setpoint_rates") or {})
 
 # Start control loop telemetry receiver (UDP port 5005)
-app.config["CONTROL_TELEM"] = init_control_telemetry(port=5005)
+# History is a preallocated ring of 212 B rows, e.g. 90000 = 30 min @ 50 Hz (~19 MB).
+control_history_capacity = int(os.getenv("CONTROL_TELEMETRY_HISTORY", str(CONTROL_HISTORY_CAPACITY)))
+app.config["CONTROL_TELEM"] = init_control_telemetry(
+    port=5005,
+    data_handler=app.config["TELEMETRY_STORE"],
+    reactor=app.config["UDP_REACTOR"],
+    history_capacity=control_history_capacity,
+)
 
 # Start Zephyr log stream receiver (UDP port 5006)
-app.config["LOG_STREAM"] = init_log_stream(port=5006)
+app.config["LOG_STREAM"] = init_log_stream(
+    port=5006, reactor=app.config["UDP_REACTOR"], event_bus=app.config["EVENT_BUS"]
+)
 
 # Initialize system control client (UDP port 5008)
 app.config["SYSTEM_CONTROL"] = SystemControlClient()
@@ -145,6 +295,9 @@ def _shutdown():
     imu = app.config.get("IMU")
     if imu:
         imu.stop()
+    mjpeg_server = app.config.get("MJPEG_SERVER")
+    if mjpeg_server:
+        mjpeg_server.stop()
     rpi_cam = app.config.get("RPI_CAMERA")
     if rpi_cam:
         rpi_cam.stop()
@@ -163,22 +316,52 @@ def _shutdown():
     log_stream = app.config.get("LOG_STREAM")
     if log_stream:
         log_stream.stop()
+    udp_reactor = app.config.get("UDP_REACTOR")
+    if udp_reactor:
+        udp_reactor.stop()
     sp_override = app.config.get("SETPOINT_OVERRIDE")
     if sp_override:
         sp_override.close()
     system_control = app.config.get("SYSTEM_CONTROL")
     if system_control:
         system_control.close()
+    telemetry_store = app.config.get("TELEMETRY_STORE")
+    if telemetry_store:
+        telemetry_store.stop()
 
 
 atexit.register(_shutdown)
 
 
-def run_dashboard_server():
+def run_dashboard_server(mode=None):
+    """Serve the dashboard in "dev" (Flask debug server) or "production" (bounded worker pool) mode.
+
+    The mode defaults to TOPSIDE_SERVER, or "production" in the packaged build and "dev" otherwise.
+    """
+    if mode is None:
+        mode = os.getenv("TOPSIDE_SERVER") or ("production" if getattr(sys, "frozen", False) else "dev")
+    mode = mode.strip().lower()
+    host = os.getenv("DASHBOARD_HOST", "127.0.0.1")
     print(f"Using data directory: {data_dir()}")
+    if mode == "production":
+        print("Starting dashboard server (production) on port 5000...")
+        serve_production(
+            app,
+            host=host,
+            port=5000,
+            request_workers=int(os.getenv("HTTP_REQUEST_WORKERS", str(DEFAULT_REQUEST_WORKERS))),
+            stream_workers=int(os.getenv("HTTP_STREAM_WORKERS", str(DEFAULT_STREAM_WORKERS))),
+            request_timeout=float(os.getenv("HTTP_REQUEST_TIMEOUT", str(DEFAULT_REQUEST_TIMEOUT))),
+            keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", str(DEFAULT_KEEPALIVE_TIMEOUT))),
+        )
+        return
     print("Starting dashboard server on port 5000...")
-    app.run(debug=True, port=5000, use_reloader=False, threaded=True)
+    app.run(host=host, debug=True, port=5000, use_reloader=False, threaded=True)
 
 
 if __name__ == "__main__":
-    run_dashboard_server()
+    parser = argparse.ArgumentParser(description="Topside dashboard server")
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument("--production", dest="mode", action="store_const", const="production")
+    mode_group.add_argument("--dev", dest="mode", action="store_const", const="dev")
+    run_dashboard_server(parser.parse_args().mode)
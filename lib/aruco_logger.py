@@ -6,23 +6,38 @@ from datetime import UTC, datetime
 class ArucoPipelineLogger:
     """Tracks ordered ARUCO sightings for the pipeline challenge."""
 
-    def __init__(self):
+    def __init__(self, event_bus=None):
+        self.event_bus = event_bus
         self._lock = threading.Lock()
         self._enabled = False
         self._entries = []
         self._logged_ids = set()
         self._visible_ids = []
         self._duplicate_count = 0
+        self._version = 0  # bumped whenever the snapshot changes
+
+    @property
+    def version(self):
+        with self._lock:
+            return self._version
+
+    @property
+    def enabled(self):
+        return self._enabled
 
     def start(self):
         with self._lock:
             self._enabled = True
-            return self._snapshot_locked()
+            self._version += 1
+            snapshot = self._snapshot_locked()
+        return self._publish(snapshot)
 
     def stop(self):
         with self._lock:
             self._enabled = False
-            return self._snapshot_locked()
+            self._version += 1
+            snapshot = self._snapshot_locked()
+        return self._publish(snapshot)
 
     def clear(self):
         with self._lock:
@@ -30,7 +45,9 @@ class ArucoPipelineLogger:
             self._logged_ids = set()
             self._visible_ids = []
             self._duplicate_count = 0
-            return self._snapshot_locked()
+            self._version += 1
+            snapshot = self._snapshot_locked()
+        return self._publish(snapshot)
 
     def record_visible(self, detections):
         ordered = sorted(
@@ -43,29 +60,42 @@ class ArucoPipelineLogger:
         now = time.time()
 
         with self._lock:
-            self._visible_ids = [marker["id"] for marker in ordered]
-            if not self._enabled:
-                return self._snapshot_locked()
-
-            for marker in ordered:
-                marker_id = marker["id"]
-                if marker_id in self._logged_ids:
-                    self._duplicate_count += 1
-                    continue
-                self._logged_ids.add(marker_id)
-                self._entries.append(
-                    {
-                        "order": len(self._entries) + 1,
-                        "id": marker_id,
-                        "seen_at": _format_timestamp(now),
-                    }
-                )
-            return self._snapshot_locked()
+            visible_ids = [marker["id"] for marker in ordered]
+            changed = visible_ids != self._visible_ids
+            self._visible_ids = visible_ids
+            if self._enabled and ordered:
+                self._log_new_markers_locked(ordered, now)
+                changed = True
+            if changed:
+                self._version += 1
+            snapshot = self._snapshot_locked()
+        return self._publish(snapshot) if changed else snapshot
+
+    def _log_new_markers_locked(self, ordered, now):
+        for marker in ordered:
+            marker_id = marker["id"]
+            if marker_id in self._logged_ids:
+                self._duplicate_count += 1
+                continue
+            self._logged_ids.add(marker_id)
+            self._entries.append(
+                {
+                    "order": len(self._entries) + 1,
+                    "id": marker_id,
+                    "seen_at": _format_timestamp(now),
+                }
+            )
 
     def snapshot(self):
         with self._lock:
             return self._snapshot_locked()
 
+    def _publish(self, snapshot):
+        bus = self.event_bus
+        if bus is not None:
+            bus.publish("aruco", snapshot)
+        return snapshot
+
     def _snapshot_locked(self):
         return {
             "enabled": self._enabled,
@@ -17,10 +17,9 @@ offset: millimeters from IMU to center of mass
 """
 
 import socket
-import struct
-import zlib
 
 from lib.net_transport import DEFAULT_ROV_HOST
+from lib.packet_schema import AXIS_CONFIG
 
 NUCLEO_HOST = DEFAULT_ROV_HOST
 AXIS_CONFIG_PORT = 5004
@@ -58,9 +57,7 @@ def build_axis_packet(imu_axes: dict, accel_axes: dict, offset: dict) -> bytes:
     off_y = float(offset.get("y", 0.0))
     off_z = float(offset.get("z", 0.0))
 
-    # Pack body (everything except CRC)
-    body = struct.pack(
-        "<BBBBBBB BBBBBB x fff",
+    return AXIS_CONFIG.pack(
         AXIS_PKT_SET,
         yaw_src,
         yaw_sign,
@@ -78,8 +75,6 @@ def build_axis_packet(imu_axes: dict, accel_axes: dict, offset: dict) -> bytes:
         off_y,
         off_z,
     )
-    crc = zlib.crc32(body) & 0xFFFFFFFF
-    return body + struct.pack("<I", crc)
 
 
 def send_axis_config(
@@ -1,16 +1,20 @@
 # lib/bitmask.py
-import struct
 import threading
 import time
 from dataclasses import asdict, dataclass
 from typing import Optional
 
-from lib.crc import crc32_ieee
+from lib.latency_histogram import LatencyHistogram
 from lib.net_transport import DEFAULT_ROV_HOST, UdpSender, next_sequence
+from lib.packet_schema import BITMASK
+from lib.periodic import PeriodicScheduler
 
 NUCLEO_HOST = DEFAULT_ROV_HOST  # default NUCLEO IP
 NUCLEO_PORT = 12345
 DEFAULT_RATE_HZ = 20.0  # send frequency
+DEFAULT_MIN_SEND_GAP = 0.01  # seconds between packets when sending on change
+EMERGENCY_BURST_COUNT = 3  # packets sent at once by send_burst (kill switch)
+EMERGENCY_BURST_GAP = 0.005  # seconds between burst packets
 
 
 @dataclass
@@ -51,15 +55,35 @@ def encode_payload(cmd: Command) -> int:
 
 
 def build_packet(seq: int, payload_u64: int) -> bytes:
-    header = struct.pack("!IQ", seq & 0xFFFFFFFF, payload_u64 & 0xFFFFFFFFFFFFFFFF)
-    crc = crc32_ieee(header)
-    return header + struct.pack("!I", crc & 0xFFFFFFFF)
+    return BITMASK.pack(seq & 0xFFFFFFFF, payload_u64 & 0xFFFFFFFFFFFFFFFF)
 
 
 class BitmaskClient:
-    def __init__(self, host=NUCLEO_HOST, port=NUCLEO_PORT, rate_hz=DEFAULT_RATE_HZ, watchdog_timeout=0.75):
+    """Sends the current command at ``rate_hz``.
+
+    With ``send_on_change``, a changed command is also sent right away, but
+    never sooner than ``min_send_gap`` seconds after the previous packet;
+    the periodic sends continue as a keepalive. ``command_latency`` records
+    how long each command change waited before going out, in either mode.
+    :meth:`send_burst` sends outside the schedule altogether, for the kill switch.
+    """
+
+    def __init__(
+        self,
+        host=NUCLEO_HOST,
+        port=NUCLEO_PORT,
+        rate_hz=DEFAULT_RATE_HZ,
+        watchdog_timeout=0.75,
+        send_on_change=False,
+        min_send_gap=DEFAULT_MIN_SEND_GAP,
+    ):
         self.host, self.port = host, port
-        self.period = 1.0 / float(rate_hz) if rate_hz > 0 else 0.0
+        self._scheduler = PeriodicScheduler(1.0 / float(rate_hz) if rate_hz > 0 else 0.0)
+        self.send_on_change = bool(send_on_change)
+        self.min_send_gap = max(0.0, float(min_send_gap))
+        self.command_latency = LatencyHistogram()
+        self._changed = threading.Event()
+        self._changed_at_ns = None  # when the oldest unsent change was made
         self._cmd = Command()
         self._seq = 0
         self._lock = threading.Lock()
@@ -68,6 +92,7 @@ class BitmaskClient:
         self._watchdog_thread = threading.Thread(target=self._watchdog_loop, name="BitmaskWatchdog", daemon=True)
         self._sender: Optional[UdpSender] = None
         self._resource_monitor = None
+        self._event_bus = None
 
         # Uplink health/state
         self._status_lock = threading.Lock()
@@ -93,6 +118,7 @@ class BitmaskClient:
 
     def stop(self):
         self._stop.set()
+        self._changed.set()  # wake a sender waiting for changes
         if self._thread.is_alive():
             self._thread.join(timeout=1.0)
         if self._watchdog_thread.is_alive():
@@ -101,11 +127,27 @@ class BitmaskClient:
             self._sender.close()
             self._sender = None
 
+    @property
+    def period(self) -> float:
+        """Send period in seconds; 0 pauses sending."""
+        return self._scheduler.period
+
+    @period.setter
+    def period(self, value: float) -> None:
+        self._scheduler.period = value
+
     def set_command(self, **kwargs):
         with self._lock:
+            changed = False
             for k, v in kwargs.items():
-                if hasattr(self._cmd, k):
+                if hasattr(self._cmd, k) and getattr(self._cmd, k) != int(v):
                     setattr(self._cmd, k, int(v))
+                    changed = True
+            if changed:
+                if self._changed_at_ns is None:
+                    self._changed_at_ns = time.monotonic_ns()
+                if self.send_on_change:
+                    self._changed.set()
 
     def get_command(self) -> dict:
         with self._lock:
@@ -114,6 +156,10 @@ class BitmaskClient:
     def set_resource_monitor(self, monitor) -> None:
         self._resource_monitor = monitor
 
+    def set_event_bus(self, bus) -> None:
+        """Publish uplink status on the ``uplink`` topic after every send."""
+        self._event_bus = bus
+
     def get_uplink_status(self) -> dict:
         with self._status_lock:
             now = time.monotonic()
@@ -135,6 +181,10 @@ class BitmaskClient:
                 "last_watchdog_resend_age_ms": resend_age,
                 "last_command": self._last_command_snapshot or {},
                 "last_packet_hex": self._last_packet.hex() if self._last_packet else None,
+                "timing": self._scheduler.stats(),
+                "send_on_change": self.send_on_change,
+                "min_send_gap_ms": self.min_send_gap * 1000.0,
+                "command_latency": self.command_latency.snapshot(),
             }
 
     # convenience: set from normalized axes
@@ -156,26 +206,73 @@ class BitmaskClient:
             manip=s(manip),
         )
 
+    def send_burst(self, count=EMERGENCY_BURST_COUNT, gap=EMERGENCY_BURST_GAP) -> dict:
+        """Send the current command *count* times now, *gap* seconds apart, from the calling thread.
+
+        Bypasses the schedule (and a paused period), so a neutral command set
+        by the kill switch leaves at once instead of on the next tick, and the
+        repeats cover a lost datagram. Each packet gets its own sequence number.
+        """
+        started = time.monotonic_ns()
+        sequences = []
+        for index in range(max(1, int(count))):
+            if index and gap > 0:
+                time.sleep(gap)
+            sequences.append(self._send_once())
+        return {
+            "packets": len(sequences),
+            "first_sequence": sequences[0],
+            "last_sequence": sequences[-1],
+            "duration_ms": round((time.monotonic_ns() - started) / 1e6, 3),
+            "sent": self._sender is not None,
+        }
+
     def _run(self):
         if self.period <= 0:
             return
         while not self._stop.is_set():
-            with self._lock:
-                payload = encode_payload(self._cmd)
-                pkt = build_packet(self._seq, payload)
-                self._seq = next_sequence(self._seq)
-                command_snapshot = asdict(self._cmd)
-            sender = self._sender
-            if sender:
-                try:
-                    sender.send(pkt)
-                except Exception:
-                    pass
-            with self._status_lock:
-                self._last_packet = pkt
-                self._last_send_time = time.monotonic()
-                self._last_command_snapshot = command_snapshot
-            time.sleep(self.period)
+            self._send_once()
+            self._wait_for_next_send()
+
+    def _wait_for_next_send(self):
+        # Absolute deadlines: send time does not stretch the period, and overruns skip ticks instead of bursting.
+        while not self._stop.is_set():
+            wake = self._changed if self.send_on_change else None
+            if self._scheduler.wait_next(wake=wake):
+                break
+            if wake is not None and wake.is_set() and self.period > 0:
+                break  # command changed
+        if self.send_on_change:
+            wait = self._last_send_time + self.min_send_gap - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)  # rate cap; changes made meanwhile go out in this packet
+
+    def _send_once(self) -> int:
+        with self._lock:
+            self._changed.clear()
+            payload = encode_payload(self._cmd)
+            sequence = self._seq
+            pkt = build_packet(sequence, payload)
+            self._seq = next_sequence(self._seq)
+            command_snapshot = asdict(self._cmd)
+            changed_at_ns = self._changed_at_ns
+            self._changed_at_ns = None
+        sender = self._sender
+        if sender:
+            try:
+                sender.send(pkt)
+            except Exception:
+                pass
+        if changed_at_ns is not None:
+            self.command_latency.record(time.monotonic_ns() - changed_at_ns)
+        with self._status_lock:
+            self._last_packet = pkt
+            self._last_send_time = time.monotonic()
+            self._last_command_snapshot = command_snapshot
+        bus = self._event_bus
+        if bus is not None and bus.has_subscribers("uplink"):
+            bus.publish("uplink", self.get_uplink_status())
+        return sequence
 
     def _watchdog_loop(self):
         while not self._stop.is_set():
@@ -210,7 +307,13 @@ class BitmaskClient:
 
 
 # simple initializer
-def init_bitmask(rate_hz=DEFAULT_RATE_HZ, host=NUCLEO_HOST, port=NUCLEO_PORT) -> BitmaskClient:
-    bm = BitmaskClient(host=host, port=port, rate_hz=rate_hz)
+def init_bitmask(
+    rate_hz=DEFAULT_RATE_HZ,
+    host=NUCLEO_HOST,
+    port=NUCLEO_PORT,
+    send_on_change=False,
+    min_send_gap=DEFAULT_MIN_SEND_GAP,
+) -> BitmaskClient:
+    bm = BitmaskClient(host=host, port=port, rate_hz=rate_hz, send_on_change=send_on_change, min_send_gap=min_send_gap)
     bm.start()
     return bm
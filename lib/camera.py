@@ -1,23 +1,127 @@
+import os
 import shutil
 import subprocess
 import threading
 import time
+from collections import deque
 
 import cv2
 import numpy as np
 
+from lib.jpeg_stream import JpegStreamSplitter
+
+# Named detector parameter profiles, selectable per camera.
+# scale: detection image size relative to the frame; full_scan_every: with N > 1, the frames in
+# between only search around markers found before (a full scan also runs whenever a track is lost).
+ARUCO_PROFILES = {
+    # Full resolution, default OpenCV parameters, every frame.
+    "accurate": {"scale": 1.0, "full_scan_every": 1, "params": {}},
+    "balanced": {"scale": 0.75, "full_scan_every": 5, "params": {}},
+    "fast": {
+        "scale": 0.5,
+        "full_scan_every": 10,
+        "params": {"adaptiveThreshWinSizeMax": 13, "adaptiveThreshWinSizeStep": 10},
+    },
+}
+DEFAULT_ARUCO_PROFILE = "accurate"
+
 
 class ArUcoMarkerDetector:
-    def __init__(self, dictionary_name="DICT_4X4_50", camera_matrix=None, dist_coeffs=None):
+    ROI_MARGIN = 0.5  # ROI padding around a tracked marker, as a fraction of its size
+    ROI_MIN_PAD = 16  # pixels
+
+    def __init__(
+        self, dictionary_name="DICT_4X4_50", camera_matrix=None, dist_coeffs=None, profile=DEFAULT_ARUCO_PROFILE
+    ):
         aruco = cv2.aruco
+        if profile not in ARUCO_PROFILES:
+            raise ValueError(f"Unknown ArUco profile {profile!r}; expected one of {', '.join(ARUCO_PROFILES)}")
+        settings = ARUCO_PROFILES[profile]
         self.dictionary_name = dictionary_name
         self.camera_matrix = camera_matrix
         self.dist_coeffs = dist_coeffs
+        self.profile = profile
+        self.scale = float(settings["scale"])
+        self.full_scan_every = max(1, int(settings["full_scan_every"]))
+        params = aruco.DetectorParameters()
+        for name, value in settings["params"].items():
+            setattr(params, name, value)
         self._dictionary = aruco.getPredefinedDictionary(getattr(aruco, dictionary_name))
-        self._detector = aruco.ArucoDetector(self._dictionary, aruco.DetectorParameters())
+        self._detector = aruco.ArucoDetector(self._dictionary, params)
+        self._tracks = []  # (x0, y0, x1, y1) regions around the markers found by the last detection
+        self._tracked_markers = 0
+        self._since_full_scan = 0
 
     def detect_markers(self, frame):
-        return self._detector.detectMarkers(frame)
+        """Return ``(corners, ids, rejected)`` like ``ArucoDetector.detectMarkers``, in *frame* pixels."""
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self._tracks and self._since_full_scan + 1 < self.full_scan_every:
+            tracked = self._detect_in_tracks(gray)
+            if tracked is not None:
+                self._since_full_scan += 1
+                return tracked
+        self._since_full_scan = 0
+        return self._detect_full(gray)
+
+    def _detect_full(self, gray):
+        if self.scale < 1.0:
+            small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+            corners, ids, rejected = self._detector.detectMarkers(small)
+            inverse = np.float32(1.0 / self.scale)
+            corners = tuple(c * inverse for c in corners)
+            rejected = tuple(c * inverse for c in rejected)
+        else:
+            corners, ids, rejected = self._detector.detectMarkers(gray)
+        self._update_tracks(corners, gray.shape)
+        return corners, ids, rejected
+
+    def _detect_in_tracks(self, gray):
+        """Search only the tracked regions at full resolution; None if any tracked marker was lost."""
+        found_corners = []
+        found_ids = []
+        for x0, y0, x1, y1 in self._tracks:
+            corners, ids, _rejected = self._detector.detectMarkers(gray[y0:y1, x0:x1])
+            if ids is None:
+                return None
+            offset = np.float32((x0, y0))
+            found_corners.extend(c + offset for c in corners)
+            found_ids.append(ids)
+        ids = np.concatenate(found_ids)
+        if len(ids) < self._tracked_markers:
+            return None
+        corners = tuple(found_corners)
+        self._update_tracks(corners, gray.shape)
+        return corners, ids, ()
+
+    def _update_tracks(self, corners, shape):
+        height, width = shape[:2]
+        boxes = []
+        for marker in corners:
+            points = marker.reshape(-1, 2)
+            (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+            pad = max(self.ROI_MIN_PAD, self.ROI_MARGIN * max(x1 - x0, y1 - y0))
+            boxes.append(
+                [
+                    max(0, int(x0 - pad)),
+                    max(0, int(y0 - pad)),
+                    min(width, int(x1 + pad) + 1),
+                    min(height, int(y1 + pad) + 1),
+                ]
+            )
+        # Merge overlapping regions so no marker is searched (and reported) twice.
+        merged = []
+        while boxes:
+            box = boxes.pop()
+            for other in boxes:
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    other[:] = [min(a, b) for a, b in zip(box[:2], other[:2], strict=True)] + [
+                        max(a, b) for a, b in zip(box[2:], other[2:], strict=True)
+                    ]
+                    break
+            else:
+                merged.append(box)
+        self._tracks = [tuple(box) for box in merged]
+        self._tracked_markers = len(corners)
 
     def draw_detected_markers(self, frame, corners, ids):
         if ids is not None and len(ids) > 0:
@@ -36,14 +140,209 @@ class ArUcoMarkerDetector:
         return detections
 
 
-def _process_aruco_frame(frame, detector, marker_logger):
-    if detector is None:
-        return frame
-    corners, ids, _rejected = detector.detect_markers(frame)
-    detections = detector.marker_detections(corners, ids)
-    if marker_logger is not None:
-        marker_logger.record_visible(detections)
-    return detector.draw_detected_markers(frame, corners, ids)
+DEFAULT_ARUCO_RATE_HZ = 10.0
+
+
+class ArucoDetectionWorker:
+    """Runs marker detection on a background thread so it never delays the video.
+
+    The capture thread calls :meth:`process` for every frame. A frame is handed
+    over (as grayscale) only when the worker is idle and at least
+    ``1 / rate_hz`` seconds have passed since the last hand-over, so the
+    worker always works on the newest frame and never queues. Every frame
+    gets the most recent detections drawn on it; the marker logger is fed
+    from the worker. ``rate_hz <= 0`` detects as often as the worker keeps up.
+    """
+
+    def __init__(self, detector, marker_logger=None, rate_hz=DEFAULT_ARUCO_RATE_HZ, name="ArUco"):
+        self.detector = detector
+        self.marker_logger = marker_logger
+        self.rate_hz = max(0.0, float(rate_hz))
+        self.min_interval = 1.0 / self.rate_hz if self.rate_hz > 0 else 0.0
+        # Detections older than this are not drawn, so markers that left the view disappear.
+        self.overlay_max_age = max(0.5, 3.0 * self.min_interval)
+        self.name = name
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._pending = None
+        self._busy = False
+        self._next_due = 0.0
+        self._overlay = None  # (corners, ids, monotonic time)
+        self._gray = None  # reused grayscale buffer handed to the worker
+        self.detections_run = 0
+        self.frames_skipped = 0
+        self.last_detect_ms = None
+
+    def process(self, frame):
+        """Submit *frame* for detection if the worker is free, and draw the latest detections on it."""
+        self.submit(frame)
+        return self.draw_overlay(frame)
+
+    def submit(self, frame):
+        now = time.monotonic()
+        with self._cond:
+            if self._busy or now < self._next_due:
+                self.frames_skipped += 1
+                return False
+            self._busy = True
+            self._next_due = now + self.min_interval
+        # The capture thread keeps drawing on and encoding *frame*, so the worker gets its own grayscale copy.
+        # The worker is idle, so the previous copy is free to be overwritten.
+        if frame.ndim == 3:
+            gray = self._gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            gray = frame.copy()
+        with self._cond:
+            self._pending = gray
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop_event,), name=f"{self.name} ArUco", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def draw_overlay(self, frame):
+        with self._cond:
+            overlay = self._overlay
+        if overlay is None or time.monotonic() - overlay[2] > self.overlay_max_age:
+            return frame
+        return self.detector.draw_detected_markers(frame, overlay[0], overlay[1])
+
+    def stop(self):
+        """Stop the worker thread. A later :meth:`submit` starts a fresh one."""
+        with self._cond:
+            self._stop_event.set()
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+            self._stop_event = threading.Event()
+            self._pending = None
+            self._busy = False
+            self._overlay = None
+            self._gray = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def get_stats(self):
+        return {
+            "profile": getattr(self.detector, "profile", None),
+            "rate_hz": self.rate_hz,
+            "detections_run": self.detections_run,
+            "frames_skipped": self.frames_skipped,
+            "last_detect_ms": self.last_detect_ms,
+        }
+
+    def _run(self, stop_event):
+        while True:
+            with self._cond:
+                while self._pending is None and not stop_event.is_set():
+                    self._cond.wait()
+                if stop_event.is_set():
+                    return
+                gray, self._pending = self._pending, None
+            started = time.perf_counter()
+            try:
+                corners, ids, _rejected = self.detector.detect_markers(gray)
+                detections = self.detector.marker_detections(corners, ids)
+            except Exception as exc:
+                print(f"[{self.name}] Marker detection failed: {exc}")
+                corners, ids, detections = (), None, []
+            with self._cond:
+                if stop_event.is_set():
+                    return
+                self._overlay = (corners, ids, time.monotonic())
+                self._busy = False
+                self.detections_run += 1
+                self.last_detect_ms = round((time.perf_counter() - started) * 1000.0, 2)
+            if self.marker_logger is not None:
+                self.marker_logger.record_visible(detections)
+
+
+class CameraDemand:
+    """Tracks whether anyone needs a camera's frames.
+
+    A camera is needed while it has stream viewers (see ``add_viewer``) or
+    its marker logger is enabled. While nobody needs it the capture thread
+    only grabs frames, without decoding them for detection or encoding JPEGs.
+    With ``idle_release_s > 0`` it also closes the capture after that many idle
+    seconds and reopens it on demand: immediately when a viewer connects, and
+    within ``LOGGER_POLL_INTERVAL`` after the marker logger is started.
+    """
+
+    LOGGER_POLL_INTERVAL = 0.25
+
+    def __init__(self, marker_logger=None, idle_release_s=0.0):
+        self.marker_logger = marker_logger
+        self.idle_release_s = max(0.0, float(idle_release_s or 0.0))
+        self.viewers = 0
+        self._cond = threading.Condition()
+        self._idle_since = None
+
+    def add_viewer(self):
+        with self._cond:
+            self.viewers += 1
+            self._cond.notify_all()
+
+    def remove_viewer(self):
+        with self._cond:
+            self.viewers = max(0, self.viewers - 1)
+
+    @property
+    def active(self):
+        logger = self.marker_logger
+        return self.viewers > 0 or (logger is not None and logger.enabled)
+
+    def poll(self):
+        """Return whether frames are needed now, and note when the camera went idle. Capture thread only."""
+        if self.active:
+            self._idle_since = None
+            return True
+        if self._idle_since is None:
+            self._idle_since = time.monotonic()
+        return False
+
+    def should_release(self):
+        """True once the camera has been idle long enough to close the capture."""
+        return (
+            self.idle_release_s > 0
+            and self._idle_since is not None
+            and time.monotonic() - self._idle_since >= self.idle_release_s
+        )
+
+    def wait_until_needed(self, stop_event):
+        """Block while the capture is released and nobody needs frames. Returns False once *stop_event* is set."""
+        if self.idle_release_s > 0:
+            with self._cond:
+                while not stop_event.is_set() and not self.poll():
+                    self._cond.wait(self.LOGGER_POLL_INTERVAL)
+        return not stop_event.is_set()
+
+    def get_stats(self):
+        return {"viewers": self.viewers, "active": self.active, "idle_release_s": self.idle_release_s}
+
+
+def multipart_chunk(jpg):
+    """Wrap one JPEG as a complete ``multipart/x-mixed-replace`` part (boundary ``frame``).
+
+    Built once per frame and sent as-is to every viewer. *jpg* may be any
+    bytes-like object, such as the array returned by ``cv2.imencode``.
+    """
+    return b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%b\r\n" % (len(jpg), jpg)
+
+
+def _jpeg_from_chunk(chunk):
+    if chunk is None:
+        return None
+    return chunk[chunk.index(b"\r\n\r\n") + 4 : -2]
+
+
+def _notify_frame_listeners(listeners, chunk):
+    for callback in listeners:
+        try:
+            callback(chunk)
+        except Exception as exc:
+            print(f"[Camera] Frame listener failed: {exc}")
 
 
 class DefaultCameraReceiver:
@@ -51,7 +350,15 @@ class DefaultCameraReceiver:
 
     RECONNECT_DELAY = 3.0
 
-    def __init__(self, device_index=0, jpeg_quality=70, marker_logger=None):
+    def __init__(
+        self,
+        device_index=0,
+        jpeg_quality=70,
+        marker_logger=None,
+        aruco_rate_hz=DEFAULT_ARUCO_RATE_HZ,
+        aruco_profile=DEFAULT_ARUCO_PROFILE,
+        idle_release_s=0.0,
+    ):
         self.device_index = int(device_index)
         self.jpeg_quality = min(95, max(40, int(jpeg_quality)))
         self.is_connected = False
@@ -62,16 +369,24 @@ class DefaultCameraReceiver:
         self._stop_event = threading.Event()
         self._thread = None
         self._cap = None
+        self._read_buf = None  # frame array reused by cap.read()
 
         self._frame_lock = threading.Lock()
         self._frame_cond = threading.Condition(self._frame_lock)
-        self._latest_jpeg = None
+        self._latest_chunk = None
         self._frame_seq = 0
         self._last_frame_ts = 0.0
-        self._placeholder_jpeg = self._build_placeholder_jpeg()
+        self._frame_listeners = []
+        self._placeholder_chunk = multipart_chunk(self._build_placeholder_jpeg())
+        self._demand = CameraDemand(marker_logger, idle_release_s)
         camera_matrix = np.array([[900, 0, 640], [0, 900, 360], [0, 0, 1]], dtype=np.float32)
         dist_coeffs = np.zeros((5, 1), dtype=np.float32)
-        self._detector = ArUcoMarkerDetector(camera_matrix=camera_matrix, dist_coeffs=dist_coeffs)
+        self._aruco = ArucoDetectionWorker(
+            ArUcoMarkerDetector(camera_matrix=camera_matrix, dist_coeffs=dist_coeffs, profile=aruco_profile),
+            marker_logger=marker_logger,
+            rate_hz=aruco_rate_hz,
+            name="Default Camera",
+        )
 
     def start(self):
         if self._thread and self._thread.is_alive():
@@ -85,23 +400,50 @@ class DefaultCameraReceiver:
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=3.0)
         self._release_cap()
+        self._aruco.stop()
 
     def get_latest_jpeg(self):
         with self._frame_lock:
-            return self._latest_jpeg
+            return _jpeg_from_chunk(self._latest_chunk)
 
-    def get_latest_jpeg_and_seq(self):
+    def get_latest_chunk(self):
         with self._frame_lock:
-            return self._latest_jpeg, self._frame_seq
+            return self._latest_chunk
 
-    def wait_for_next_frame(self, last_seq, timeout=0.25):
+    def wait_for_next_chunk(self, last_seq, timeout=0.25):
         with self._frame_cond:
             if self._frame_seq == last_seq:
                 self._frame_cond.wait(timeout=timeout)
-            return self._latest_jpeg, self._frame_seq
+            return self._latest_chunk, self._frame_seq
+
+    def get_placeholder_chunk(self):
+        return self._placeholder_chunk
+
+    # Bare-JPEG forms of the chunk methods, for callers of the original interface.
+    def get_latest_jpeg_and_seq(self):
+        with self._frame_lock:
+            return _jpeg_from_chunk(self._latest_chunk), self._frame_seq
+
+    def wait_for_next_frame(self, last_seq, timeout=0.25):
+        chunk, seq = self.wait_for_next_chunk(last_seq, timeout=timeout)
+        return _jpeg_from_chunk(chunk), seq
 
     def get_placeholder_jpeg(self):
-        return self._placeholder_jpeg
+        return _jpeg_from_chunk(self._placeholder_chunk)
+
+    def add_frame_listener(self, callback):
+        """Call ``callback(chunk)`` from the capture thread with each new frame's multipart chunk."""
+        self._frame_listeners = [*self._frame_listeners, callback]
+
+    def remove_frame_listener(self, callback):
+        self._frame_listeners = [cb for cb in self._frame_listeners if cb is not callback]
+
+    def add_viewer(self):
+        """Register a stream viewer; frames are only decoded and encoded while someone needs them."""
+        self._demand.add_viewer()
+
+    def remove_viewer(self):
+        self._demand.remove_viewer()
 
     def get_status(self):
         age_ms = None
@@ -114,21 +456,41 @@ class DefaultCameraReceiver:
             "jpeg_quality": self.jpeg_quality,
             "last_frame_age_ms": age_ms,
             "last_error": self.last_error,
+            "aruco": self._aruco.get_stats(),
+            "demand": self._demand.get_stats(),
         }
 
     def _set_frame(self, frame):
-        frame = _process_aruco_frame(frame, self._detector, self.marker_logger)
+        frame = self._aruco.process(frame)
         ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
         if not ok:
             return
+        self._set_jpeg_bytes(buf)
+
+    def _set_jpeg_bytes(self, jpg):
+        chunk = multipart_chunk(jpg)
         with self._frame_cond:
-            self._latest_jpeg = buf.tobytes()
+            self._latest_chunk = chunk
             self._frame_seq += 1
             self._frame_cond.notify_all()
+        self._note_frame()
+        _notify_frame_listeners(self._frame_listeners, chunk)
+
+    def _note_frame(self):
         self._last_frame_ts = time.monotonic()
         self.is_connected = True
 
-    def _build_placeholder_jpeg(self):
+    def _frame_wanted(self):
+        if self._demand.poll():
+            return True
+        # Don't show a stale picture to the next viewer; it gets the placeholder until a fresh frame.
+        if self._latest_chunk is not None:
+            with self._frame_lock:
+                self._latest_chunk = None
+        return False
+
+    @staticmethod
+    def _build_placeholder_jpeg():
         blank = np.zeros((720, 1280, 3), dtype=np.uint8)
         cv2.putText(
             blank,
@@ -162,7 +524,7 @@ class DefaultCameraReceiver:
             self._cap = None
 
     def _run_loop(self):
-        while not self._stop_event.is_set():
+        while self._demand.wait_until_needed(self._stop_event):
             print(f"[Default Camera] Opening device {self.device_index} ...")
             self.is_listening = True
             if not self._open_camera():
@@ -176,10 +538,18 @@ class DefaultCameraReceiver:
             print("[Default Camera] Stream connected")
             self.last_error = None
             had_frame = False
+            released_idle = False
 
             while not self._stop_event.is_set():
-                ok, frame = self._cap.read()
-                if not ok or frame is None:
+                wanted = self._frame_wanted()
+                if wanted:
+                    # Decode into the previous frame's array; it was encoded and is no longer used.
+                    ok, frame = self._cap.read(self._read_buf)
+                    self._read_buf = frame
+                else:
+                    # Nobody is watching: keep the device drained without converting the frame.
+                    ok, frame = self._cap.grab(), None
+                if not ok or (wanted and frame is None):
                     self.last_error = "Camera read failed"
                     print("[Default Camera] Lost connection, will reconnect ...")
                     self._release_cap()
@@ -188,31 +558,61 @@ class DefaultCameraReceiver:
                 if not had_frame:
                     print("[Default Camera] Receiving frames")
                     had_frame = True
-                self._set_frame(frame)
+                if wanted:
+                    self._set_frame(frame)
+                    continue
+                self._note_frame()
+                if self._demand.should_release():
+                    print("[Default Camera] No viewers, closing device until needed")
+                    self._release_cap()
+                    released_idle = True
+                    break
 
-            if not self._stop_event.is_set():
+            if not released_idle and not self._stop_event.is_set():
                 self._stop_event.wait(self.RECONNECT_DELAY)
 
         self._release_cap()
 
 
-def generate_frames(camera):
-    """Flask MJPEG generator for the default camera receiver."""
+def _generate_multipart(camera):
+    """Yield the camera's shared multipart chunks; the placeholder repeats every 250 ms until a frame arrives."""
     last_seq = -1
-    while True:
-        frame, seq = camera.wait_for_next_frame(last_seq, timeout=0.25)
-        if frame is None:
-            frame = camera.get_placeholder_jpeg()
-        elif seq == last_seq:
-            continue
+    camera.add_viewer()
+    try:
+        while True:
+            chunk, seq = camera.wait_for_next_chunk(last_seq, timeout=0.25)
+            if chunk is None:
+                chunk = camera.get_placeholder_chunk()
+            elif seq == last_seq:
+                continue
+            last_seq = seq
+            yield chunk
+    finally:
+        camera.remove_viewer()
 
-        last_seq = seq
-        yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
 
+def generate_frames(camera):
+    """Flask MJPEG generator for the default camera receiver."""
+    return _generate_multipart(camera)
 
-def init_camera(device_index=0, jpeg_quality=70, marker_logger=None):
+
+def init_camera(
+    device_index=0,
+    jpeg_quality=70,
+    marker_logger=None,
+    aruco_rate_hz=DEFAULT_ARUCO_RATE_HZ,
+    aruco_profile=DEFAULT_ARUCO_PROFILE,
+    idle_release_s=0.0,
+):
     """Initialize and start the default local camera receiver."""
-    receiver = DefaultCameraReceiver(device_index=device_index, jpeg_quality=jpeg_quality, marker_logger=marker_logger)
+    receiver = DefaultCameraReceiver(
+        device_index=device_index,
+        jpeg_quality=jpeg_quality,
+        marker_logger=marker_logger,
+        aruco_rate_hz=aruco_rate_hz,
+        aruco_profile=aruco_profile,
+        idle_release_s=idle_release_s,
+    )
     receiver.start()
     return receiver
 
@@ -230,6 +630,9 @@ class RPiCameraReceiver:
         jpeg_quality=70,
         flip_180=True,
         marker_logger=None,
+        aruco_rate_hz=DEFAULT_ARUCO_RATE_HZ,
+        aruco_profile=DEFAULT_ARUCO_PROFILE,
+        idle_release_s=0.0,
     ):
         self.host = host
         self.port = int(port)
@@ -249,14 +652,23 @@ class RPiCameraReceiver:
         self._cap = None
         self._gst_proc = None
         self._stderr_thread = None
+        self._released_idle = False
+        self._read_buf = None  # frame array reused by cap.read()
 
         self._frame_lock = threading.Lock()
         self._frame_cond = threading.Condition(self._frame_lock)
-        self._latest_jpeg = None
+        self._latest_chunk = None
         self._frame_seq = 0
         self._last_frame_ts = 0.0
-        self._placeholder_jpeg = self._build_placeholder_jpeg()
-        self._detector = ArUcoMarkerDetector()
+        self._frame_listeners = []
+        self._placeholder_chunk = multipart_chunk(self._build_placeholder_jpeg())
+        self._demand = CameraDemand(marker_logger, idle_release_s)
+        self._aruco = ArucoDetectionWorker(
+            ArUcoMarkerDetector(profile=aruco_profile),
+            marker_logger=marker_logger,
+            rate_hz=aruco_rate_hz,
+            name="RPi Camera",
+        )
 
     def start(self):
         if self._thread and self._thread.is_alive():
@@ -271,23 +683,50 @@ class RPiCameraReceiver:
         self._cleanup()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
+        self._aruco.stop()
 
     def get_latest_jpeg(self):
         with self._frame_lock:
-            return self._latest_jpeg
+            return _jpeg_from_chunk(self._latest_chunk)
 
-    def get_latest_jpeg_and_seq(self):
+    def get_latest_chunk(self):
         with self._frame_lock:
-            return self._latest_jpeg, self._frame_seq
+            return self._latest_chunk
 
-    def wait_for_next_frame(self, last_seq, timeout=0.25):
+    def wait_for_next_chunk(self, last_seq, timeout=0.25):
         with self._frame_cond:
             if self._frame_seq == last_seq:
                 self._frame_cond.wait(timeout=timeout)
-            return self._latest_jpeg, self._frame_seq
+            return self._latest_chunk, self._frame_seq
+
+    def get_placeholder_chunk(self):
+        return self._placeholder_chunk
+
+    # Bare-JPEG forms of the chunk methods, for callers of the original interface.
+    def get_latest_jpeg_and_seq(self):
+        with self._frame_lock:
+            return _jpeg_from_chunk(self._latest_chunk), self._frame_seq
+
+    def wait_for_next_frame(self, last_seq, timeout=0.25):
+        chunk, seq = self.wait_for_next_chunk(last_seq, timeout=timeout)
+        return _jpeg_from_chunk(chunk), seq
 
     def get_placeholder_jpeg(self):
-        return self._placeholder_jpeg
+        return _jpeg_from_chunk(self._placeholder_chunk)
+
+    def add_frame_listener(self, callback):
+        """Call ``callback(chunk)`` from the capture thread with each new frame's multipart chunk."""
+        self._frame_listeners = [*self._frame_listeners, callback]
+
+    def remove_frame_listener(self, callback):
+        self._frame_listeners = [cb for cb in self._frame_listeners if cb is not callback]
+
+    def add_viewer(self):
+        """Register a stream viewer; frames are only decoded and encoded while someone needs them."""
+        self._demand.add_viewer()
+
+    def remove_viewer(self):
+        self._demand.remove_viewer()
 
     def get_status(self):
         age_ms = None
@@ -305,24 +744,41 @@ class RPiCameraReceiver:
             "flip_180": self.flip_180,
             "last_frame_age_ms": age_ms,
             "last_error": self.last_error,
+            "aruco": self._aruco.get_stats(),
+            "demand": self._demand.get_stats(),
         }
 
     def _set_frame(self, frame):
-        frame = _process_aruco_frame(frame, self._detector, self.marker_logger)
+        frame = self._aruco.process(frame)
         ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
         if not ok:
             return
-        self._set_jpeg_bytes(buf.tobytes())
+        self._set_jpeg_bytes(buf)
 
     def _set_jpeg_bytes(self, jpg):
+        chunk = multipart_chunk(jpg)
         with self._frame_cond:
-            self._latest_jpeg = jpg
+            self._latest_chunk = chunk
             self._frame_seq += 1
             self._frame_cond.notify_all()
+        self._note_frame()
+        _notify_frame_listeners(self._frame_listeners, chunk)
+
+    def _note_frame(self):
         self._last_frame_ts = time.monotonic()
         self.is_connected = True
 
-    def _build_placeholder_jpeg(self):
+    def _frame_wanted(self):
+        if self._demand.poll():
+            return True
+        # Don't show a stale picture to the next viewer; it gets the placeholder until a fresh frame.
+        if self._latest_chunk is not None:
+            with self._frame_lock:
+                self._latest_chunk = None
+        return False
+
+    @staticmethod
+    def _build_placeholder_jpeg():
         blank = np.zeros((720, 1280, 3), dtype=np.uint8)
         cv2.putText(
             blank,
@@ -338,15 +794,29 @@ class RPiCameraReceiver:
         return buf.tobytes() if ok else b""
 
     def _run(self):
-        print("[RPi Camera] Trying OpenCV+GStreamer ...")
-        if self._opencv_gstreamer_available():
-            if self._run_opencv_gstreamer():
+        while self._demand.wait_until_needed(self._stop_event):
+            self._released_idle = False
+            print("[RPi Camera] Trying OpenCV+GStreamer ...")
+            ran = False
+            if self._opencv_gstreamer_available():
+                ran = self._run_opencv_gstreamer()
+            else:
+                print("[RPi Camera]   OpenCV has no GStreamer support, skipping.")
+
+            if not ran:
+                print("[RPi Camera] Trying gst-launch-1.0 ...")
+                self._run_gst_subprocess()
+            if not self._released_idle:
                 return
-        else:
-            print("[RPi Camera]   OpenCV has no GStreamer support, skipping.")
 
-        print("[RPi Camera] Trying gst-launch-1.0 ...")
-        self._run_gst_subprocess()
+    def _release_if_idle(self):
+        if self._demand.poll() or not self._demand.should_release():
+            return False
+        print("[RPi Camera] No viewers, closing the pipeline until needed")
+        self._released_idle = True
+        self.is_connected = False
+        self.is_listening = False
+        return True
 
     def _opencv_gstreamer_available(self):
         try:
@@ -377,8 +847,20 @@ class RPiCameraReceiver:
         self.is_listening = True
         had_frame = False
         while not self._stop_event.is_set():
-            ok, frame = cap.read()
+            if not self._frame_wanted():
+                # Nobody is watching: pull frames from the appsink without converting them.
+                if cap.grab():
+                    self._note_frame()
+                else:
+                    if self._is_stream_stale():
+                        self.is_connected = False
+                    time.sleep(0.01)
+                if self._release_if_idle():
+                    break
+                continue
+            ok, frame = cap.read(self._read_buf)
             if ok and frame is not None and frame.size > 0:
+                self._read_buf = frame
                 if not had_frame:
                     print("[RPi Camera] Receiving frames")
                     had_frame = True
@@ -474,10 +956,10 @@ class RPiCameraReceiver:
             return
 
         had_frame = False
-        buffer = bytearray()
+        splitter = JpegStreamSplitter(stream)
         while not self._stop_event.is_set():
-            chunk = stream.read(8192)
-            if not chunk:
+            frames = splitter.read_frames()
+            if frames is None:
                 if proc.poll() is not None:
                     if proc.returncode not in (0, None):
                         self.last_error = f"gst-launch exited with code {proc.returncode}"
@@ -485,32 +967,21 @@ class RPiCameraReceiver:
                 time.sleep(0.01)
                 continue
 
-            buffer.extend(chunk)
-
-            while True:
-                start = buffer.find(b"\xff\xd8")
-                if start < 0:
-                    if len(buffer) > 2:
-                        del buffer[:-2]
-                    break
-
-                end = buffer.find(b"\xff\xd9", start + 2)
-                if end < 0:
-                    if start > 0:
-                        del buffer[:start]
-                    break
-
-                jpg = bytes(buffer[start : end + 2])
-                del buffer[: end + 2]
-
+            for jpg in frames:
                 if not had_frame:
                     print("[RPi Camera] Receiving frames")
                     had_frame = True
-                # JPEG is already encoded by GStreamer; avoid re-decode/re-encode.
-                self._set_jpeg_bytes(jpg)
+                if self._frame_wanted():
+                    # JPEG is already encoded by GStreamer; avoid re-decode/re-encode.
+                    # The chunk copies the frame out of the splitter's buffer.
+                    self._set_jpeg_bytes(jpg)
+                else:
+                    self._note_frame()
 
             if self._is_stream_stale():
                 self.is_connected = False
+            if self._release_if_idle():
+                break
 
         self._cleanup_gst(proc)
 
@@ -575,6 +1046,9 @@ def init_rpi_camera(
     jpeg_quality=70,
     flip_180=False,
     marker_logger=None,
+    aruco_rate_hz=DEFAULT_ARUCO_RATE_HZ,
+    aruco_profile=DEFAULT_ARUCO_PROFILE,
+    idle_release_s=0.0,
 ):
     receiver = RPiCameraReceiver(
         host=host,
@@ -585,6 +1059,9 @@ def init_rpi_camera(
         jpeg_quality=jpeg_quality,
         flip_180=flip_180,
         marker_logger=marker_logger,
+        aruco_rate_hz=aruco_rate_hz,
+        aruco_profile=aruco_profile,
+        idle_release_s=idle_release_s,
     )
     receiver.start()
     return receiver
@@ -592,18 +1069,30 @@ def init_rpi_camera(
 
 def generate_rpi_frames(rpi_camera):
     """Flask MJPEG generator for latest frame from the RPi camera receiver."""
-    last_seq = -1
-    while True:
-        frame, seq = rpi_camera.wait_for_next_frame(last_seq, timeout=0.25)
-        if frame is None:
-            frame = rpi_camera.get_placeholder_jpeg()
-        elif seq == last_seq:
-            # no new frame yet
-            continue
+    return _generate_multipart(rpi_camera)
+
 
-        last_seq = seq
+FFMPEG_CAPTURE_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_ffmpeg_options_lock = threading.Lock()
 
-        yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
+
+def ffmpeg_capture_options(transport="tcp", low_latency=True, probesize=None, analyzeduration_us=None):
+    """Build an ``OPENCV_FFMPEG_CAPTURE_OPTIONS`` string (``key;value|key;value``) for an RTSP capture.
+
+    ``low_latency`` stops FFmpeg from buffering input (``fflags nobuffer``,
+    ``flags low_delay``); a small ``probesize``/``analyzeduration_us`` makes
+    opening the stream faster. ``None``/empty leaves FFmpeg's default.
+    """
+    options = []
+    if transport:
+        options.append(("rtsp_transport", transport))
+    if low_latency:
+        options += [("fflags", "nobuffer"), ("flags", "low_delay")]
+    if probesize:
+        options.append(("probesize", int(probesize)))
+    if analyzeduration_us is not None:
+        options.append(("analyzeduration", int(analyzeduration_us)))
+    return "|".join(f"{key};{value}" for key, value in options)
 
 
 class IPCameraReceiver:
@@ -611,9 +1100,15 @@ class IPCameraReceiver:
 
     Designed for SMTSEC SIP-K327GS (GK7205V300 DSP) and similar cameras
     that serve H.264/H.265 over RTSP.
+
+    One thread grabs every frame as soon as FFmpeg has it, so FFmpeg never
+    buffers a backlog; another resizes, detects and encodes. A grabbed frame
+    is only retrieved (converted to BGR) when the processing thread is free,
+    so slow processing drops frames instead of adding latency.
     """
 
     RECONNECT_DELAY = 3.0  # seconds between reconnect attempts
+    STALENESS_WINDOW = 120  # frames kept for the staleness stats
 
     def __init__(
         self,
@@ -623,8 +1118,13 @@ class IPCameraReceiver:
         jpeg_quality=70,
         flip_180=False,
         marker_logger=None,
+        aruco_rate_hz=DEFAULT_ARUCO_RATE_HZ,
+        aruco_profile=DEFAULT_ARUCO_PROFILE,
+        idle_release_s=0.0,
+        capture_options=None,
     ):
         self.url = url
+        self.capture_options = capture_options
         self.out_width = max(160, int(out_width))
         self.out_height = max(120, int(out_height))
         self.jpeg_quality = min(95, max(40, int(jpeg_quality)))
@@ -635,15 +1135,35 @@ class IPCameraReceiver:
 
         self._stop_event = threading.Event()
         self._thread = None
+        self._process_thread = None
         self._cap = None
 
+        self._grab_cond = threading.Condition()
+        self._grabbed = None  # (frame, monotonic grab time) waiting for the processing thread
+        self._processing = False
+        # Frame arrays reused for every frame. Only one frame is in flight at a time (the grab thread
+        # retrieves only while the processing thread is idle), so each buffer is free when it is reused.
+        self._retrieve_buf = None
+        self._resize_buf = None
+        self._rotate_buf = None
+        self.frames_grabbed = 0
+        self.frames_dropped = 0
+        self._staleness_ms = deque(maxlen=self.STALENESS_WINDOW)
+
         self._frame_lock = threading.Lock()
         self._frame_cond = threading.Condition(self._frame_lock)
-        self._latest_jpeg = None
+        self._latest_chunk = None
         self._frame_seq = 0
         self._last_frame_ts = 0.0
-        self._placeholder_jpeg = self._build_placeholder_jpeg()
-        self._detector = ArUcoMarkerDetector()
+        self._frame_listeners = []
+        self._placeholder_chunk = multipart_chunk(self._build_placeholder_jpeg())
+        self._demand = CameraDemand(marker_logger, idle_release_s)
+        self._aruco = ArucoDetectionWorker(
+            ArUcoMarkerDetector(profile=aruco_profile),
+            marker_logger=marker_logger,
+            rate_hz=aruco_rate_hz,
+            name="IP Camera",
+        )
 
     def start(self):
         if self._thread and self._thread.is_alive():
@@ -651,29 +1171,63 @@ class IPCameraReceiver:
         self._stop_event.clear()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
+        self._process_thread = threading.Thread(target=self._process_loop, name="IP Camera processing", daemon=True)
+        self._process_thread.start()
 
     def stop(self):
         self._stop_event.set()
+        with self._grab_cond:
+            self._grabbed = None
+            self._grab_cond.notify_all()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=3.0)
+        if self._process_thread and self._process_thread.is_alive():
+            self._process_thread.join(timeout=3.0)
         self._release_cap()
+        self._aruco.stop()
 
     def get_latest_jpeg(self):
         with self._frame_lock:
-            return self._latest_jpeg
+            return _jpeg_from_chunk(self._latest_chunk)
 
-    def get_latest_jpeg_and_seq(self):
+    def get_latest_chunk(self):
         with self._frame_lock:
-            return self._latest_jpeg, self._frame_seq
+            return self._latest_chunk
 
-    def wait_for_next_frame(self, last_seq, timeout=0.25):
+    def wait_for_next_chunk(self, last_seq, timeout=0.25):
         with self._frame_cond:
             if self._frame_seq == last_seq:
                 self._frame_cond.wait(timeout=timeout)
-            return self._latest_jpeg, self._frame_seq
+            return self._latest_chunk, self._frame_seq
+
+    def get_placeholder_chunk(self):
+        return self._placeholder_chunk
+
+    # Bare-JPEG forms of the chunk methods, for callers of the original interface.
+    def get_latest_jpeg_and_seq(self):
+        with self._frame_lock:
+            return _jpeg_from_chunk(self._latest_chunk), self._frame_seq
+
+    def wait_for_next_frame(self, last_seq, timeout=0.25):
+        chunk, seq = self.wait_for_next_chunk(last_seq, timeout=timeout)
+        return _jpeg_from_chunk(chunk), seq
 
     def get_placeholder_jpeg(self):
-        return self._placeholder_jpeg
+        return _jpeg_from_chunk(self._placeholder_chunk)
+
+    def add_frame_listener(self, callback):
+        """Call ``callback(chunk)`` from the capture thread with each new frame's multipart chunk."""
+        self._frame_listeners = [*self._frame_listeners, callback]
+
+    def remove_frame_listener(self, callback):
+        self._frame_listeners = [cb for cb in self._frame_listeners if cb is not callback]
+
+    def add_viewer(self):
+        """Register a stream viewer; frames are only decoded and encoded while someone needs them."""
+        self._demand.add_viewer()
+
+    def remove_viewer(self):
+        self._demand.remove_viewer()
 
     def get_status(self):
         age_ms = None
@@ -688,10 +1242,27 @@ class IPCameraReceiver:
             "flip_180": self.flip_180,
             "last_frame_age_ms": age_ms,
             "last_error": self.last_error,
+            "capture": self._capture_stats(),
+            "aruco": self._aruco.get_stats(),
+            "demand": self._demand.get_stats(),
+        }
+
+    def _capture_stats(self):
+        """Staleness is the time from grabbing a frame to publishing it, over the last frames."""
+        staleness = sorted(self._staleness_ms)
+        return {
+            "capture_options": self.capture_options,
+            "frames_grabbed": self.frames_grabbed,
+            "frames_dropped": self.frames_dropped,
+            "staleness_ms": {
+                "last": self._staleness_ms[-1] if staleness else None,
+                "p50": staleness[len(staleness) // 2] if staleness else None,
+                "max": staleness[-1] if staleness else None,
+            },
         }
 
     def _set_frame(self, frame):
-        frame = _process_aruco_frame(frame, self._detector, self.marker_logger)
+        frame = self._aruco.process(frame)
         ok, buf = cv2.imencode(
             ".jpg",
             frame,
@@ -699,14 +1270,32 @@ class IPCameraReceiver:
         )
         if not ok:
             return
+        self._set_jpeg_bytes(buf)
+
+    def _set_jpeg_bytes(self, jpg):
+        chunk = multipart_chunk(jpg)
         with self._frame_cond:
-            self._latest_jpeg = buf.tobytes()
+            self._latest_chunk = chunk
             self._frame_seq += 1
             self._frame_cond.notify_all()
+        self._note_frame()
+        _notify_frame_listeners(self._frame_listeners, chunk)
+
+    def _note_frame(self):
         self._last_frame_ts = time.monotonic()
         self.is_connected = True
 
-    def _build_placeholder_jpeg(self):
+    def _frame_wanted(self):
+        if self._demand.poll():
+            return True
+        # Don't show a stale picture to the next viewer; it gets the placeholder until a fresh frame.
+        if self._latest_chunk is not None:
+            with self._frame_lock:
+                self._latest_chunk = None
+        return False
+
+    @staticmethod
+    def _build_placeholder_jpeg():
         blank = np.zeros((720, 1280, 3), dtype=np.uint8)
         cv2.putText(
             blank,
@@ -723,8 +1312,18 @@ class IPCameraReceiver:
 
     def _open_stream(self):
         """Try to open the RTSP stream. Returns True on success."""
-        # Force TCP transport for reliability over Ethernet
-        cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG)
+        # OpenCV only takes FFmpeg options from the environment, read when the capture opens.
+        with _ffmpeg_options_lock:
+            previous = os.environ.get(FFMPEG_CAPTURE_OPTIONS_ENV)
+            if self.capture_options:
+                os.environ[FFMPEG_CAPTURE_OPTIONS_ENV] = self.capture_options
+            try:
+                cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG)
+            finally:
+                if previous is None:
+                    os.environ.pop(FFMPEG_CAPTURE_OPTIONS_ENV, None)
+                else:
+                    os.environ[FFMPEG_CAPTURE_OPTIONS_ENV] = previous
         if not cap.isOpened():
             cap.release()
             return False
@@ -742,7 +1341,7 @@ class IPCameraReceiver:
 
     def _run_loop(self):
         """Main thread: connect, read frames, then reconnect on failure."""
-        while not self._stop_event.is_set():
+        while self._demand.wait_until_needed(self._stop_event):
             print(f"[IP Camera] Connecting to {self.url} ...")
             if not self._open_stream():
                 self.last_error = f"Failed to open: {self.url}"
@@ -756,31 +1355,78 @@ class IPCameraReceiver:
             self.last_error = None
             had_frame = False
 
+            released_idle = False
+
             while not self._stop_event.is_set():
-                ok, frame = self._cap.read()
-                if not ok or frame is None:
+                wanted = self._frame_wanted()
+                ok = self._cap.grab()
+                if not ok:
                     print("[IP Camera] Lost connection, will reconnect ...")
                     self.is_connected = False
                     self._release_cap()
                     break
 
+                grabbed_at = time.monotonic()
+                self.frames_grabbed += 1
                 if not had_frame:
                     print("[IP Camera] Receiving frames")
                     had_frame = True
 
-                if frame.shape[1] != self.out_width or frame.shape[0] != self.out_height:
-                    frame = cv2.resize(frame, (self.out_width, self.out_height))
-                if self.flip_180:
-                    frame = cv2.rotate(frame, cv2.ROTATE_180)
-
-                self._set_frame(frame)
+                if wanted:
+                    self._hand_over(grabbed_at)
+                    continue
+                self._note_frame()
+                if self._demand.should_release():
+                    print("[IP Camera] No viewers, disconnecting until needed")
+                    self._release_cap()
+                    released_idle = True
+                    break
 
             # Brief pause before reconnecting
-            if not self._stop_event.is_set():
+            if not released_idle and not self._stop_event.is_set():
                 self._stop_event.wait(self.RECONNECT_DELAY)
 
         self._release_cap()
 
+    def _hand_over(self, grabbed_at):
+        """Retrieve the frame just grabbed if the processing thread is free, else drop it."""
+        with self._grab_cond:
+            busy = self._processing or self._grabbed is not None
+        if busy:
+            self.frames_dropped += 1
+            return
+        ok, frame = self._cap.retrieve(self._retrieve_buf)
+        if not ok or frame is None:
+            return
+        self._retrieve_buf = frame
+        with self._grab_cond:
+            self._grabbed = (frame, grabbed_at)
+            self._grab_cond.notify()
+
+    def _process_loop(self):
+        while True:
+            with self._grab_cond:
+                while self._grabbed is None and not self._stop_event.is_set():
+                    self._grab_cond.wait()
+                if self._stop_event.is_set():
+                    return
+                (frame, grabbed_at), self._grabbed = self._grabbed, None
+                self._processing = True
+            try:
+                if frame.shape[1] != self.out_width or frame.shape[0] != self.out_height:
+                    frame = self._resize_buf = cv2.resize(
+                        frame, (self.out_width, self.out_height), dst=self._resize_buf
+                    )
+                if self.flip_180:
+                    frame = self._rotate_buf = cv2.rotate(frame, cv2.ROTATE_180, dst=self._rotate_buf)
+                self._set_frame(frame)
+                self._staleness_ms.append(round((time.monotonic() - grabbed_at) * 1000.0, 1))
+            except Exception as exc:
+                print(f"[IP Camera] Frame processing failed: {exc}")
+            finally:
+                with self._grab_cond:
+                    self._processing = False
+
 
 def init_ip_camera(
     url,
@@ -789,6 +1435,10 @@ def init_ip_camera(
     jpeg_quality=70,
     flip_180=False,
     marker_logger=None,
+    aruco_rate_hz=DEFAULT_ARUCO_RATE_HZ,
+    aruco_profile=DEFAULT_ARUCO_PROFILE,
+    idle_release_s=0.0,
+    capture_options=None,
 ):
     """Initialize and start an IP camera receiver (RTSP/HTTP)."""
     receiver = IPCameraReceiver(
@@ -798,6 +1448,10 @@ def init_ip_camera(
         jpeg_quality=jpeg_quality,
         flip_180=flip_180,
         marker_logger=marker_logger,
+        aruco_rate_hz=aruco_rate_hz,
+        aruco_profile=aruco_profile,
+        idle_release_s=idle_release_s,
+        capture_options=capture_options,
     )
     receiver.start()
     return receiver
@@ -805,12 +1459,4 @@ def init_ip_camera(
 
 def generate_ip_camera_frames(ip_camera):
     """Flask MJPEG generator for the IP camera receiver."""
-    last_seq = -1
-    while True:
-        frame, seq = ip_camera.wait_for_next_frame(last_seq, timeout=0.25)
-        if frame is None:
-            frame = ip_camera.get_placeholder_jpeg()
-        elif seq == last_seq:
-            continue
-        last_seq = seq
-        yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
+    return _generate_multipart(ip_camera)
@@ -0,0 +1,465 @@
+"""Run a camera pipeline (capture, ArUco, JPEG encode) in its own process.
+
+Every receiver normally shares the dashboard's process, and its GIL, with
+Flask, the UDP receivers and the controller loop, so heavy frames delay
+time-critical threads such as the 20 Hz bitmask uplink. With
+``CAMERA_PROCESSES`` enabled, app.py starts each camera through
+:func:`start_camera_process` instead:
+
+* A child process (``python -m lib.camera_process``, or the frozen
+  executable with ``--camera-process``) runs the ordinary receiver class.
+* Each finished multipart chunk (see :func:`lib.camera.multipart_chunk`) is
+  written into a :class:`SharedRing` slot in ``multiprocessing.shared_memory``,
+  as are detections and a periodic status snapshot. The child then writes
+  one byte to its stdout pipe to wake the web process.
+* :class:`CameraProcessProxy` in the web process reads the newest slot with
+  a single copy, however many viewers there are. It exposes the same
+  interface as the in-process receivers (``get_latest_chunk``,
+  ``wait_for_next_chunk``, frame listeners, viewers, ``get_status``), so
+  routes and the MJPEG server work unchanged.
+* Viewer counts and whether the marker logger is enabled go the other way,
+  through control words in the frame ring's header. The child's receiver
+  sees them as its marker logger's ``enabled`` flag.
+
+The child exits when its stdin closes, and is restarted if it dies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import subprocess
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+from lib.camera import (
+    DefaultCameraReceiver,
+    IPCameraReceiver,
+    RPiCameraReceiver,
+    _jpeg_from_chunk,
+    _notify_frame_listeners,
+    multipart_chunk,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CAMERA_PROCESS_ARG = "--camera-process"  # argv[1] of the frozen executable when it runs a camera child
+DEFAULT_FRAME_SLOT_BYTES = 2 * 1024 * 1024
+FRAME_SLOTS = 4
+MESSAGE_SLOT_BYTES = 64 * 1024
+STATUS_INTERVAL = 0.25  # seconds between status snapshots; also bounds how fast control changes reach the child
+RESTART_DELAY = 3.0
+STOP_TIMEOUT = 5.0
+
+# Notification bytes on the child's stdout.
+NOTIFY_FRAME = b"f"
+NOTIFY_DETECTIONS = b"d"
+NOTIFY_STATUS = b"s"
+
+# Control words in the frame ring's header, written by the web process.
+CONTROL_VIEWERS = 0
+CONTROL_LOGGER_ENABLED = 1
+
+_RING_HEADER = struct.Struct("<4sIIIQ4I")  # magic, slots, slot size, pad, latest seq, control words
+_SLOT_HEADER = struct.Struct("<QI4x")  # seq, length
+_RING_MAGIC = b"TSR1"
+
+
+class SharedRing:
+    """Fixed-size slots of byte messages in shared memory, one writer and any number of readers.
+
+    The writer fills slot ``seq % slots`` and then publishes ``seq`` in the
+    header. Readers copy the newest slot and check that its sequence number
+    did not change while they copied (a seqlock), retrying if the writer
+    lapped them.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        magic, self.slots, self.slot_size, _pad, _seq, *_control = _RING_HEADER.unpack_from(shm.buf, 0)
+        if magic != _RING_MAGIC:
+            raise ValueError(f"{shm.name} is not a shared ring")
+        self.name = shm.name
+        self._write_seq = self.latest_seq
+        self.oversize_dropped = 0
+
+    @classmethod
+    def create(cls, slots: int, slot_size: int) -> SharedRing:
+        stride = _SLOT_HEADER.size + slot_size
+        shm = shared_memory.SharedMemory(create=True, size=_RING_HEADER.size + slots * stride)
+        _RING_HEADER.pack_into(shm.buf, 0, _RING_MAGIC, slots, slot_size, 0, 0, 0, 0, 0, 0)
+        for index in range(slots):
+            _SLOT_HEADER.pack_into(shm.buf, _RING_HEADER.size + index * stride, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedRing:
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 always registers the segment, and the child's resource tracker
+            # would unlink it when the child exits.
+            shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def latest_seq(self) -> int:
+        return struct.unpack_from("<Q", self._shm.buf, 16)[0]
+
+    def write(self, data) -> int:
+        """Publish *data* (any bytes-like object) and return its sequence number, or 0 if it does not fit."""
+        if len(data) > self.slot_size:
+            self.oversize_dropped += 1
+            return 0
+        seq = self._write_seq + 1
+        offset = self._slot_offset(seq)
+        buf = self._shm.buf
+        _SLOT_HEADER.pack_into(buf, offset, 0, 0)  # readers of this slot now retry
+        start = offset + _SLOT_HEADER.size
+        buf[start : start + len(data)] = data
+        _SLOT_HEADER.pack_into(buf, offset, seq, len(data))
+        struct.pack_into("<Q", buf, 16, seq)
+        self._write_seq = seq
+        return seq
+
+    def read_latest(self):
+        """Return ``(bytes, seq)`` for the newest message, or ``(None, 0)`` before the first one."""
+        buf = self._shm.buf
+        for _attempt in range(8):
+            seq = self.latest_seq
+            if seq == 0:
+                return None, 0
+            offset = self._slot_offset(seq)
+            slot_seq, length = _SLOT_HEADER.unpack_from(buf, offset)
+            if slot_seq != seq:
+                continue
+            start = offset + _SLOT_HEADER.size
+            data = bytes(buf[start : start + length])
+            if _SLOT_HEADER.unpack_from(buf, offset)[0] == seq:
+                return data, seq
+        return None, 0
+
+    def get_control(self, index: int) -> int:
+        return struct.unpack_from("<I", self._shm.buf, 24 + 4 * index)[0]
+
+    def set_control(self, index: int, value: int) -> None:
+        struct.pack_into("<I", self._shm.buf, 24 + 4 * index, int(value))
+
+    def close(self) -> None:
+        try:
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+    def _slot_offset(self, seq: int) -> int:
+        return _RING_HEADER.size + (seq % self.slots) * (_SLOT_HEADER.size + self.slot_size)
+
+
+RECEIVER_CLASSES = {"default": DefaultCameraReceiver, "rpi": RPiCameraReceiver, "ip": IPCameraReceiver}
+
+
+def _receiver_class(kind: str):
+    if kind not in RECEIVER_CLASSES:
+        raise ValueError(f"Unknown camera kind {kind!r}; expected one of {', '.join(RECEIVER_CLASSES)}")
+    return RECEIVER_CLASSES[kind]
+
+
+def _worker_command() -> list[str]:
+    if getattr(sys, "frozen", False):
+        return [sys.executable, CAMERA_PROCESS_ARG]
+    return [sys.executable, "-m", "lib.camera_process"]
+
+
+class CameraProcessProxy:
+    """Web-process side of a camera running in a child process; a drop-in for the receiver classes."""
+
+    def __init__(self, kind: str, marker_logger=None, frame_slot_bytes: int = DEFAULT_FRAME_SLOT_BYTES, **config):
+        receiver_class = _receiver_class(kind)
+        self.kind = kind
+        self.config = config
+        self.marker_logger = marker_logger
+        self.frame_slot_bytes = int(frame_slot_bytes)
+        self.restarts = 0
+        self.last_error = None
+
+        self._frames = None
+        self._detections = None
+        self._status_ring = None
+        self._proc = None
+        self._reader = None
+        self._stopping = threading.Event()
+        self._viewers = 0
+        self._viewer_lock = threading.Lock()
+
+        self._frame_lock = threading.Lock()
+        self._frame_cond = threading.Condition(self._frame_lock)
+        self._latest_chunk = None
+        self._frame_seq = 0
+        self._frame_listeners = []
+        self._status = {}
+        self._placeholder_chunk = multipart_chunk(receiver_class._build_placeholder_jpeg())
+
+    def start(self):
+        if self._reader and self._reader.is_alive():
+            return
+        self._stopping.clear()
+        self._frames = SharedRing.create(FRAME_SLOTS, self.frame_slot_bytes)
+        self._detections = SharedRing.create(2, MESSAGE_SLOT_BYTES)
+        self._status_ring = SharedRing.create(2, MESSAGE_SLOT_BYTES)
+        self._sync_control()
+        self._spawn()
+        self._reader = threading.Thread(target=self._read_loop, name=f"{self.kind} camera process", daemon=True)
+        self._reader.start()
+
+    def stop(self):
+        self._stopping.set()
+        proc = self._proc
+        if proc is not None:
+            _stop_child(proc)
+        if self._reader and self._reader.is_alive() and self._reader is not threading.current_thread():
+            self._reader.join(timeout=STOP_TIMEOUT)
+        for ring in (self._frames, self._detections, self._status_ring):
+            if ring is not None:
+                ring.close()
+        self._frames = self._detections = self._status_ring = None
+
+    def get_latest_jpeg(self):
+        with self._frame_lock:
+            return _jpeg_from_chunk(self._latest_chunk)
+
+    def get_latest_chunk(self):
+        with self._frame_lock:
+            return self._latest_chunk
+
+    def wait_for_next_chunk(self, last_seq, timeout=0.25):
+        with self._frame_cond:
+            if self._frame_seq == last_seq:
+                self._frame_cond.wait(timeout=timeout)
+            return self._latest_chunk, self._frame_seq
+
+    def get_placeholder_chunk(self):
+        return self._placeholder_chunk
+
+    # Bare-JPEG forms of the chunk methods, for callers of the original interface.
+    def get_latest_jpeg_and_seq(self):
+        with self._frame_lock:
+            return _jpeg_from_chunk(self._latest_chunk), self._frame_seq
+
+    def wait_for_next_frame(self, last_seq, timeout=0.25):
+        chunk, seq = self.wait_for_next_chunk(last_seq, timeout=timeout)
+        return _jpeg_from_chunk(chunk), seq
+
+    def get_placeholder_jpeg(self):
+        return _jpeg_from_chunk(self._placeholder_chunk)
+
+    def add_frame_listener(self, callback):
+        """Call ``callback(chunk)`` from the proxy's reader thread with each new frame's multipart chunk."""
+        self._frame_listeners = [*self._frame_listeners, callback]
+
+    def remove_frame_listener(self, callback):
+        self._frame_listeners = [cb for cb in self._frame_listeners if cb is not callback]
+
+    def add_viewer(self):
+        with self._viewer_lock:
+            self._viewers += 1
+            self._sync_control()
+
+    def remove_viewer(self):
+        with self._viewer_lock:
+            self._viewers = max(0, self._viewers - 1)
+            self._sync_control()
+
+    def get_status(self):
+        proc = self._proc
+        running = proc is not None and proc.poll() is None
+        status = dict(self._status) or {"connected": False}
+        if not running:
+            status["connected"] = False
+        status["process"] = {
+            "pid": proc.pid if proc is not None else None,
+            "running": running,
+            "restarts": self.restarts,
+            "viewers": self._viewers,
+            "last_error": self.last_error,
+            "frames_received": self._frame_seq,
+        }
+        return status
+
+    def _sync_control(self):
+        frames = self._frames
+        if frames is None:
+            return
+        logger = self.marker_logger
+        frames.set_control(CONTROL_VIEWERS, self._viewers)
+        frames.set_control(CONTROL_LOGGER_ENABLED, int(logger is not None and logger.enabled))
+
+    def _spawn(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+        cmd = _worker_command() + [
+            "--kind",
+            self.kind,
+            "--frames",
+            self._frames.name,
+            "--detections",
+            self._detections.name,
+            "--status",
+            self._status_ring.name,
+            "--config",
+            json.dumps(self.config),
+        ]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, bufsize=0)
+        print(f"[Camera Process] Started {self.kind} camera (pid {self._proc.pid})")
+
+    def _read_loop(self):
+        while not self._stopping.is_set():
+            proc = self._proc
+            try:
+                notes = proc.stdout.read(4096)
+            except (OSError, ValueError):
+                notes = b""
+            if not notes:
+                code = proc.wait()
+                if self._stopping.is_set():
+                    return
+                self.last_error = f"camera process exited with code {code}"
+                print(f"[Camera Process] {self.kind} {self.last_error}; restarting")
+                self._set_chunk(None)
+                if self._stopping.wait(RESTART_DELAY):
+                    return
+                self.restarts += 1
+                self._spawn()
+                continue
+            if NOTIFY_FRAME in notes:
+                chunk, _seq = self._frames.read_latest()
+                if chunk is not None:
+                    self._set_chunk(chunk)
+            if NOTIFY_DETECTIONS in notes and self.marker_logger is not None:
+                data, _seq = self._detections.read_latest()
+                if data is not None:
+                    self.marker_logger.record_visible(json.loads(data))
+            if NOTIFY_STATUS in notes:
+                data, _seq = self._status_ring.read_latest()
+                if data is not None:
+                    self._status = json.loads(data)
+                self._sync_control()
+
+    def _set_chunk(self, chunk):
+        with self._frame_cond:
+            self._latest_chunk = chunk
+            self._frame_seq += 1
+            self._frame_cond.notify_all()
+        if chunk is not None:
+            _notify_frame_listeners(self._frame_listeners, chunk)
+
+
+def _stop_child(proc):
+    try:
+        proc.stdin.close()
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait(timeout=STOP_TIMEOUT)
+
+
+def start_camera_process(kind: str, marker_logger=None, **config) -> CameraProcessProxy:
+    """Start camera *kind* ("default", "rpi" or "ip") in a child process; *config* goes to its receiver."""
+    proxy = CameraProcessProxy(kind, marker_logger=marker_logger, **config)
+    proxy.start()
+    return proxy
+
+
+class _RemoteConsumers:
+    """Stands in for the marker logger inside the child.
+
+    ``enabled`` is true while the web process has viewers or an enabled
+    marker logger, which is what the receiver's demand tracking asks.
+    Detections are forwarded to the web process's logger.
+    """
+
+    def __init__(self, frames: SharedRing, detections: SharedRing, notify):
+        self._frames = frames
+        self._detections = detections
+        self._notify = notify
+
+    @property
+    def enabled(self):
+        return bool(self._frames.get_control(CONTROL_VIEWERS) or self._frames.get_control(CONTROL_LOGGER_ENABLED))
+
+    def record_visible(self, detections):
+        self._detections.write(json.dumps(detections).encode())
+        self._notify(NOTIFY_DETECTIONS)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run one camera pipeline for the Topside dashboard")
+    parser.add_argument("--kind", required=True)
+    parser.add_argument("--frames", required=True)
+    parser.add_argument("--detections", required=True)
+    parser.add_argument("--status", required=True)
+    parser.add_argument("--config", default="{}")
+    args = parser.parse_args(argv)
+
+    # stdout carries wake-up bytes to the web process; everything printed goes to stderr instead.
+    notify_fd = os.dup(1)
+    os.dup2(2, 1)
+    stop_event = threading.Event()
+    notify_lock = threading.Lock()
+
+    def notify(note):
+        try:
+            with notify_lock:
+                os.write(notify_fd, note)
+        except OSError:
+            stop_event.set()  # the web process is gone
+
+    frames = SharedRing.attach(args.frames)
+    detections = SharedRing.attach(args.detections)
+    status = SharedRing.attach(args.status)
+    receiver = _receiver_class(args.kind)(
+        marker_logger=_RemoteConsumers(frames, detections, notify), **json.loads(args.config)
+    )
+
+    def publish(chunk):
+        if frames.write(chunk):
+            notify(NOTIFY_FRAME)
+
+    def watch_stdin():
+        try:
+            while sys.stdin.buffer.read(4096):
+                pass
+        except (OSError, ValueError):
+            pass
+        stop_event.set()
+
+    receiver.add_frame_listener(publish)
+    threading.Thread(target=watch_stdin, daemon=True).start()
+    receiver.start()
+    try:
+        while not stop_event.wait(STATUS_INTERVAL):
+            snapshot = receiver.get_status()
+            snapshot["frames_oversize_dropped"] = frames.oversize_dropped
+            status.write(json.dumps(snapshot).encode())
+            notify(NOTIFY_STATUS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.stop()
+        for ring in (frames, detections, status):
+            ring.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
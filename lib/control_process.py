@@ -0,0 +1,645 @@
+"""Run the controller loop and the bitmask uplink in their own process.
+
+The safety-critical path (:meth:`Controller.update` -> ``_dispatch_manual_axes``
+-> :meth:`BitmaskClient.set_from_axes` -> the 20 Hz sender thread) normally
+shares the dashboard's process, and its GIL, with Flask, camera decoding and
+the UDP receivers. With ``CONTROL_PROCESS`` enabled, app.py starts it through
+:func:`init_control_process` instead:
+
+* A child process (``python -m lib.control_process``, or the frozen
+  executable with ``--control-process``) owns the joystick, the
+  :class:`Controller` and the :class:`BitmaskClient`. It can be pinned to one
+  CPU and given a higher scheduling priority where the OS permits.
+* The web process talks to it over the child's stdin/stdout pipes, one JSON
+  object per line. Calls that change state (``kill``, ``start_pid``,
+  ``set_light``, ...) are forwarded and wait for the reply, which carries the
+  child's fresh state.
+* Reads (``get_control_state``, ``get_uplink_status``, ...) are answered
+  from the latest state snapshot, which the child pushes every
+  :data:`STATUS_INTERVAL`, so a busy web process never blocks the loop.
+* :class:`RemoteController` and :class:`RemoteBitmaskClient` expose the
+  interface the routes already use, so ``app.config["CONTROLLER"]`` and
+  ``app.config["BITMASK"]`` are drop-in replacements.
+
+The watchdog's UDP ack counters are pushed to the child, and PID setpoint
+sends are forwarded back to the web process's setpoint override client. If
+the child dies it is restarted *killed*, so thrusters stay neutral until the
+operator rearms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from lib.bitmask import DEFAULT_MIN_SEND_GAP, EMERGENCY_BURST_COUNT, EMERGENCY_BURST_GAP
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CONTROL_PROCESS_ARG = "--control-process"  # argv[1] of the frozen executable when it runs the control child
+STATUS_INTERVAL = 0.05  # seconds between state snapshots from the child
+COUNTER_INTERVAL = 0.1  # seconds between UDP counter checks for the child's watchdog
+CALL_TIMEOUT = 2.0
+STARTUP_TIMEOUT = 15.0
+RESTART_DELAY = 1.0
+STOP_TIMEOUT = 5.0
+HIGH_PRIORITY_NICE = -10
+_WINDOWS_HIGH_PRIORITY_CLASS = 0x00000080
+
+# Everything the web process may call in the child; any other name is rejected.
+CONTROLLER_CALLS = (
+    "kill",
+    "emergency_stop",
+    "rearm",
+    "start_pid",
+    "stop_pid",
+    "set_pid_setpoints",
+    "clear_pid_setpoint",
+    "set_pid_rates",
+    "apply_manual_axes_once",
+    "set_light",
+    "set_manipulator",
+    "set_debug_override",
+    "clear_debug_override",
+    "note_pid_error",
+)
+
+
+class ControlProcessError(RuntimeError):
+    """The control process is not running or did not answer in time."""
+
+
+def _worker_command() -> list[str]:
+    if getattr(sys, "frozen", False):
+        return [sys.executable, CONTROL_PROCESS_ARG]
+    return [sys.executable, "-m", "lib.control_process"]
+
+
+def apply_process_priority(cpu: int | None = None, high_priority: bool = False) -> dict:
+    """Pin the current process to *cpu* and/or raise its priority, as far as the OS allows.
+
+    Returns what was applied; failures (usually missing permissions) are
+    reported under ``"errors"`` instead of raised.
+    """
+    applied = {"cpu": None, "high_priority": False, "errors": []}
+    if cpu is not None:
+        try:
+            if hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, {int(cpu)})
+            elif os.name == "nt":
+                import ctypes
+
+                kernel32 = ctypes.windll.kernel32
+                if not kernel32.SetProcessAffinityMask(kernel32.GetCurrentProcess(), ctypes.c_size_t(1 << int(cpu))):
+                    raise ctypes.WinError()
+            else:
+                raise OSError("CPU pinning is not supported on this platform")
+            applied["cpu"] = int(cpu)
+        except (OSError, ValueError) as exc:
+            applied["errors"].append(f"cpu {cpu}: {exc}")
+    if high_priority:
+        try:
+            if os.name == "nt":
+                import ctypes
+
+                kernel32 = ctypes.windll.kernel32
+                if not kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), _WINDOWS_HIGH_PRIORITY_CLASS):
+                    raise ctypes.WinError()
+            else:
+                os.setpriority(os.PRIO_PROCESS, 0, HIGH_PRIORITY_NICE)
+            applied["high_priority"] = True
+        except OSError as exc:
+            applied["errors"].append(f"priority: {exc}")
+    return applied
+
+
+class ControlProcess:
+    """Web-process side of the control child: starts it, forwards calls and caches its state."""
+
+    def __init__(
+        self,
+        rate_hz: float = 20.0,
+        host: str | None = None,
+        port: int | None = None,
+        controller_hz: float = 60.0,
+        cpu: int | None = None,
+        high_priority: bool = False,
+        send_on_change: bool = False,
+        min_send_gap: float = DEFAULT_MIN_SEND_GAP,
+    ):
+        self.config = {
+            "rate_hz": float(rate_hz),
+            "host": host,
+            "port": port,
+            "send_on_change": bool(send_on_change),
+            "min_send_gap": float(min_send_gap),
+            "controller_hz": float(controller_hz),
+            "cpu": cpu,
+            "high_priority": bool(high_priority),
+        }
+        self.restarts = 0
+        self.last_error = None
+        self.controller = RemoteController(self)
+        self.bitmask = RemoteBitmaskClient(self)
+
+        self._proc = None
+        self._reader = None
+        self._counter_thread = None
+        self._stopping = threading.Event()
+        self._send_lock = threading.Lock()
+        self._calls_lock = threading.Lock()
+        self._pending = {}
+        self._next_id = 0
+        self._state_cond = threading.Condition()
+        self._state = None
+        self._state_received = 0.0
+        self._version_base = 0
+        self._last_uplink_sequence = None
+
+    def start(self):
+        if self._reader and self._reader.is_alive():
+            return
+        self._stopping.clear()
+        self._spawn(start_killed=False)
+        self._reader = threading.Thread(target=self._read_loop, name="ControlProcessReader", daemon=True)
+        self._reader.start()
+        self._counter_thread = threading.Thread(target=self._counter_loop, name="ControlProcessCounters", daemon=True)
+        self._counter_thread.start()
+        with self._state_cond:
+            if not self._state_cond.wait_for(lambda: self._state is not None, timeout=STARTUP_TIMEOUT):
+                self.stop()
+                raise ControlProcessError("control process did not report its state")
+
+    def stop(self):
+        self._stopping.set()
+        proc = self._proc
+        if proc is not None:
+            _stop_child(proc)
+        for thread in (self._reader, self._counter_thread):
+            if thread and thread.is_alive() and thread is not threading.current_thread():
+                thread.join(timeout=STOP_TIMEOUT)
+
+    def call(self, name: str, *args, **kwargs):
+        """Run ``controller.<method>`` or ``bitmask.<method>`` in the child and return its result."""
+        pending = {"done": threading.Event()}
+        with self._calls_lock:
+            self._next_id += 1
+            call_id = self._next_id
+            self._pending[call_id] = pending
+        try:
+            self._send({"id": call_id, "call": name, "args": args, "kwargs": kwargs})
+            if not pending["done"].wait(CALL_TIMEOUT):
+                raise ControlProcessError(f"control process did not answer {name}")
+        finally:
+            with self._calls_lock:
+                self._pending.pop(call_id, None)
+        if "error" in pending:
+            raise ControlProcessError(pending["error"])
+        return pending.get("result")
+
+    def state(self) -> dict:
+        """Latest snapshot from the child (shared; callers copy what they hand out)."""
+        return self._state or {}
+
+    def state_age(self) -> float:
+        return max(0.0, time.monotonic() - self._state_received) if self._state_received else 0.0
+
+    def state_version(self) -> int:
+        return self._version_base + int(self.state().get("state_version", 0))
+
+    def get_status(self) -> dict:
+        proc = self._proc
+        return {
+            "pid": proc.pid if proc is not None else None,
+            "running": proc is not None and proc.poll() is None,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+            "state_age_ms": self.state_age() * 1000.0,
+            "priority": self.state().get("priority"),
+        }
+
+    def _send(self, message: dict):
+        data = (json.dumps(message) + "\n").encode()
+        proc = self._proc
+        try:
+            with self._send_lock:
+                proc.stdin.write(data)
+                proc.stdin.flush()
+        except (AttributeError, OSError, ValueError) as exc:
+            raise ControlProcessError("control process is not running") from exc
+
+    def _spawn(self, start_killed: bool, pid_rates: dict | None = None):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+        config = dict(self.config, start_killed=start_killed, pid_rates=pid_rates)
+        cmd = _worker_command() + ["--config", json.dumps(config)]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        print(f"[Control Process] Started controller and uplink (pid {self._proc.pid})")
+
+    def _read_loop(self):
+        while not self._stopping.is_set():
+            proc = self._proc
+            try:
+                line = proc.stdout.readline()
+            except (OSError, ValueError):
+                line = b""
+            if line:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    # A child killed mid-write leaves a partial last line; the EOF after it triggers the restart.
+                    print(f"[Control Process] Skipping malformed message ({len(line)} bytes)")
+                    continue
+                self._handle(message)
+                continue
+            code = proc.wait()
+            self._fail_pending(f"control process exited with code {code}")
+            if self._stopping.is_set():
+                return
+            self.last_error = f"control process exited with code {code}"
+            print(f"[Control Process] {self.last_error}; restarting killed")
+            if self._stopping.wait(RESTART_DELAY):
+                return
+            self.restarts += 1
+            self._version_base = self.state_version() + 1
+            # Rates go in the child's config: a call from here would wait on replies only this thread reads.
+            rates = self.state().get("control_state", {}).get("pid_setpoint_rates")
+            self._spawn(start_killed=True, pid_rates=rates)
+
+    def _handle(self, message: dict):
+        if "state" in message:
+            self._set_state(message["state"])
+        if "id" in message:
+            with self._calls_lock:
+                pending = self._pending.get(message["id"])
+            if pending is not None:
+                if "error" in message:
+                    pending["error"] = message["error"]
+                pending["result"] = message.get("result")
+                pending["done"].set()
+        if "setpoints" in message:
+            self._forward_setpoints(message["setpoints"])
+
+    def _set_state(self, state: dict):
+        with self._state_cond:
+            self._state = state
+            self._state_received = time.monotonic()
+            self._state_cond.notify_all()
+        bus = self.bitmask._event_bus
+        sequence = state.get("uplink", {}).get("sequence")
+        if bus is not None and sequence != self._last_uplink_sequence and bus.has_subscribers("uplink"):
+            bus.publish("uplink", self.bitmask.get_uplink_status())
+        self._last_uplink_sequence = sequence
+
+    def _fail_pending(self, error: str):
+        with self._calls_lock:
+            pending = list(self._pending.values())
+        for entry in pending:
+            entry["error"] = error
+            entry["done"].set()
+
+    def _forward_setpoints(self, setpoints: dict):
+        client = self.controller._setpoint_client
+        if client is None:
+            return
+        try:
+            client.send_override(setpoints, replay_attempts=1, replay_delay=0.0)
+            error = None
+        except Exception as exc:  # pylint: disable=broad-except
+            error = str(exc)
+            if hasattr(client, "set_error"):
+                client.set_error(error)
+        try:
+            self._send({"call": "controller.note_pid_error", "args": [error]})
+        except ControlProcessError:
+            pass
+
+    def _counter_loop(self):
+        last = None
+        while not self._stopping.wait(COUNTER_INTERVAL):
+            monitor = self.bitmask._resource_monitor
+            counters = getattr(monitor, "get_udp_counters", None)
+            if counters is None:
+                continue
+            current = list(counters())
+            if current == last:
+                continue
+            try:
+                self._send({"call": "counters.set", "args": current})
+                last = current
+            except ControlProcessError:
+                last = None
+
+
+class RemoteController:
+    """Drop-in for :class:`lib.controller.Controller` whose loop runs in the control process."""
+
+    def __init__(self, process: ControlProcess):
+        self._process = process
+        self._setpoint_client = None
+
+    def _control_state(self) -> dict:
+        return self._process.state().get("control_state", {})
+
+    def start(self):
+        """The loop is started by the control process itself."""
+
+    def stop(self):
+        self._process.stop()
+
+    def set_setpoint_client(self, client):
+        """PID setpoint sends from the child go out through *client* in this process."""
+        self._setpoint_client = client
+
+    def is_killed(self):
+        return bool(self._control_state().get("killed", False))
+
+    def is_pid_enabled(self):
+        return bool(self._control_state().get("pid_enabled", False))
+
+    def get_pid_setpoints(self):
+        return dict(self._control_state().get("pid_setpoints", {}))
+
+    def get_pid_rates(self):
+        return dict(self._control_state().get("pid_setpoint_rates", {}))
+
+    def get_state_version(self):
+        return self._process.state_version()
+
+    def get_control_state(self):
+        return copy.deepcopy(self._control_state())
+
+    def get_light(self):
+        return self._process.state().get("light", 0.0)
+
+    def get_manipulator(self):
+        return dict(self._process.state().get("manipulator", {}))
+
+    def get_input_status(self):
+        return copy.deepcopy(self._process.state().get("input_status", {}))
+
+    def get_loop_stats(self):
+        return copy.deepcopy(self._process.state().get("loop", {}))
+
+    def kill(self):
+        return self._process.call("controller.kill")
+
+    def emergency_stop(self, burst=EMERGENCY_BURST_COUNT, gap=EMERGENCY_BURST_GAP):
+        return self._process.call("controller.emergency_stop", burst=burst, gap=gap)
+
+    def rearm(self):
+        return self._process.call("controller.rearm")
+
+    def start_pid(self, setpoints):
+        return self._process.call("controller.start_pid", setpoints)
+
+    def stop_pid(self, clear=True):
+        return self._process.call("controller.stop_pid", clear=clear)
+
+    def set_pid_setpoints(self, setpoints):
+        return self._process.call("controller.set_pid_setpoints", setpoints)
+
+    def clear_pid_setpoint(self, axis):
+        return self._process.call("controller.clear_pid_setpoint", axis)
+
+    def set_pid_rates(self, rates):
+        return self._process.call("controller.set_pid_rates", rates)
+
+    def apply_manual_axes_once(self, axes, source="HTTP"):
+        return self._process.call("controller.apply_manual_axes_once", axes, source=source)
+
+    def set_light(self, level):
+        return self._process.call("controller.set_light", level)
+
+    def set_manipulator(self, setpoint_deg, source="gui"):
+        return self._process.call("controller.set_manipulator", setpoint_deg, source=source)
+
+    def set_debug_override(self, axes: dict):
+        return self._process.call("controller.set_debug_override", axes)
+
+    def clear_debug_override(self):
+        return self._process.call("controller.clear_debug_override")
+
+
+class RemoteBitmaskClient:
+    """Drop-in for :class:`lib.bitmask.BitmaskClient` whose sender runs in the control process."""
+
+    _AGE_FIELDS = ("last_send_age_ms", "last_ack_age_ms", "last_watchdog_resend_age_ms")
+
+    def __init__(self, process: ControlProcess):
+        self._process = process
+        self._resource_monitor = None
+        self._event_bus = None
+
+    def start(self):
+        """The sender is started by the control process itself."""
+
+    def stop(self):
+        self._process.stop()
+
+    def set_resource_monitor(self, monitor) -> None:
+        """The monitor's UDP counters are pushed to the child's watchdog."""
+        self._resource_monitor = monitor
+
+    def set_event_bus(self, bus) -> None:
+        """Publish uplink status on the ``uplink`` topic whenever the child reports a new send."""
+        self._event_bus = bus
+
+    @property
+    def period(self):
+        return self._process.state().get("period", 0.0)
+
+    @period.setter
+    def period(self, value):
+        self._process.call("bitmask.set_period", value)
+
+    def get_command(self) -> dict:
+        return dict(self._process.state().get("command", {}))
+
+    def get_uplink_status(self) -> dict:
+        status = copy.deepcopy(self._process.state().get("uplink", {}))
+        # Ages were measured when the snapshot was taken; account for the time since.
+        elapsed_ms = self._process.state_age() * 1000.0
+        for field in self._AGE_FIELDS:
+            if status.get(field) is not None:
+                status[field] += elapsed_ms
+        status["process"] = self._process.get_status()
+        return status
+
+    def set_command(self, **kwargs):
+        self._process.call("bitmask.set_command", **kwargs)
+
+    def set_from_axes(self, **axes):
+        self._process.call("bitmask.set_from_axes", **axes)
+
+
+def _stop_child(proc):
+    try:
+        proc.stdin.close()
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait(timeout=STOP_TIMEOUT)
+
+
+def init_control_process(
+    rate_hz: float = 20.0,
+    host: str | None = None,
+    port: int | None = None,
+    controller_hz: float = 60.0,
+    cpu: int | None = None,
+    high_priority: bool = False,
+    send_on_change: bool = False,
+    min_send_gap: float = DEFAULT_MIN_SEND_GAP,
+) -> ControlProcess:
+    process = ControlProcess(
+        rate_hz=rate_hz,
+        host=host,
+        port=port,
+        controller_hz=controller_hz,
+        cpu=cpu,
+        high_priority=high_priority,
+        send_on_change=send_on_change,
+        min_send_gap=min_send_gap,
+    )
+    process.start()
+    return process
+
+
+class _RemoteCounters:
+    """Stands in for the resource monitor inside the child; the web process pushes its counters."""
+
+    def __init__(self):
+        self._counters = (0, 0)
+
+    def set(self, rx, errors):
+        self._counters = (int(rx), int(errors))
+
+    def get_udp_counters(self):
+        return self._counters
+
+
+class _RemoteSetpointClient:
+    """Stands in for the setpoint override client inside the child; sends are forwarded to the web process."""
+
+    # The web process does the real send and reports its outcome back with
+    # controller.note_pid_error, so the controller must not record one here.
+    forwards_sends = True
+
+    def __init__(self, send):
+        self._send = send
+
+    def send_override(self, axes, replay_attempts=1, replay_delay=0.0):
+        self._send({"setpoints": axes})
+
+
+def _snapshot(controller, bitmask, priority) -> dict:
+    return {
+        "state_version": controller.get_state_version(),
+        "control_state": controller.get_control_state(),
+        "light": controller.get_light(),
+        "manipulator": controller.get_manipulator(),
+        "input_status": controller.get_input_status(),
+        "loop": controller.get_loop_stats(),
+        "command": bitmask.get_command(),
+        "uplink": bitmask.get_uplink_status(),
+        "period": bitmask.period,
+        "priority": priority,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Topside controller loop and bitmask uplink")
+    parser.add_argument("--config", default="{}")
+    args = parser.parse_args(argv)
+    config = json.loads(args.config)
+
+    # stdout carries the channel to the web process; everything printed goes to stderr instead.
+    channel_fd = os.dup(1)
+    os.dup2(2, 1)
+    stop_event = threading.Event()
+    send_lock = threading.Lock()
+
+    def send(message):
+        data = (json.dumps(message) + "\n").encode()
+        try:
+            with send_lock:
+                os.write(channel_fd, data)
+        except OSError:
+            stop_event.set()  # the web process is gone
+
+    priority = apply_process_priority(cpu=config.get("cpu"), high_priority=config.get("high_priority", False))
+    for error in priority["errors"]:
+        print(f"[Control Process] Could not apply {error}")
+
+    # Imported only now so pygame's start-up output lands on stderr, not the channel.
+    from lib.bitmask import NUCLEO_HOST, NUCLEO_PORT, init_bitmask
+    from lib.controller import Controller
+
+    bitmask = init_bitmask(
+        rate_hz=config.get("rate_hz", 20.0),
+        host=config.get("host") or NUCLEO_HOST,
+        port=config.get("port") or NUCLEO_PORT,
+        send_on_change=config.get("send_on_change", False),
+        min_send_gap=config.get("min_send_gap", DEFAULT_MIN_SEND_GAP),
+    )
+    counters = _RemoteCounters()
+    bitmask.set_resource_monitor(counters)
+    controller = Controller(bitmask_client=bitmask, rate_hz=config.get("controller_hz", 60.0))
+    controller.set_setpoint_client(_RemoteSetpointClient(send))
+    if config.get("pid_rates"):
+        controller.set_pid_rates(config["pid_rates"])
+    if config.get("start_killed"):
+        controller.kill()
+
+    calls = {f"controller.{name}": getattr(controller, name) for name in CONTROLLER_CALLS}
+    calls["bitmask.set_command"] = bitmask.set_command
+    calls["bitmask.set_from_axes"] = bitmask.set_from_axes
+    calls["bitmask.set_period"] = lambda period: setattr(bitmask, "period", float(period))
+    calls["counters.set"] = counters.set
+
+    def handle(message):
+        call_id = message.get("id")
+        reply = {"id": call_id}
+        try:
+            func = calls[message["call"]]
+            reply["result"] = func(*message.get("args", ()), **message.get("kwargs", {}))
+        except Exception as exc:  # pylint: disable=broad-except
+            reply["error"] = f"{message.get('call')}: {exc}"
+        if call_id is not None:
+            reply["state"] = _snapshot(controller, bitmask, priority)
+            send(reply)
+
+    def read_commands():
+        try:
+            for line in sys.stdin.buffer:
+                handle(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        stop_event.set()
+
+    threading.Thread(target=read_commands, name="ControlProcessCommands", daemon=True).start()
+    controller.start()
+    try:
+        while not stop_event.is_set():
+            send({"state": _snapshot(controller, bitmask, priority)})
+            stop_event.wait(STATUS_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.stop()
+        bitmask.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
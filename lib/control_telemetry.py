@@ -5,64 +5,299 @@ latest setpoint, measurement, output, error, gain, and input values for each
 axis. The decoder accepts the older compact packet too, so Topside can still
 show partial telemetry if the MCU has not been flashed yet.
 
+History is kept as raw decoded values in a fixed-capacity NumPy ring (see
+:mod:`lib.history_ring`); snapshot dicts are only built for the rows an API
+caller asks for.
+
+:meth:`ControlTelemetryReceiver.confirm_stopped` watches the same history for
+the packet confirming a kill switch press and records the latency.
+
 The CRC covers the bytes up to but excluding the CRC field.
 """
 
 from __future__ import annotations
 
 import json
+import math
+import socket
 import struct
 import threading
 import time
-from collections import deque
-from typing import Deque, Dict, List
+from typing import Dict, List
+
+import numpy as np
 
-from lib.crc import crc32_ieee
+from lib.history_ring import HistoryRing, dtype_from_schema
 from lib.json_data_handler import JSONDataHandler
-from lib.net_transport import UdpConfig, UdpListener
+from lib.latency_histogram import LatencyHistogram
+from lib.net_transport import UdpConfig, UdpListener, UdpReactor
+from lib.packet_schema import CONTROL_TELEMETRY_V1, CONTROL_TELEMETRY_V2
 from lib.runtime_paths import log_path, logs_dir
 
 CONTROL_TELEM_PORT = 5005
+CONTROL_TELEMETRY_SO_RCVBUF = 256 * 1024
 AXES = ["surge", "sway", "heave", "roll", "pitch", "yaw"]
 PID_GAINS = ["kp", "ki", "kd"]
+# Packet layouts live in lib.packet_schema; these describe the v2 body for tools and tests.
 OLD_FLOAT_COUNT = len(AXES) * 3
-OLD_PACKET_SIZE = 4 + OLD_FLOAT_COUNT * 4 + struct.calcsize("<fH") + 4
+OLD_PACKET_SIZE = CONTROL_TELEMETRY_V1.size
 NEW_META_FORMAT = "<BBB6bBb"
 NEW_META_SIZE = struct.calcsize(NEW_META_FORMAT)
 NEW_FLOAT_COUNT = len(AXES) * 7
-NEW_PACKET_SIZE = 12 + NEW_META_SIZE + NEW_FLOAT_COUNT * 4 + struct.calcsize("<fH") + 4
+NEW_PACKET_SIZE = CONTROL_TELEMETRY_V2.size
 PACKET_SIZE = NEW_PACKET_SIZE
 HISTORY_CAPACITY = 3000  # 5 minutes @ 10 Hz
+# One ring row per packet; v1 packets leave the v2-only columns at their defaults.
+HISTORY_DTYPE = dtype_from_schema(
+    CONTROL_TELEMETRY_V2,
+    extra=[
+        ("timestamp", "f8"),
+        ("received_ns", "i8"),  # time.monotonic_ns() at receive; kill confirmation compares against it
+        ("protocol_version", "u1"),
+        ("host", "u4"),
+        ("port", "u2"),
+    ],
+)
+_V1_ONLY_DEFAULTS = {
+    "mcu_uptime_ms": 0,
+    "last_command_age_ms": 0,
+    "flags": 0,
+    "override_mask": 0,
+    "pid_active_mask": 0,
+    "pilot": (0,) * len(AXES),
+    "light": 0,
+    "manipulator_command": 0,
+    "measurement": (float("nan"),) * len(AXES),
+    "gains": (float("nan"),) * len(AXES) * 3,
+}
 LOG_DIR = logs_dir()
 CONTROL_LOG = log_path("control_telemetry.ndjson")
 FLAG_TIMEOUT = 0x01
 FLAG_OVERRIDE = 0x02
 FLAG_PID = 0x04
+KILL_CONFIRM_TIMEOUT = 1.0  # seconds after the kill to wait for telemetry showing neutral output
+KILL_CONFIRM_POLL = 0.01
+KILL_CONFIRM_SCAN = 300  # history rows searched per poll
+NEUTRAL_OUTPUT_EPS = 1e-3
+
+
+# Columns rounded when snapshots are built, and to how many decimals. Rounding
+# is x * 10**d -> rint -> / 10**d on both paths, so a packet's live snapshot and
+# its history row match exactly (np.round uses the same steps).
+_ROUNDING = {
+    "setpoint": 4,
+    "measurement": 4,
+    "output": 4,
+    "error": 4,
+    "gains": 6,
+    "manip_deg": 2,
+}
+
+
+def _pack_host(host: str) -> int:
+    try:
+        return struct.unpack("!I", socket.inet_aton(host))[0]
+    except OSError:
+        return 0
+
+
+def _unpack_host(value: int) -> str:
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+
+def _round(value: float, scale: float) -> float:
+    return round(value * scale) / scale if math.isfinite(value) else value
+
+
+def _rounded_fields(fields: dict) -> dict:
+    """Round a single decoded packet's float fields in place of np.round."""
+    out = dict(fields)
+    for name, digits in _ROUNDING.items():
+        if name in out:
+            scale = 10.0**digits
+            value = out[name]
+            out[name] = _round(value, scale) if isinstance(value, float) else [_round(v, scale) for v in value]
+    if "pilot" in out:
+        out["pilot_norm"] = [_round(v / 127.0, 1e4) for v in out["pilot"]]
+    return out
+
+
+def _snapshot_v1(fields) -> dict:
+    return {
+        "protocol_version": 1,
+        "sequence": fields["sequence"],
+        "setpoint": dict(zip(AXES, fields["setpoint"])),
+        "measurement": {},
+        "output": dict(zip(AXES, fields["output"])),
+        "error": dict(zip(AXES, fields["error"])),
+        "gains": {},
+        "pilot_raw": {},
+        "pilot_norm": {},
+        "light": None,
+        "manipulator_command": None,
+        "flags_raw": 0,
+        "flags": {"timeout": False, "override": False, "pid": False},
+        "override_mask": 0,
+        "pid_active_mask": 0,
+        "mcu_uptime_ms": None,
+        "last_command_age_ms": None,
+        "manipulator": {"deg": fields["manip_deg"], "pulse_us": fields["manip_pulse_us"]},
+    }
+
+
+def _snapshot_v2(fields) -> dict:
+    gain_values = fields["gains"]
+    gains = {}
+    for axis_index, axis in enumerate(AXES):
+        base = axis_index * 3
+        gains[axis] = {"kp": gain_values[base], "ki": gain_values[base + 1], "kd": gain_values[base + 2]}
+
+    flags = fields["flags"]
+    return {
+        "protocol_version": 2,
+        "sequence": fields["sequence"],
+        "mcu_uptime_ms": fields["mcu_uptime_ms"],
+        "last_command_age_ms": fields["last_command_age_ms"],
+        "flags_raw": flags,
+        "flags": {
+            "timeout": bool(flags & FLAG_TIMEOUT),
+            "override": bool(flags & FLAG_OVERRIDE),
+            "pid": bool(flags & FLAG_PID),
+        },
+        "override_mask": fields["override_mask"],
+        "pid_active_mask": fields["pid_active_mask"],
+        "pilot_raw": dict(zip(AXES, fields["pilot"])),
+        "pilot_norm": dict(zip(AXES, fields["pilot_norm"])),
+        "light": fields["light"],
+        "manipulator_command": fields["manipulator_command"],
+        "setpoint": dict(zip(AXES, fields["setpoint"])),
+        "measurement": dict(zip(AXES, fields["measurement"])),
+        "output": dict(zip(AXES, fields["output"])),
+        "error": dict(zip(AXES, fields["error"])),
+        "gains": gains,
+        "manipulator": {"deg": fields["manip_deg"], "pulse_us": fields["manip_pulse_us"]},
+    }
+
+
+def _history_record(version: int, fields: dict, timestamp: float, addr: tuple[str, int], received_ns: int = 0) -> tuple:
+    """Flatten decoded packet *fields* into a tuple in HISTORY_DTYPE order."""
+    meta = {
+        "timestamp": timestamp,
+        "received_ns": received_ns,
+        "protocol_version": version,
+        "host": _pack_host(addr[0]),
+        "port": addr[1],
+    }
+    return tuple(
+        meta[name] if name in meta else fields[name] if name in fields else _V1_ONLY_DEFAULTS[name]
+        for name in HISTORY_DTYPE.names
+    )
+
+
+def _rows_to_snapshots(rows) -> List[dict]:
+    """Build API snapshot dicts for a slice of history rows.
+
+    Float columns are rounded for the whole slice at once, which is far cheaper
+    than calling round() on every value of every row.
+    """
+    columns = {}
+    for name in HISTORY_DTYPE.names:
+        column = rows[name]
+        if name in _ROUNDING:
+            column = np.round(column.astype(np.float64), _ROUNDING[name])
+        columns[name] = column.tolist()
+    columns["pilot_norm"] = np.round(rows["pilot"].astype(np.float64) / 127.0, 4).tolist()
+
+    snapshots = []
+    for i in range(len(rows)):
+        fields = {name: column[i] for name, column in columns.items()}
+        snapshot = _snapshot_v2(fields) if fields["protocol_version"] == 2 else _snapshot_v1(fields)
+        snapshot["timestamp"] = fields["timestamp"]
+        snapshot["source"] = {"host": _unpack_host(fields["host"]), "port": fields["port"]}
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _stopped_rows(rows, since_ns: int) -> np.ndarray:
+    """Mask of history *rows* showing the MCU holding neutral output in response to a command after *since_ns*.
+
+    Rows must be received at or after *since_ns* (``time.monotonic_ns()``)
+    with every axis output zero. v2 rows must also show a neutral pilot
+    command that the MCU received after *since_ns* (receive time minus
+    ``last_command_age_ms``), so a stale or timed-out link does not count as
+    confirmation; v1 rows carry neither field and are judged on outputs alone.
+    """
+    received = rows["received_ns"]
+    neutral = np.all(np.abs(rows["output"]) <= NEUTRAL_OUTPUT_EPS, axis=1)  # NaN compares False
+    commanded = received - rows["last_command_age_ms"].astype(np.int64) * 1_000_000 >= since_ns
+    pilot_neutral = np.all(rows["pilot"] == 0, axis=1)
+    v2 = rows["protocol_version"] == 2
+    return (received >= since_ns) & neutral & (~v2 | (commanded & pilot_neutral))
+
+
+def decode_snapshot(
+    data: bytes | memoryview, addr: tuple[str, int], timestamp: float, received_ns: int = 0
+) -> tuple[tuple, dict]:
+    """Decode a CRC-checked packet into its history record and API snapshot."""
+    if len(data) == NEW_PACKET_SIZE:
+        version, schema = 2, CONTROL_TELEMETRY_V2
+    else:
+        version, schema = 1, CONTROL_TELEMETRY_V1
+    fields = schema.decode(data)
+    rounded = _rounded_fields(fields)
+    snapshot = _snapshot_v2(rounded) if version == 2 else _snapshot_v1(rounded)
+    snapshot["timestamp"] = timestamp
+    snapshot["source"] = {"host": addr[0], "port": addr[1]}
+    return _history_record(version, fields, timestamp, addr, received_ns), snapshot
 
 
 class ControlTelemetryReceiver:
     def __init__(
-        self, host: str = "0.0.0.0", port: int = CONTROL_TELEM_PORT, data_handler: JSONDataHandler | None = None
+        self,
+        host: str = "0.0.0.0",
+        port: int = CONTROL_TELEM_PORT,
+        data_handler: JSONDataHandler | None = None,
+        reactor: UdpReactor | None = None,
+        history_capacity: int = HISTORY_CAPACITY,
     ):
         self.host = host
         self.port = port
         self.data_handler = data_handler or JSONDataHandler()
+        self.reactor = reactor
         self._listener: UdpListener | None = None
         self._lock = threading.Lock()
         self._latest: Dict[str, dict] = {}
-        self._history: Deque[dict] = deque(maxlen=HISTORY_CAPACITY)
+        self._history = HistoryRing(HISTORY_DTYPE, history_capacity)
         self._capture_enabled = True
         self._packet_count = 0
         self._crc_errors = 0
         self._invalid_packets = 0
         self._last_addr: tuple[str, int] | None = None
+        self.kill_latency = LatencyHistogram()
+        self._kill_confirmed = 0
+        self._kill_unconfirmed = 0
         LOG_DIR.mkdir(parents=True, exist_ok=True)
 
     def start(self) -> None:
         if self._listener is not None:
             return
-        cfg = UdpConfig(host=self.host, port=self.port, broadcast=True, timeout=1.0, recv_buffer=2048)
-        self._listener = UdpListener("ControlTelemetry", cfg, self._handle_packet)
+        cfg = UdpConfig(
+            host=self.host,
+            port=self.port,
+            broadcast=True,
+            timeout=1.0,
+            recv_buffer=2048,
+            so_rcvbuf=CONTROL_TELEMETRY_SO_RCVBUF,
+            recv_into=True,
+            # Packets are decoded into latest/history on the receive thread; only
+            # snapshot persistence and ndjson capture are queued. Under a disk
+            # stall the oldest queued snapshots are dropped, never the newest.
+            queue_size=512,
+            queue_policy="drop_oldest",
+        )
+        self._listener = UdpListener(
+            "ControlTelemetry", cfg, self._persist, reactor=self.reactor, on_receive=self._receive_packet
+        )
         self._listener.start()
         print(f"Control telemetry receiver started on {self.host}:{self.port}")
 
@@ -85,12 +320,22 @@ class ControlTelemetryReceiver:
     def get_history(self, limit: int = 120) -> List[dict]:
         """Return up to *limit* most recent telemetry samples."""
 
-        limit = max(1, min(limit, HISTORY_CAPACITY))
+        limit = max(1, min(limit, self._history.capacity))
         with self._lock:
-            if not self._history:
-                return []
-            hist_list = list(self._history)
-        return hist_list[-limit:]
+            rows = self._history.latest(limit)
+        return _rows_to_snapshots(rows)
+
+    def get_history_since(self, cursor: int | None, limit: int = 120) -> dict:
+        """Return samples recorded after *cursor* plus the cursor for the next call.
+
+        With ``cursor=None`` this returns the latest *limit* samples, which is how
+        a poller bootstraps before switching to incremental requests.
+        """
+
+        limit = max(1, min(limit, self._history.capacity))
+        with self._lock:
+            rows, next_cursor, missed = self._history.since(cursor, limit)
+        return {"history": _rows_to_snapshots(rows), "cursor": next_cursor, "missed": missed}
 
     def get_stats(self) -> dict:
         with self._lock:
@@ -105,132 +350,105 @@ class ControlTelemetryReceiver:
                 "last_age_ms": age_ms,
                 "last_addr": list(self._last_addr) if self._last_addr else None,
                 "protocol_version": latest.get("protocol_version"),
+                "history": {
+                    "length": len(self._history),
+                    "capacity": self._history.capacity,
+                    "bytes": self._history.nbytes,
+                },
+                "transport": self._listener.get_stats() if self._listener else None,
+                "kill_confirmation": {
+                    "confirmed": self._kill_confirmed,
+                    "unconfirmed": self._kill_unconfirmed,
+                    "latency": self.kill_latency.snapshot(),
+                },
             }
 
+    def confirm_stopped(self, since_ns: int, timeout: float = KILL_CONFIRM_TIMEOUT) -> dict:
+        """Wait until telemetry shows the thrusters stopped after a kill at *since_ns* (``time.monotonic_ns()``).
+
+        Searches history, so a packet that arrived while the caller was busy
+        still counts, and waits until *timeout* seconds after *since_ns* for
+        one to arrive. The kill-to-confirmed latency is the receive time of
+        the first matching packet (see :func:`_stopped_rows`) minus
+        *since_ns*, on the monotonic clock; it is recorded in
+        :attr:`kill_latency` and reported by :meth:`get_stats`.
+        """
+        deadline_ns = since_ns + int(timeout * 1e9)
+        cursor = None
+        while True:
+            with self._lock:
+                rows, cursor, _missed = self._history.since(cursor, KILL_CONFIRM_SCAN)
+            matches = np.flatnonzero(_stopped_rows(rows, since_ns))
+            if matches.size:
+                row = rows[matches[0]]
+                latency_ns = int(row["received_ns"]) - since_ns
+                self.kill_latency.record(latency_ns)
+                with self._lock:
+                    self._kill_confirmed += 1
+                version = int(row["protocol_version"])
+                return {
+                    "confirmed": True,
+                    "latency_ms": round(latency_ns / 1e6, 3),
+                    "sequence": int(row["sequence"]),
+                    "protocol_version": version,
+                    "last_command_age_ms": int(row["last_command_age_ms"]) if version == 2 else None,
+                }
+            if time.monotonic_ns() >= deadline_ns:
+                break
+            time.sleep(KILL_CONFIRM_POLL)
+        with self._lock:
+            self._kill_unconfirmed += 1
+        return {"confirmed": False, "latency_ms": None, "timeout_ms": timeout * 1000.0}
+
     # Internal helpers -------------------------------------------------
-    def _handle_packet(self, data: bytes, addr: tuple[str, int]):
+    def _handle_packet(self, data: bytes | memoryview, addr: tuple[str, int]):
+        """Run both stages for one packet inline (used by tests and tools)."""
+        item = self._receive_packet(data, addr, time.monotonic_ns())
+        if item is not None:
+            self._persist(item, addr)
+
+    def _receive_packet(self, data: bytes | memoryview, addr: tuple[str, int], received_ns: int):
+        """Receive-thread stage: validate, decode and publish to latest/history.
+
+        Returns what the queued :meth:`_persist` stage needs: the snapshot, or
+        an error message to print (printing can block on a slow console).
+        """
         if len(data) not in (OLD_PACKET_SIZE, NEW_PACKET_SIZE):
             with self._lock:
                 self._invalid_packets += 1
-            print(
+            return (
+                "error",
                 "Control telemetry: invalid packet size from "
-                f"{addr}: {len(data)} bytes (expected {OLD_PACKET_SIZE} or {NEW_PACKET_SIZE})"
+                f"{addr}: {len(data)} bytes (expected {OLD_PACKET_SIZE} or {NEW_PACKET_SIZE})",
             )
-            return
-        body = data[:-4]
-        crc = struct.unpack("!I", data[-4:])[0]
-        calc = crc32_ieee(body)
+        schema = CONTROL_TELEMETRY_V2 if len(data) == NEW_PACKET_SIZE else CONTROL_TELEMETRY_V1
+        calc, crc = schema.crc_pair(data)
         if calc != crc:
             with self._lock:
                 self._crc_errors += 1
-            print(f"Control telemetry: CRC mismatch (calc=0x{calc:08X}, recv=0x{crc:08X})")
-            return
-        if len(data) == NEW_PACKET_SIZE:
-            snapshot = self._decode_v2(body)
-        else:
-            snapshot = self._decode_v1(body)
-        snapshot["timestamp"] = time.time()
-        snapshot["source"] = {"host": addr[0], "port": addr[1]}
+            return "error", f"Control telemetry: CRC mismatch (calc=0x{calc:08X}, recv=0x{crc:08X})"
+        # Wall-clock timestamp of the receive, not of this call, for the API and history.
+        timestamp = time.time() - (time.monotonic_ns() - received_ns) / 1e9
+        record, snapshot = decode_snapshot(data, addr, timestamp, received_ns)
         with self._lock:
             self._packet_count += 1
             self._last_addr = addr
             self._latest = snapshot
-            self._history.append(snapshot)
+            self._history.append(record)
+        return "snapshot", snapshot
+
+    def _persist(self, item: tuple[str, object], addr: tuple[str, int]):
+        """Queued stage: store update and ndjson capture, which may wait on disk."""
+        kind, value = item
+        if kind == "error":
+            print(value)
+            return
         try:
-            self.data_handler.update_data({"control_telemetry": snapshot})
+            self.data_handler.update_data({"control_telemetry": value})
         except Exception as exc:
             print(f"Control telemetry: failed to persist snapshot: {exc}")
         if self._capture_enabled:
-            self._append_log(snapshot)
-
-    def _decode_v1(self, body: bytes) -> dict:
-        sequence = struct.unpack("!I", body[:4])[0]
-        float_end = 4 + OLD_FLOAT_COUNT * 4
-        floats = struct.unpack("<" + "f" * OLD_FLOAT_COUNT, body[4:float_end])
-        setpoints = dict(zip(AXES, floats[0:6]))
-        outputs = dict(zip(AXES, floats[6:12]))
-        errors = dict(zip(AXES, floats[12:18]))
-        manip_deg, manip_pulse_us = struct.unpack("<fH", body[float_end:])
-        snapshot = {
-            "protocol_version": 1,
-            "sequence": sequence,
-            "setpoint": {k: round(v, 4) for k, v in setpoints.items()},
-            "measurement": {},
-            "output": {k: round(v, 4) for k, v in outputs.items()},
-            "error": {k: round(v, 4) for k, v in errors.items()},
-            "gains": {},
-            "pilot_raw": {},
-            "pilot_norm": {},
-            "light": None,
-            "manipulator_command": None,
-            "flags_raw": 0,
-            "flags": {"timeout": False, "override": False, "pid": False},
-            "override_mask": 0,
-            "pid_active_mask": 0,
-            "mcu_uptime_ms": None,
-            "last_command_age_ms": None,
-            "manipulator": {"deg": round(manip_deg, 2), "pulse_us": int(manip_pulse_us)},
-        }
-        return snapshot
-
-    def _decode_v2(self, body: bytes) -> dict:
-        sequence, mcu_uptime_ms, last_command_age_ms = struct.unpack("!III", body[:12])
-        meta_start = 12
-        meta_end = meta_start + NEW_META_SIZE
-        flags, override_mask, pid_active_mask, *rest = struct.unpack(NEW_META_FORMAT, body[meta_start:meta_end])
-        pilot_values = rest[:6]
-        light = rest[6]
-        manipulator_command = rest[7]
-        float_start = meta_end
-        float_end = float_start + NEW_FLOAT_COUNT * 4
-        floats = struct.unpack("<" + "f" * NEW_FLOAT_COUNT, body[float_start:float_end])
-
-        idx = 0
-        setpoints = dict(zip(AXES, floats[idx : idx + 6]))
-        idx += 6
-        measurements = dict(zip(AXES, floats[idx : idx + 6]))
-        idx += 6
-        outputs = dict(zip(AXES, floats[idx : idx + 6]))
-        idx += 6
-        errors = dict(zip(AXES, floats[idx : idx + 6]))
-        idx += 6
-        gain_values = floats[idx : idx + 18]
-        gains = {}
-        for axis_index, axis in enumerate(AXES):
-            base = axis_index * 3
-            gains[axis] = {
-                "kp": round(gain_values[base], 6),
-                "ki": round(gain_values[base + 1], 6),
-                "kd": round(gain_values[base + 2], 6),
-            }
-
-        manip_deg, manip_pulse_us = struct.unpack("<fH", body[float_end:])
-        pilot_raw = dict(zip(AXES, pilot_values))
-        pilot_norm = {axis: round(value / 127.0, 4) for axis, value in pilot_raw.items()}
-        return {
-            "protocol_version": 2,
-            "sequence": sequence,
-            "mcu_uptime_ms": mcu_uptime_ms,
-            "last_command_age_ms": last_command_age_ms,
-            "flags_raw": flags,
-            "flags": {
-                "timeout": bool(flags & FLAG_TIMEOUT),
-                "override": bool(flags & FLAG_OVERRIDE),
-                "pid": bool(flags & FLAG_PID),
-            },
-            "override_mask": override_mask,
-            "pid_active_mask": pid_active_mask,
-            "pilot_raw": pilot_raw,
-            "pilot_norm": pilot_norm,
-            "light": int(light),
-            "manipulator_command": int(manipulator_command),
-            "setpoint": {k: round(v, 4) for k, v in setpoints.items()},
-            "measurement": {k: round(v, 4) for k, v in measurements.items()},
-            "output": {k: round(v, 4) for k, v in outputs.items()},
-            "error": {k: round(v, 4) for k, v in errors.items()},
-            "gains": gains,
-            "manipulator": {"deg": round(manip_deg, 2), "pulse_us": int(manip_pulse_us)},
-        }
+            self._append_log(value)
 
     def _append_log(self, snapshot: dict) -> None:
         try:
@@ -241,8 +459,14 @@ class ControlTelemetryReceiver:
 
 
 def init_control_telemetry(
-    host: str = "0.0.0.0", port: int = CONTROL_TELEM_PORT, data_handler: JSONDataHandler | None = None
+    host: str = "0.0.0.0",
+    port: int = CONTROL_TELEM_PORT,
+    data_handler: JSONDataHandler | None = None,
+    reactor: UdpReactor | None = None,
+    history_capacity: int = HISTORY_CAPACITY,
 ) -> ControlTelemetryReceiver:
-    receiver = ControlTelemetryReceiver(host=host, port=port, data_handler=data_handler)
+    receiver = ControlTelemetryReceiver(
+        host=host, port=port, data_handler=data_handler, reactor=reactor, history_capacity=history_capacity
+    )
     receiver.start()
     return receiver
@@ -18,7 +18,8 @@ else:
     sdl_controller = None
     sdl2 = None
 
-from lib.bitmask import BitmaskClient
+from lib.bitmask import EMERGENCY_BURST_COUNT, EMERGENCY_BURST_GAP, BitmaskClient
+from lib.periodic import PeriodicScheduler
 
 CONTROL_AXES = ("surge", "sway", "heave", "roll", "pitch", "yaw")
 ATTITUDE_AXES = ("roll", "pitch", "yaw")
@@ -88,7 +89,7 @@ class Controller:
 
     def __init__(self, bitmask_client: BitmaskClient = None, rate_hz: float = 60.0):
         self.bm = bitmask_client  # Use injected bitmask client from app.py
-        self.delay_ms = int(1000 / rate_hz) if rate_hz > 0 else 16  # ~60 Hz default
+        self._scheduler = PeriodicScheduler(1.0 / rate_hz if rate_hz > 0 else 0.016)
         pygame.init()
         pygame.joystick.init()
         if _use_sdl_gamecontroller():
@@ -122,6 +123,7 @@ class Controller:
         self._last_runtime_source = "PS4"
         self._last_pid_error = None
         self._setpoint_client = None
+        self._state_version = 0  # bumped whenever get_control_state() or get_light() would change
         self._try_connect()
 
     def _try_connect(self):
@@ -228,8 +230,18 @@ class Controller:
                     continue
                 if value == value:
                     self._pid_setpoint_rates[axis] = _clamp(value, 0.0, 90.0)
+            self._state_version += 1
             return dict(self._pid_setpoint_rates)
 
+    def get_state_version(self):
+        """Return a counter that changes whenever the control state or light level changes."""
+        with self._runtime_lock:
+            return self._state_version
+
+    def _bump_state_version(self):
+        with self._runtime_lock:
+            self._state_version += 1
+
     def get_control_state(self):
         with self._debug_lock:
             override_active = self._debug_override is not None
@@ -263,6 +275,7 @@ class Controller:
             self._last_manual_command = _neutral_axes()
             self._last_output_command = _neutral_axes()
             self._last_runtime_source = "KILLED"
+            self._state_version += 1
         self._reset_command()
         self._set_input_status(
             {
@@ -274,6 +287,12 @@ class Controller:
         )
         return self.get_control_state()
 
+    def emergency_stop(self, burst=EMERGENCY_BURST_COUNT, gap=EMERGENCY_BURST_GAP):
+        """Kill, then send the neutral command as an immediate burst rather than on the next uplink tick."""
+        state = self.kill()
+        sent = self.bm.send_burst(burst, gap) if self.bm else None
+        return {"state": state, "burst": sent}
+
     def rearm(self):
         with self._debug_lock:
             self._debug_override = None
@@ -286,6 +305,7 @@ class Controller:
             self._last_runtime_source = "PS4"
             self._last_pid_error = None
             self._last_pid_update = time.monotonic()
+            self._state_version += 1
         self._reset_command()
         return self.get_control_state()
 
@@ -301,6 +321,7 @@ class Controller:
             self._pid_setpoints = cleaned
             self._last_pid_update = time.monotonic()
             self._last_pid_error = None
+            self._state_version += 1
         return self.get_pid_setpoints()
 
     def stop_pid(self, clear=True):
@@ -309,6 +330,7 @@ class Controller:
             if clear:
                 self._pid_setpoints = {}
             self._last_pid_update = time.monotonic()
+            self._state_version += 1
         return self.get_control_state()
 
     def set_pid_setpoints(self, setpoints):
@@ -322,6 +344,7 @@ class Controller:
             self._pid_setpoints.update(cleaned)
             self._last_pid_update = time.monotonic()
             self._last_pid_error = None
+            self._state_version += 1
             return dict(self._pid_setpoints)
 
     def clear_pid_setpoint(self, axis):
@@ -332,6 +355,7 @@ class Controller:
             if self._pid_enabled and not self._pid_setpoints:
                 self._pid_enabled = False
             self._last_pid_update = time.monotonic()
+            self._state_version += 1
             return dict(self._pid_setpoints)
 
     def apply_manual_axes_once(self, axes, source="HTTP"):
@@ -466,6 +490,7 @@ class Controller:
         """
         level = max(0.0, min(self.MAX_LIGHT, float(level)))
         self.light = level
+        self._bump_state_version()
         if self.bm:
             self.bm.set_command(light=int(round(level * 255)))
 
@@ -513,6 +538,8 @@ class Controller:
 
     def _record_output(self, manual_axes, output_axes, source):
         with self._runtime_lock:
+            if manual_axes != self._last_manual_command or output_axes != self._last_output_command:
+                self._state_version += 1
             self._last_manual_command = dict(manual_axes)
             self._last_output_command = dict(output_axes)
             self._last_runtime_source = source
@@ -537,13 +564,21 @@ class Controller:
             return
         try:
             client.send_override(setpoints, replay_attempts=1, replay_delay=0.0)
-            with self._runtime_lock:
-                self._last_pid_error = None
+            error = None
         except Exception as exc:  # pylint: disable=broad-except
-            with self._runtime_lock:
-                self._last_pid_error = str(exc)
-            if hasattr(client, "set_error"):
-                client.set_error(str(exc))
+            error = str(exc)
+        if getattr(client, "forwards_sends", False):
+            return  # the real send happens elsewhere, which reports the outcome via note_pid_error
+        self.note_pid_error(error)
+        if error is not None and hasattr(client, "set_error"):
+            client.set_error(error)
+
+    def note_pid_error(self, error):
+        """Record the outcome of the last PID setpoint send (``None`` when it succeeded)."""
+        with self._runtime_lock:
+            if error != self._last_pid_error:
+                self._last_pid_error = error
+                self._state_version += 1
 
     def _dispatch_manual_axes(self, axes, source):
         manual = _neutral_axes()
@@ -558,6 +593,7 @@ class Controller:
         with self._runtime_lock:
             if self._killed:
                 output = _neutral_axes()
+                state_changed = manual != self._last_manual_command or output != self._last_output_command
                 self._last_manual_command = dict(manual)
                 self._last_output_command = dict(output)
                 self._last_runtime_source = "KILLED"
@@ -578,9 +614,14 @@ class Controller:
                         changed = True
                     if changed:
                         setpoints_to_send = dict(self._pid_setpoints)
+                state_changed = bool(setpoints_to_send) or (
+                    manual != self._last_manual_command or output != self._last_output_command
+                )
                 self._last_manual_command = dict(manual)
                 self._last_output_command = dict(output)
                 self._last_runtime_source = source
+            if state_changed:
+                self._state_version += 1
 
         self._send_axes_to_bitmask(output)
         if setpoints_to_send:
@@ -602,12 +643,14 @@ class Controller:
                 return False
         with self._debug_lock:
             self._debug_override = dict(axes)
+        self._bump_state_version()
         return True
 
     def clear_debug_override(self):
         """Disable debug override; return to physical controller."""
         with self._debug_lock:
             self._debug_override = None
+        self._bump_state_version()
         self._reset_command()
 
     def update(self):
@@ -692,7 +735,7 @@ class Controller:
         l2 = self._read_trigger(pygame.CONTROLLER_AXIS_TRIGGERLEFT, 4)  # L2 trigger
         trigger_delta = l2 - r2
         if abs(trigger_delta) > self.DEADZONE:
-            self.nudge_manipulator(trigger_delta, self.delay_ms / 1000)
+            self.nudge_manipulator(trigger_delta, self._scheduler.period)
 
         left_shoulder = self._read_button(pygame.CONTROLLER_BUTTON_LEFTSHOULDER, 9)
         surge = -self._read_axis(pygame.CONTROLLER_AXIS_LEFTY, 1)  # Left Y (inverted)
@@ -714,8 +757,10 @@ class Controller:
 
         if dpad_up and not self._prev_dpad_up:  # Just pressed
             self.light = min(self.MAX_LIGHT, self.light + 0.1)  # +10% per press
+            self._bump_state_version()
         if dpad_down and not self._prev_dpad_down:  # Just pressed
             self.light = max(0, self.light - 0.1)  # -10% per press
+            self._bump_state_version()
 
         self._prev_dpad_up = dpad_up
         self._prev_dpad_down = dpad_down
@@ -727,10 +772,14 @@ class Controller:
         )
 
     def run_loop(self):
-        """Blocking loop that polls controller at ~60 Hz."""
+        """Blocking loop that polls controller at ~60 Hz, on absolute deadlines."""
         while not self._stop.is_set():
             self.update()
-            time.sleep(self.delay_ms / 1000)
+            self._scheduler.wait_next()
+
+    def get_loop_stats(self):
+        """Achieved rate, overruns and jitter of the polling loop (see lib.periodic)."""
+        return self._scheduler.stats()
 
     def start(self):
         """Start the controller loop in a background thread."""
@@ -0,0 +1,181 @@
+"""In-process publish/subscribe bus for pushing live telemetry to browsers.
+
+Receivers publish on named topics as data arrives (the telemetry store
+publishes every section it is given, so ``imu``, ``resources`` and
+``control_telemetry`` come for free). The ``/api/stream`` route subscribes on
+behalf of one browser tab and forwards events as Server-Sent Events, which
+replaces the per-widget HTTP polling loops.
+
+Topics come in two kinds:
+
+* **state** topics (the default) carry the latest value of something. A slow
+  subscriber only ever sees the newest value; older undelivered values are
+  replaced. The bus retains the last value so new subscribers start with it.
+* **append** topics (``publish(..., append=True)``) carry discrete items such
+  as log lines. Undelivered items are batched into a list, bounded by the
+  subscription backlog (oldest items are dropped and counted).
+
+Each subscription has a maximum rate: a topic is delivered at most once per
+``1 / max_rate_hz`` seconds, and everything published in between is
+coalesced (state) or batched (append).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+DEFAULT_MAX_RATE_HZ = 10.0
+MAX_RATE_HZ = 50.0
+DEFAULT_BACKLOG = 500  # append-topic items held per subscription
+STREAM_TOPICS = ("imu", "resources", "control_telemetry", "uplink", "aruco", "logs")
+
+
+class Subscription:
+    """One consumer's view of the bus. Not shared between threads other than the bus."""
+
+    def __init__(self, bus: TopicBus, topics: Iterable[str], max_rate_hz: float, backlog: int):
+        self.bus = bus
+        self.topics = frozenset(topics)
+        rate = max(0.0, min(MAX_RATE_HZ, float(max_rate_hz or 0.0)))
+        self.min_interval = 1.0 / rate if rate > 0 else 1.0 / MAX_RATE_HZ
+        self.backlog = max(1, int(backlog))
+        self._cond = threading.Condition()
+        self._pending: dict[str, object] = {}  # topic -> latest value, or list for append topics
+        self._last_sent: dict[str, float] = {}
+        self._closed = False
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def _offer(self, topic: str, payload, append: bool) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if append:
+                items = self._pending.setdefault(topic, [])
+                items.append(payload)
+                if len(items) > self.backlog:
+                    del items[0]
+                    self.dropped += 1
+            else:
+                if topic in self._pending:
+                    self.coalesced += 1
+                self._pending[topic] = payload
+            self._cond.notify()
+
+    def get(self, timeout: float | None = None) -> list[tuple[str, object]]:
+        """Wait up to *timeout* seconds for due events and return ``[(topic, payload), ...]``.
+
+        Returns an empty list on timeout or after :meth:`close`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                due = [t for t in self._pending if now - self._last_sent.get(t, 0.0) >= self.min_interval]
+                if due:
+                    events = [(topic, self._pending.pop(topic)) for topic in due]
+                    for topic in due:
+                        self._last_sent[topic] = now
+                    self.delivered += len(events)
+                    return events
+                wait = None if deadline is None else deadline - now
+                if self._pending:
+                    next_due = min(self._last_sent[t] + self.min_interval for t in self._pending) - now
+                    wait = next_due if wait is None else min(wait, next_due)
+                if wait is not None and wait <= 0:
+                    return []
+                self._cond.wait(wait)
+            return []
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+
+class TopicBus:
+    """Thread-safe topic fan-out with retained state values."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: list[Subscription] = []
+        self._topic_counts: dict[str, int] = {}
+        self._retained: dict[str, object] = {}
+        self._published = 0
+
+    def subscribe(
+        self,
+        topics: Iterable[str],
+        max_rate_hz: float = DEFAULT_MAX_RATE_HZ,
+        backlog: int = DEFAULT_BACKLOG,
+        replay: bool = True,
+    ) -> Subscription:
+        """Register a subscription; with *replay* it starts with each topic's retained value."""
+        sub = Subscription(self, topics, max_rate_hz, backlog)
+        with self._lock:
+            self._subscribers.append(sub)
+            for topic in sub.topics:
+                self._topic_counts[topic] = self._topic_counts.get(topic, 0) + 1
+            retained = {t: self._retained[t] for t in sub.topics if t in self._retained} if replay else {}
+        for topic, payload in retained.items():
+            sub._offer(topic, payload, append=False)  # pylint: disable=protected-access
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub not in self._subscribers:
+                return
+            self._subscribers.remove(sub)
+            for topic in sub.topics:
+                remaining = self._topic_counts.get(topic, 0) - 1
+                if remaining > 0:
+                    self._topic_counts[topic] = remaining
+                else:
+                    self._topic_counts.pop(topic, None)
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Cheap check so publishers can skip building payloads nobody reads."""
+        return topic in self._topic_counts
+
+    def publish(self, topic: str, payload, append: bool = False) -> None:
+        """Deliver *payload* to every subscriber of *topic*.
+
+        Payloads are shared between subscribers and must not be mutated afterwards.
+        """
+        with self._lock:
+            self._published += 1
+            if not append:
+                self._retained[topic] = payload
+            targets = [sub for sub in self._subscribers if topic in sub.topics]
+        for sub in targets:
+            sub._offer(topic, payload, append)  # pylint: disable=protected-access
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "published": self._published,
+                "subscribers": len(self._subscribers),
+                "topics": dict(self._topic_counts),
+                "delivered": sum(sub.delivered for sub in self._subscribers),
+                "coalesced": sum(sub.coalesced for sub in self._subscribers),
+                "dropped": sum(sub.dropped for sub in self._subscribers),
+            }
+
+
+def init_event_bus() -> TopicBus:
+    return TopicBus()
+
+
+__all__ = [
+    "DEFAULT_MAX_RATE_HZ",
+    "MAX_RATE_HZ",
+    "STREAM_TOPICS",
+    "Subscription",
+    "TopicBus",
+    "init_event_bus",
+]
@@ -0,0 +1,128 @@
+"""Fixed-capacity ring buffer of NumPy structured records.
+
+Telemetry history used to be a ``deque`` of nested dicts, which costs dozens of
+Python objects per sample and has to be copied wholesale for every API call.
+A :class:`HistoryRing` preallocates one structured array instead, so memory is
+``capacity * dtype.itemsize`` regardless of traffic, and readers pull only the
+rows they need as a compact array copy. Callers convert rows to dicts at the
+API boundary.
+
+Every record gets a position in the monotonic write counter. Pollers pass the
+counter value they last saw as a *cursor* and receive only newer records plus
+the next cursor (see :func:`resolve_cursor`), so steady-state responses scale
+with new data rather than with the window size.
+
+The ring is not thread-safe; owners guard it with their own lock.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# struct format code -> NumPy scalar type, for dtypes derived from packet schemas.
+_STRUCT_TO_NUMPY = {
+    "b": "i1",
+    "B": "u1",
+    "h": "i2",
+    "H": "u2",
+    "i": "i4",
+    "I": "u4",
+    "q": "i8",
+    "Q": "u8",
+    "f": "f4",
+    "d": "f8",
+    "?": "?",
+}
+
+
+def dtype_from_schema(schema, extra: list[tuple] | None = None) -> np.dtype:
+    """Build a structured dtype with one column per field of a :class:`PacketSchema`.
+
+    Repeated fields become sub-array columns; padding and byte-string fields are
+    skipped. *extra* columns (``(name, dtype[, shape])`` tuples) come first.
+    """
+
+    columns = list(extra or [])
+    for fld in schema.fields:
+        if fld.code not in _STRUCT_TO_NUMPY:
+            continue
+        base = _STRUCT_TO_NUMPY[fld.code]
+        columns.append((fld.name, base, (fld.count,)) if fld.count > 1 else (fld.name, base))
+    return np.dtype(columns)
+
+
+def resolve_cursor(cursor: int | None, written: int, retained: int, limit: int) -> tuple[int, int]:
+    """Map a client cursor onto the retained entries.
+
+    Args:
+        cursor: Write count the client last saw, or None for "latest *limit*".
+        written: Total entries ever written.
+        retained: How many of the newest entries are still stored.
+        limit: Maximum entries to return.
+
+    Returns:
+        ``(start, missed)``: the write index of the first entry to return and how
+        many entries after *cursor* were skipped, either because they were
+        overwritten or because more than *limit* arrived. A cursor ahead of
+        *written* (e.g. from before a server restart) is treated like None.
+    """
+
+    limit = max(0, int(limit))
+    oldest = written - retained
+    if cursor is None or cursor < 0 or cursor > written:
+        return max(oldest, written - limit), 0
+    start = max(cursor, oldest)
+    if written - start > limit:
+        start = written - limit
+    return start, start - cursor
+
+
+class HistoryRing:
+    """Preallocated ring of structured records with a monotonic write counter."""
+
+    def __init__(self, dtype, capacity: int):
+        self.dtype = np.dtype(dtype)
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(self.capacity, dtype=self.dtype)
+        self._written = 0
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    @property
+    def written(self) -> int:
+        """Total number of records ever appended (never decreases)."""
+        return self._written
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def append(self, record: tuple) -> None:
+        """Store *record* (a tuple in dtype field order), overwriting the oldest row when full."""
+        self._data[self._written % self.capacity] = record
+        self._written += 1
+
+    def latest(self, limit: int) -> np.ndarray:
+        """Return a chronological copy of up to *limit* most recent records."""
+        count = max(0, min(int(limit), len(self)))
+        return self._copy_from(self._written - count)
+
+    def since(self, cursor: int | None, limit: int) -> tuple[np.ndarray, int, int]:
+        """Return ``(rows, next_cursor, missed)`` for records written after *cursor*."""
+        start, missed = resolve_cursor(cursor, self._written, len(self), limit)
+        return self._copy_from(start), self._written, missed
+
+    def _copy_from(self, start: int) -> np.ndarray:
+        """Copy records from write index *start* (must still be retained) to the newest."""
+        count = self._written - start
+        if count <= 0:
+            return self._data[:0].copy()
+        end = self._written % self.capacity
+        first = start % self.capacity
+        if first < end:
+            return self._data[first:end].copy()
+        return np.concatenate((self._data[first:], self._data[:end]))
+
+
+__all__ = ["HistoryRing", "dtype_from_schema", "resolve_cursor"]
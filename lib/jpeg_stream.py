@@ -0,0 +1,112 @@
+"""Incremental splitter for a stream of concatenated JPEG images.
+
+``gst-launch-1.0 ... ! jpegenc ! fdsink fd=1`` writes JPEGs back to back with
+no framing. :class:`JpegStreamSplitter` reads that stream with ``readinto``
+into one reusable buffer and cuts it at the SOI (``FF D8``) and EOI
+(``FF D9``) markers:
+
+* The scan position is remembered between reads, so every byte is searched
+  once, and a marker split across two reads is still found.
+* Complete frames are returned as ``memoryview`` slices of the buffer, not
+  copies. A view stays valid only until the next :meth:`read_frames` call;
+  consumers that keep a frame must copy it (``bytes(view)``).
+* The unfinished tail is moved to the front of the buffer only when the free
+  space runs out, and the buffer only grows for frames larger than it.
+"""
+
+from __future__ import annotations
+
+SOI = b"\xff\xd8"
+EOI = b"\xff\xd9"
+DEFAULT_READ_SIZE = 256 * 1024
+DEFAULT_BUFFER_SIZE = 2 * 1024 * 1024
+MAX_FRAME_SIZE = 32 * 1024 * 1024
+
+
+class JpegStreamSplitter:
+    """Splits a binary stream of back-to-back JPEGs into frames without rescanning or copying."""
+
+    def __init__(
+        self,
+        stream,
+        read_size: int = DEFAULT_READ_SIZE,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_frame_size: int = MAX_FRAME_SIZE,
+    ):
+        self.stream = stream
+        self.read_size = max(4096, int(read_size))
+        self.max_frame_size = max(self.read_size, int(max_frame_size))
+        self._buf = bytearray(max(self.read_size * 2, int(buffer_size)))
+        self._view = memoryview(self._buf)
+        self._start = 0  # first byte still needed
+        self._end = 0  # end of the data read so far
+        self._scan = 0  # where the next marker search resumes
+        self._frame_start = -1  # SOI offset of the frame being assembled, -1 while looking for one
+        self.frames = 0
+        self.bytes_read = 0
+        self.oversize_dropped = 0
+
+    def read_frames(self):
+        """Read once from the stream and return the frames it completed.
+
+        Returns a list of ``memoryview`` objects (possibly empty), or ``None``
+        at end of stream. The views are only valid until the next call.
+        """
+        self._make_room()
+        count = self.stream.readinto(self._view[self._end : self._end + self.read_size])
+        if not count:
+            return None
+        self._end += count
+        self.bytes_read += count
+        return self._split()
+
+    def _split(self):
+        buf = self._buf
+        frames = []
+        while True:
+            if self._frame_start < 0:
+                soi = buf.find(SOI, self._scan, self._end)
+                if soi < 0:
+                    # Nothing before an SOI is kept, except a last 0xFF that may start one.
+                    self._start = self._scan = max(self._start, self._end - 1)
+                    break
+                self._start = self._frame_start = soi
+                self._scan = soi + 2
+            eoi = buf.find(EOI, self._scan, self._end)
+            if eoi < 0:
+                self._scan = max(self._frame_start + 2, self._end - 1)
+                break
+            frames.append(self._view[self._frame_start : eoi + 2])
+            self._start = self._scan = eoi + 2
+            self._frame_start = -1
+        self.frames += len(frames)
+        return frames
+
+    def _make_room(self):
+        if len(self._buf) - self._end >= self.read_size:
+            return
+        pending = self._end - self._start
+        if pending + self.read_size > self.max_frame_size:
+            # A frame this large is corrupt or not a JPEG stream: drop it and resync on the next SOI.
+            self.oversize_dropped += 1
+            self._start = self._end = self._scan = 0
+            self._frame_start = -1
+            return
+        if pending + self.read_size > len(self._buf):
+            size = len(self._buf)
+            while size < pending + self.read_size:
+                size *= 2
+            buf = bytearray(min(size, self.max_frame_size))
+            buf[:pending] = self._view[self._start : self._end]
+            self._buf = buf
+            self._view = memoryview(buf)
+        elif pending:
+            self._view[:pending] = self._view[self._start : self._end]
+        self._rebase(self._start)
+
+    def _rebase(self, offset):
+        self._end -= offset
+        self._scan -= offset
+        self._start = 0
+        if self._frame_start >= 0:
+            self._frame_start -= offset
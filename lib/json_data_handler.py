@@ -1,6 +1,7 @@
 import json
 import os
 import threading
+import time
 from pathlib import Path
 
 from lib.runtime_paths import data_path
@@ -9,6 +10,15 @@ DATA_FILE = data_path("data.json")
 _FILE_LOCKS = {}
 _FILE_LOCKS_LOCK = threading.Lock()
 
+# Parsed file contents shared by every handler for the same path, keyed on the
+# resolved path and guarded by that path's lock from _FILE_LOCKS. Each entry is
+# (stat_key, data, trusted).
+_PARSE_CACHE = {}
+# Files modified this recently are re-read even when the stat key matches, since
+# a second write within the filesystem's timestamp granularity could keep the
+# same mtime and size.
+_RACY_WINDOW_NS = 50_000_000
+
 
 def _lock_for(path: Path):
     key = path.resolve()
@@ -18,47 +28,82 @@ def _lock_for(path: Path):
         return _FILE_LOCKS[key]
 
 
+def _stat_key(path: Path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _copy_json(value):
+    """Copy a parsed JSON value; much cheaper than copy.deepcopy for plain dict/list trees."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
 class JSONDataHandler:
     def __init__(self, file_path=None):
         self.file_path = Path(file_path) if file_path is not None else data_path("data.json")
         self._lock = _lock_for(self.file_path)
+        self._cache_key = self.file_path.resolve()
         self._cached_data = {}
         self._last_error_log_ts = 0.0
 
-    def read_data(self):
-        """Reads and returns the data from the JSON file."""
+    def _load(self):
+        """Return the parsed file, reusing the shared parse cache while the file is unchanged.
+
+        The returned object is shared between handlers and must not be mutated.
+        """
         with self._lock:
             try:
+                key = _stat_key(self.file_path)
+                entry = _PARSE_CACHE.get(self._cache_key)
+                if entry is not None and entry[0] == key and entry[2]:
+                    return entry[1]
                 with open(self.file_path, "r") as json_file:
                     data = json.load(json_file)
-                    if isinstance(data, dict):
-                        self._cached_data = data
-                    return data
+                if isinstance(data, dict):
+                    trusted = time.time_ns() - key[0] > _RACY_WINDOW_NS
+                    _PARSE_CACHE[self._cache_key] = (key, data, trusted)
+                    self._cached_data = data
+                return data
             except (FileNotFoundError, json.JSONDecodeError) as e:
+                _PARSE_CACHE.pop(self._cache_key, None)
                 # Avoid spamming logs on high-frequency polling.
-                import time
-
                 now = time.monotonic()
                 if now - self._last_error_log_ts > 5.0:
                     print(f"Error reading JSON file {self.file_path}: {e}")
                     self._last_error_log_ts = now
                 return self._cached_data
 
+    def read_data(self):
+        """Reads and returns the data from the JSON file.
+
+        The top-level dict is a fresh copy, but nested sections are shared with
+        the parse cache; use :meth:`get_section` for a section you want to modify.
+        """
+        data = self._load()
+        return dict(data) if isinstance(data, dict) else data
+
     def get_section(self, section):
         """Fetches a specific section from the JSON file."""
-        data = self.read_data()
-        return data.get(section, {})
+        return _copy_json(self._load().get(section, {}))
 
     def update_data(self, new_data):
-        """Updates the JSON file with new data."""
+        """Updates the JSON file with new data. Returns False if the write failed (the error is printed)."""
         with self._lock:
             try:
                 data = self.read_data()
-                data.update(new_data)
+                data.update(_copy_json(new_data))
                 self.file_path.parent.mkdir(parents=True, exist_ok=True)
                 temp_file = self.file_path.with_name(f".{self.file_path.name}.tmp")
                 with open(temp_file, "w") as json_file:
                     json.dump(data, json_file, indent=4)
                 os.replace(temp_file, self.file_path)
+                _PARSE_CACHE[self._cache_key] = (_stat_key(self.file_path), data, True)
+                self._cached_data = data
             except Exception as e:
                 print(f"Error updating JSON file {self.file_path}: {e}")
+                return False
+        return True
@@ -0,0 +1,76 @@
+"""Fixed-bucket latency histogram for hot paths.
+
+Recording is a bucket increment under a lock, so it is cheap enough to call for
+every packet or loop iteration. Buckets are powers of two in microseconds
+(1 us .. ~16 s); percentiles are reported as the upper bound of the bucket that
+contains them, which is accurate to within a factor of two.
+"""
+
+from __future__ import annotations
+
+import threading
+
+BUCKET_COUNT = 25  # 2**24 us ~= 16.8 s; anything slower lands in the last bucket
+
+
+def _bucket_for(value_us: int) -> int:
+    if value_us <= 1:
+        return 0
+    return min(BUCKET_COUNT - 1, (value_us - 1).bit_length())
+
+
+class LatencyHistogram:
+    """Thread-safe histogram of durations, recorded in nanoseconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * BUCKET_COUNT
+            self._count = 0
+            self._total_ns = 0
+            self._max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        if duration_ns < 0:
+            duration_ns = 0
+        bucket = _bucket_for(duration_ns // 1000)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._count += 1
+            self._total_ns += duration_ns
+            if duration_ns > self._max_ns:
+                self._max_ns = duration_ns
+
+    def percentile_us(self, pct: float) -> float | None:
+        with self._lock:
+            return self._percentile_locked(pct)
+
+    def _percentile_locked(self, pct: float) -> float | None:
+        if not self._count:
+            return None
+        target = max(1, int(round(self._count * pct / 100.0)))
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return float(min(1 << bucket, self._max_ns / 1000.0) if bucket else 1)
+        return self._max_ns / 1000.0
+
+    def snapshot(self) -> dict:
+        """Return count, mean/max and p50/p90/p99 in microseconds."""
+        with self._lock:
+            count = self._count
+            return {
+                "count": count,
+                "mean_us": round(self._total_ns / count / 1000.0, 1) if count else None,
+                "p50_us": self._percentile_locked(50),
+                "p90_us": self._percentile_locked(90),
+                "p99_us": self._percentile_locked(99),
+                "max_us": round(self._max_ns / 1000.0, 1) if count else None,
+            }
+
+
+__all__ = ["LatencyHistogram"]
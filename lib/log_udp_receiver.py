@@ -4,7 +4,8 @@ The firmware forwards human-readable log lines over UDP broadcast on
 ``LOG_UDP_PORT`` (5006). Each datagram is a newline-terminated chunk; there is
 no reply/acknowledgement channel. This module buffers the most recent entries so
 the debug page can show live logs while also writing everything to disk for
-post-mission correlation.
+post-mission correlation. New entries are also published on the ``logs``
+topic of the event bus, when one is given.
 """
 
 from __future__ import annotations
@@ -15,10 +16,13 @@ import threading
 import time
 from typing import List
 
-from lib.net_transport import UdpConfig, UdpListener
+from lib.event_bus import TopicBus
+from lib.history_ring import resolve_cursor
+from lib.net_transport import UdpConfig, UdpListener, UdpReactor
 from lib.runtime_paths import log_path, logs_dir
 
 LOG_PORT = 5006
+LOG_SO_RCVBUF = 256 * 1024  # log bursts at boot can exceed the default buffer
 LOG_DIR = logs_dir()
 LOG_FILE = log_path("zephyr.log")
 LEGACY_SEVERITY_RE = re.compile(r"^\[(?P<level>[IWERD])\]\s*")
@@ -37,12 +41,22 @@ LEVEL_MAP = {
 
 
 class LogStreamReceiver:
-    def __init__(self, host: str = "0.0.0.0", port: int = LOG_PORT, max_entries: int = 500):
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = LOG_PORT,
+        max_entries: int = 500,
+        reactor: UdpReactor | None = None,
+        event_bus: TopicBus | None = None,
+    ):
         self.host = host
         self.port = port
         self.max_entries = max_entries
+        self.reactor = reactor
+        self.event_bus = event_bus
         self._listener: UdpListener | None = None
         self._buffer: List[dict] = []
+        self._written = 0  # entries ever buffered; each entry's "id" is its index in this count
         self._lock = threading.Lock()
         self._packet_count = 0
         self._decode_errors = 0
@@ -53,8 +67,17 @@ class LogStreamReceiver:
     def start(self) -> None:
         if self._listener is not None:
             return
-        cfg = UdpConfig(host=self.host, port=self.port, broadcast=True, timeout=1.0, recv_buffer=2048)
-        self._listener = UdpListener("LogStream", cfg, self._handle_packet)
+        cfg = UdpConfig(
+            host=self.host,
+            port=self.port,
+            broadcast=True,
+            timeout=1.0,
+            recv_buffer=2048,
+            so_rcvbuf=LOG_SO_RCVBUF,
+            recv_into=True,
+            queue_size=1024,
+        )
+        self._listener = UdpListener("LogStream", cfg, self._handle_packet, reactor=self.reactor)
         self._listener.start()
         print(f"Log stream receiver listening on {self.host}:{self.port}")
 
@@ -68,6 +91,13 @@ class LogStreamReceiver:
         with self._lock:
             return list(self._buffer[-limit:])
 
+    def get_since(self, cursor: int | None, limit: int = 100) -> dict:
+        """Return entries buffered after *cursor* plus the cursor for the next call."""
+        with self._lock:
+            start, missed = resolve_cursor(cursor, self._written, len(self._buffer), limit)
+            offset = start - (self._written - len(self._buffer))
+            return {"logs": self._buffer[offset:], "cursor": self._written, "missed": missed}
+
     def get_stats(self) -> dict:
         with self._lock:
             age_ms = None if self._last_ts is None else max(0.0, (time.time() - self._last_ts) * 1000.0)
@@ -77,11 +107,12 @@ class LogStreamReceiver:
                 "last_age_ms": age_ms,
                 "last_addr": list(self._last_addr) if self._last_addr else None,
                 "log_file": str(LOG_FILE),
+                "transport": self._listener.get_stats() if self._listener else None,
             }
 
-    def _handle_packet(self, data: bytes, addr: tuple[str, int]):
+    def _handle_packet(self, data: bytes | memoryview, addr: tuple[str, int]):
         try:
-            text = data.decode("utf-8", errors="replace").rstrip("\r\n")
+            text = str(data, "utf-8", "replace").rstrip("\r\n")
         except Exception as exc:
             with self._lock:
                 self._decode_errors += 1
@@ -97,11 +128,18 @@ class LogStreamReceiver:
             self._packet_count += 1
             self._last_ts = now
             self._last_addr = addr
+            for entry in entries:
+                entry["id"] = self._written
+                self._written += 1
             self._buffer.extend(entries)
             if len(self._buffer) > self.max_entries:
                 self._buffer = self._buffer[-self.max_entries :]
+        bus = self.event_bus
+        publish = bus is not None and bus.has_subscribers("logs")
         for entry in entries:
             self._append_log(entry)
+            if publish:
+                bus.publish("logs", entry, append=True)
 
     def _build_entry(self, text: str, now: float) -> dict:
         level = "I"
@@ -127,7 +165,9 @@ class LogStreamReceiver:
             print(f"Log stream: failed to write log: {exc}")
 
 
-def init_log_stream(host: str = "0.0.0.0", port: int = LOG_PORT) -> LogStreamReceiver:
-    receiver = LogStreamReceiver(host=host, port=port)
+def init_log_stream(
+    host: str = "0.0.0.0", port: int = LOG_PORT, reactor: UdpReactor | None = None, event_bus: TopicBus | None = None
+) -> LogStreamReceiver:
+    receiver = LogStreamReceiver(host=host, port=port, reactor=reactor, event_bus=event_bus)
     receiver.start()
     return receiver
@@ -0,0 +1,304 @@
+"""Asyncio server that streams every MJPEG camera feed from one event loop.
+
+The Flask routes ``/video_feed``, ``/rpi_video_feed`` and ``/ip_video_feed``
+hold a WSGI worker thread per viewer for as long as the tab is open, and each
+of those threads wakes every 250 ms. :class:`MjpegStreamServer` serves the same
+paths on a dedicated port from a single thread instead:
+
+* Capture threads hand each frame's ready-made multipart chunk (see
+  :func:`lib.camera.multipart_chunk`) to the loop with
+  ``loop.call_soon_threadsafe``; every viewer is sent that same buffer.
+* Every viewer is a coroutine that writes the newest frame and waits for the
+  socket to drain. Frames published while a slow client drains are skipped,
+  never queued, so a slow viewer falls behind by at most one frame.
+* Feeds without a frame yet repeat the camera's placeholder image.
+
+When it runs, the Flask routes redirect viewers here, so pages keep using
+the same URLs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+PLACEHOLDER_INTERVAL = 0.25  # seconds between placeholder frames while a feed has no picture
+DEFAULT_MAX_CLIENTS = 64
+HEADER_TIMEOUT = 10.0  # seconds to receive the request head
+SEND_TIMEOUT = 30.0  # seconds a viewer may take to accept one frame
+WRITE_BUFFER_HIGH = 64 * 1024  # bytes buffered per viewer before it counts as slow
+MAX_REQUEST_HEAD = 8 * 1024
+_STREAM_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: multipart/x-mixed-replace; boundary=frame\r\n"
+    b"Cache-Control: no-store, no-cache, must-revalidate, max-age=0\r\n"
+    b"Pragma: no-cache\r\n"
+    b"Expires: 0\r\n"
+    b"X-Accel-Buffering: no\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+)
+
+
+class _Feed:
+    """Latest frame of one camera. Only touched from the event loop thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, camera):
+        self.loop = loop
+        self.camera = camera
+        self.chunk = None
+        self.seq = 0
+        self.viewers = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self._waiter = loop.create_future()
+        self._listener = None
+        self._demand_camera = None  # camera this feed currently counts as a viewer of
+
+    def attach(self, camera) -> None:
+        self.detach()
+        self.camera = camera
+        # Viewers switch straight to the new camera, or its placeholder until it has a frame.
+        self.publish(camera.get_latest_chunk() if camera is not None else None)
+        if camera is None:
+            return
+
+        def listener(chunk, loop=self.loop):
+            try:
+                loop.call_soon_threadsafe(self.publish, chunk)
+            except RuntimeError:
+                # Loop already closed during shutdown.
+                pass
+
+        self._listener = listener
+        camera.add_frame_listener(listener)
+        self._sync_demand()
+
+    def detach(self) -> None:
+        if self.camera is not None and self._listener is not None:
+            self.camera.remove_frame_listener(self._listener)
+        self._listener = None
+        self._sync_demand()
+
+    def add_viewer(self) -> None:
+        self.viewers += 1
+        self._sync_demand()
+
+    def remove_viewer(self) -> None:
+        self.viewers -= 1
+        self._sync_demand()
+
+    def _sync_demand(self) -> None:
+        # All viewers of a feed count as one viewer of the attached camera, so it only
+        # encodes frames while someone watches; a detached feed holds no camera.
+        target = self.camera if self.viewers > 0 and self._listener is not None else None
+        if target is self._demand_camera:
+            return
+        if self._demand_camera is not None:
+            self._demand_camera.remove_viewer()
+        if target is not None:
+            target.add_viewer()
+        self._demand_camera = target
+
+    def publish(self, chunk) -> None:
+        self.chunk = chunk
+        self.seq += 1
+        waiter, self._waiter = self._waiter, self.loop.create_future()
+        waiter.set_result(None)
+
+    async def wait(self, last_seq: int, timeout: float | None):
+        if self.seq == last_seq:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._waiter), timeout)
+            except TimeoutError:
+                pass
+        return self.chunk, self.seq
+
+
+class MjpegStreamServer:
+    """Serves ``multipart/x-mixed-replace`` camera feeds by path from one asyncio loop."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5001, max_clients: int = DEFAULT_MAX_CLIENTS):
+        self.host = host
+        self.port = int(port)
+        self.max_clients = max(1, int(max_clients))
+        self.last_error = None
+        self._cameras: dict[str, object] = {}
+        self._feeds: dict[str, _Feed] = {}
+        self._clients = 0
+        self._rejected = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._stop: asyncio.Event | None = None
+
+    def set_camera(self, path: str, camera) -> None:
+        """Serve *camera* at *path*, replacing any camera already there. Safe from any thread."""
+        self._cameras[path] = camera
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._attach, path, camera)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run, name="MjpegStreamServer", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=5.0)
+        if self.last_error:
+            raise OSError(self.last_error)
+
+    def stop(self) -> None:
+        loop = self._loop
+        if loop is not None and self._stop is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop.set)
+            except RuntimeError:
+                pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=3.0)
+
+    def url_for(self, path: str, hostname: str, scheme: str = "http") -> str:
+        if ":" in hostname:
+            hostname = f"[{hostname}]"
+        return f"{scheme}://{hostname}:{self.port}{path}"
+
+    def get_stats(self) -> dict:
+        feeds = {
+            path: {"viewers": feed.viewers, "frames_sent": feed.frames_sent, "frames_skipped": feed.frames_skipped}
+            for path, feed in list(self._feeds.items())
+        }
+        return {
+            "port": self.port,
+            "clients": self._clients,
+            "max_clients": self.max_clients,
+            "rejected": self._rejected,
+            "feeds": feeds,
+        }
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except Exception as exc:
+            self.last_error = str(exc)
+            print(f"[MJPEG] Stream server stopped: {exc}")
+        finally:
+            self._started.set()
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for path, camera in list(self._cameras.items()):
+            self._attach(path, camera)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_REQUEST_HEAD)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"[MJPEG] Streaming camera feeds on http://{self.host}:{self.port}")
+        self._started.set()
+        try:
+            await self._stop.wait()
+        finally:
+            self._server.close()
+            for feed in self._feeds.values():
+                feed.detach()
+            self._loop = None
+
+    def _attach(self, path: str, camera) -> None:
+        feed = self._feeds.get(path)
+        if feed is None:
+            feed = self._feeds[path] = _Feed(self._loop, None)
+        feed.attach(camera)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+            request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+            parts = request_line.split()
+            if len(parts) != 3:
+                await self._respond(writer, 400, "Bad Request")
+                return
+            method, target, _version = parts
+            path = target.split("?", 1)[0]
+            feed = self._feeds.get(path)
+            if feed is None:
+                await self._respond(writer, 404, "Not Found")
+            elif method not in ("GET", "HEAD"):
+                await self._respond(writer, 405, "Method Not Allowed")
+            elif feed.camera is None:
+                await self._respond(writer, 503, "Service Unavailable", "Camera not initialized")
+            elif self._clients >= self.max_clients:
+                self._rejected += 1
+                await self._respond(writer, 503, "Service Unavailable", "Too many open streams, try again later.")
+            elif method == "HEAD":
+                writer.write(_STREAM_HEADERS)
+                await writer.drain()
+            else:
+                await self._stream_until_disconnect(feed, reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            if not self._stop.is_set():
+                raise
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _stream_until_disconnect(self, feed: _Feed, reader: asyncio.StreamReader, writer) -> None:
+        # Viewers never send anything after the request, so EOF on the reader means the tab went away,
+        # even while the feed has no new frame to write.
+        stream = asyncio.ensure_future(self._stream(feed, writer))
+        eof = asyncio.ensure_future(reader.read())
+        try:
+            await asyncio.wait((stream, eof), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stream.cancel()
+            eof.cancel()
+            await asyncio.gather(stream, eof, return_exceptions=True)
+
+    async def _stream(self, feed: _Feed, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        writer.write(_STREAM_HEADERS)
+        self._clients += 1
+        feed.add_viewer()
+        try:
+            last_seq = -1
+            while True:
+                chunk, seq = await feed.wait(last_seq, PLACEHOLDER_INTERVAL if feed.chunk is None else None)
+                if chunk is None:
+                    chunk = feed.camera.get_placeholder_chunk()
+                elif seq == last_seq:
+                    continue
+                elif last_seq > 0:
+                    feed.frames_skipped += seq - last_seq - 1
+                last_seq = seq
+                writer.write(chunk)
+                await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+                feed.frames_sent += 1
+        finally:
+            self._clients -= 1
+            feed.remove_viewer()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, reason: str, body: str | None = None) -> None:
+        payload = (body or reason).encode() + b"\n"
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+            + payload
+        )
+        await writer.drain()
+
+
+def init_mjpeg_server(cameras: dict, host: str = "127.0.0.1", port: int = 5001, max_clients: int = DEFAULT_MAX_CLIENTS):
+    """Start an MJPEG stream server for the given ``{path: camera}`` feeds."""
+    server = MjpegStreamServer(host=host, port=port, max_clients=max_clients)
+    for path, camera in cameras.items():
+        server.set_camera(path, camera)
+    server.start()
+    return server
@@ -5,22 +5,51 @@ logging, resource monitoring, etc). Instead of letting every feature manage its
 own sockets, this module centralizes the boilerplate: socket creation with
 optional broadcast, listener-thread management, and convenience utilities such
 as monotonically increasing sequence counters.
+
+Listeners either run their own thread or register on a shared
+:class:`UdpReactor`, which services every bound socket from one selector loop.
+With ``UdpConfig(recv_into=True)`` a listener receives into one preallocated
+buffer and drains every queued datagram per wakeup; handlers then get a
+``memoryview`` that is only valid for the duration of the call.
+
+With ``queue_size > 0`` received datagrams are copied into a bounded queue and
+handled on a separate worker thread, so slow handlers (disk writes, JSON
+persistence) cannot stall the socket. When the queue is full the oldest entry
+is dropped; the ``coalesce`` policy additionally keeps only the newest pending
+datagram per stream. An ``on_receive`` callback splits a handler in two: it
+runs on the receive thread for every datagram (decode, update latest state)
+and what it returns is queued for the handler (persistence, logging), so the
+cheap part is never held back by the slow part.
 """
 
 from __future__ import annotations
 
 import os
+import select
+import selectors
 import socket
 import threading
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Hashable, Optional
+
+from lib.latency_histogram import LatencyHistogram
 
 DEFAULT_ROV_HOST = os.getenv("ROV_HOST", "10.77.0.2")
 DEFAULT_BROADCAST = os.getenv("ROV_BROADCAST", "10.77.0.255")
 BUFFER_SIZE = 4096
 
-Handler = Callable[[bytes, tuple[str, int]], None]
+# Upper bound on datagrams handled per wakeup in recv_into mode, so one busy
+# socket cannot starve the others sharing a reactor.
+MAX_DRAIN_BATCH = 256
+PROC_NET_UDP = ("/proc/net/udp", "/proc/net/udp6")
+
+QUEUE_POLICIES = ("drop_oldest", "coalesce")
+
+Handler = Callable[[bytes | memoryview, tuple[str, int]], None]
+ReceiveHook = Callable[[bytes | memoryview, tuple[str, int], int], object]
+StreamKey = Callable[[bytes | memoryview, tuple[str, int]], Hashable]
 
 
 def next_sequence(prev: int) -> int:
@@ -42,6 +71,10 @@ class UdpConfig:
     reuse: bool = True
     recv_buffer: int = BUFFER_SIZE
     timeout: float = 0.5  # seconds
+    so_rcvbuf: int = 0  # kernel receive buffer in bytes; 0 keeps the OS default
+    recv_into: bool = False  # reuse one buffer and drain all queued datagrams per wakeup
+    queue_size: int = 0  # 0 runs the handler inline on the receive thread
+    queue_policy: str = "drop_oldest"  # or "coalesce" (latest datagram per stream)
 
 
 class UdpSocket:
@@ -54,10 +87,44 @@ class UdpSocket:
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         if config.broadcast:
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if config.so_rcvbuf:
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, config.so_rcvbuf)
+            except OSError as exc:
+                print(f"[UdpSocket] could not set SO_RCVBUF={config.so_rcvbuf}: {exc}")
         self.sock.settimeout(config.timeout)
         if config.port:
             self.sock.bind((config.host, config.port))
 
+    def effective_rcvbuf(self) -> int | None:
+        """Return the kernel receive buffer size (Linux reports twice the requested value)."""
+        try:
+            return self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        except OSError:
+            return None
+
+    def kernel_drops(self) -> int | None:
+        """Return datagrams the kernel dropped for this socket, or None if unknown.
+
+        Read from the ``drops`` column of /proc/net/udp{,6}, matched on the
+        socket's inode, so it is only available on Linux.
+        """
+        try:
+            inode = str(os.fstat(self.sock.fileno()).st_ino)
+        except (OSError, ValueError):
+            return None
+        for table in PROC_NET_UDP:
+            try:
+                with open(table, "r") as proc_file:
+                    next(proc_file, None)
+                    for line in proc_file:
+                        fields = line.split()
+                        if len(fields) >= 13 and fields[9] == inode:
+                            return int(fields[-1])
+            except (OSError, ValueError):
+                continue
+        return None
+
     def close(self) -> None:
         try:
             self.sock.close()
@@ -65,29 +132,363 @@ class UdpSocket:
             pass
 
 
+class UdpReactor:
+    """Single thread that multiplexes many UDP listeners on one selector.
+
+    Listeners registered here do not get a thread of their own; the reactor
+    waits on all sockets at once and calls each listener's handler from its
+    loop. A socketpair wakes the loop for registration changes and shutdown,
+    so nothing polls on a timeout.
+    """
+
+    def __init__(self, name: str = "UdpReactor"):
+        self.name = name
+        self._selector = selectors.DefaultSelector()
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self._selector.register(self._wake_recv, selectors.EVENT_READ, None)
+        self._ops_lock = threading.Lock()
+        self._ops: deque[tuple[str, UdpListener, threading.Event]] = deque()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        try:
+            self._selector.close()
+        except OSError:
+            pass
+        for sock in (self._wake_recv, self._wake_send):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def register(self, listener: UdpListener) -> None:
+        """Start servicing *listener*'s socket from the reactor loop."""
+        self._submit("add", listener)
+
+    def unregister(self, listener: UdpListener) -> None:
+        """Stop servicing *listener*; returns once the loop no longer uses its socket."""
+        self._submit("remove", listener)
+
+    def _submit(self, op: str, listener: UdpListener) -> None:
+        done = threading.Event()
+        with self._ops_lock:
+            self._ops.append((op, listener, done))
+        if not self.is_running() or threading.current_thread() is self._thread:
+            self._apply_ops()
+            return
+        self._wake()
+        done.wait(timeout=2.0)
+
+    def _wake(self) -> None:
+        try:
+            self._wake_send.send(b"\0")
+        except OSError:
+            # Buffer full (a wakeup is already pending) or reactor closed.
+            pass
+
+    def _apply_ops(self) -> None:
+        while True:
+            with self._ops_lock:
+                if not self._ops:
+                    return
+                op, listener, done = self._ops.popleft()
+            sock = listener.socket.sock
+            try:
+                if op == "add":
+                    self._selector.register(sock, selectors.EVENT_READ, listener)
+                else:
+                    self._selector.unregister(sock)
+            except (KeyError, ValueError, OSError):
+                pass
+            done.set()
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self._wake_recv.recv(512):
+                pass
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        self._apply_ops()
+        while not self._stop.is_set():
+            try:
+                events = self._selector.select()
+            except OSError as exc:
+                if self._stop.is_set():
+                    break
+                print(f"[{self.name}] select error: {exc}")
+                time.sleep(0.1)
+                continue
+            for key, _mask in events:
+                listener = key.data
+                if listener is None:
+                    self._drain_wakeups()
+                    self._apply_ops()
+                    continue
+                listener._on_readable()  # pylint: disable=protected-access
+
+
 class UdpListener:
-    """Background listener that dispatches datagrams to a callback."""
+    """Background listener that dispatches datagrams to a callback.
+
+    Without a *reactor* the listener runs its own thread; with one, it
+    registers its socket on the shared reactor loop instead. *stream_key*
+    groups datagrams for the ``coalesce`` queue policy and defaults to the
+    sender address.
+
+    *on_receive* is called on the receive thread as ``on_receive(data, addr,
+    received_ns)``, with the ``time.monotonic_ns()`` receive time. Its
+    result, unless ``None``, replaces the datagram: it is what gets queued
+    and passed to *handler* (and *stream_key*).
+    """
 
-    def __init__(self, name: str, config: UdpConfig, handler: Handler):
+    def __init__(
+        self,
+        name: str,
+        config: UdpConfig,
+        handler: Handler,
+        reactor: UdpReactor | None = None,
+        stream_key: StreamKey | None = None,
+        on_receive: ReceiveHook | None = None,
+    ):
+        if config.queue_policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy {config.queue_policy!r}; expected one of {QUEUE_POLICIES}")
         self.name = name
         self.config = config
         self.handler = handler
+        self.reactor = reactor
+        self.stream_key = stream_key or (lambda _data, addr: addr)
+        self.on_receive = on_receive
         self.socket = UdpSocket(config)
         self._stop = threading.Event()
+        self._registered = False
         self._thread = threading.Thread(target=self._run, name=name, daemon=True)
 
+        self._buffer = bytearray(config.recv_buffer) if config.recv_into else None
+        self._view = memoryview(self._buffer) if config.recv_into else None
+
+        # Stats (updated only from the receiving thread)
+        self._datagrams = 0
+        self._bytes = 0
+        self._batches = 0
+        self._max_batch = 0
+        self._truncated = 0
+
+        self._coalesce = config.queue_policy == "coalesce"
+        self._pending: deque | OrderedDict = OrderedDict() if self._coalesce else deque()
+        self._queue_cond = threading.Condition()
+        self._worker = (
+            threading.Thread(target=self._work, name=f"{name}-handler", daemon=True) if config.queue_size > 0 else None
+        )
+        self._queue_drops = 0
+        self._coalesced = 0
+        self._queue_max_depth = 0
+        self._handler_errors = 0
+        self.queue_latency = LatencyHistogram()
+        self.handler_latency = LatencyHistogram()
+        self.receive_latency = LatencyHistogram()
+
     def start(self) -> None:
+        if self._worker is not None and not self._worker.is_alive():
+            self._worker.start()
+        if self.reactor is not None or self.config.recv_into:
+            self.socket.sock.setblocking(False)
+        if self.reactor is not None:
+            if not self._registered:
+                self.reactor.register(self)
+                self._registered = True
+            return
         if not self._thread.is_alive():
             self._thread.start()
 
     def stop(self) -> None:
         self._stop.set()
+        if self._registered:
+            self.reactor.unregister(self)
+            self._registered = False
         if self._thread.is_alive():
             self._thread.join(timeout=2.0)
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+        if self._worker is not None and self._worker.is_alive():
+            self._worker.join(timeout=2.0)
         self.socket.close()
 
+    def get_stats(self) -> dict:
+        return {
+            "mode": "recv_into" if self.config.recv_into else "recvfrom",
+            "datagrams": self._datagrams,
+            "bytes": self._bytes,
+            "batches": self._batches,
+            "max_batch": self._max_batch,
+            "truncated": self._truncated,
+            "so_rcvbuf": self.socket.effective_rcvbuf(),
+            "kernel_drops": self.socket.kernel_drops(),
+            "handler_errors": self._handler_errors,
+            "handler_latency": self.handler_latency.snapshot(),
+            "receive_latency": self.receive_latency.snapshot() if self.on_receive else None,
+            "queue": self._queue_stats(),
+        }
+
+    def _queue_stats(self) -> dict | None:
+        if self._worker is None:
+            return None
+        with self._queue_cond:
+            depth = len(self._pending)
+        return {
+            "policy": self.config.queue_policy,
+            "size": self.config.queue_size,
+            "depth": depth,
+            "max_depth": self._queue_max_depth,
+            "drops": self._queue_drops,
+            "coalesced": self._coalesced,
+            "wait_latency": self.queue_latency.snapshot(),
+        }
+
+    def _on_readable(self) -> None:
+        if self.config.recv_into:
+            self._drain()
+            return
+        try:
+            data, addr = self.socket.sock.recvfrom(self.config.recv_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            if not self._stop.is_set():
+                print(f"[{self.name}] socket error: {exc}")
+            return
+        self._count(len(data), 1)
+        self._dispatch(data, addr)
+
+    def _drain(self) -> None:
+        """Receive queued datagrams into the shared buffer until the socket is empty."""
+        recv_into = self.socket.sock.recvfrom_into
+        view = self._view
+        size = len(view)
+        count = 0
+        while count < MAX_DRAIN_BATCH:
+            try:
+                nbytes, addr = recv_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                if not self._stop.is_set():
+                    print(f"[{self.name}] socket error: {exc}")
+                break
+            count += 1
+            self._bytes += nbytes
+            if nbytes == size:
+                # Datagrams larger than the buffer are cut short by the kernel.
+                self._truncated += 1
+            self._dispatch(view[:nbytes], addr)
+        if count:
+            self._count(0, count)
+
+    def _count(self, nbytes: int, datagrams: int) -> None:
+        self._datagrams += datagrams
+        self._bytes += nbytes
+        self._batches += 1
+        if datagrams > self._max_batch:
+            self._max_batch = datagrams
+
+    def _dispatch(self, data: bytes | memoryview, addr: tuple[str, int]) -> None:
+        received_ns = time.monotonic_ns()
+        if self.on_receive is not None:
+            try:
+                data = self.on_receive(data, addr, received_ns)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._handler_errors += 1
+                print(f"[{self.name}] receive handler error: {exc}")
+                return
+            self.receive_latency.record(time.monotonic_ns() - received_ns)
+            if data is None:
+                return
+        elif self._worker is not None:
+            # The receive buffer is reused, so queued datagrams need their own copy.
+            data = bytes(data)
+        if self._worker is None:
+            self._invoke(data, addr)
+            return
+        item = (data, addr, received_ns)
+        pending = self._pending
+        with self._queue_cond:
+            if self._coalesce:
+                key = self.stream_key(data, addr)
+                if key in pending:
+                    pending[key] = item
+                    self._coalesced += 1
+                else:
+                    if len(pending) >= self.config.queue_size:
+                        pending.popitem(last=False)
+                        self._queue_drops += 1
+                    pending[key] = item
+            else:
+                if len(pending) >= self.config.queue_size:
+                    pending.popleft()
+                    self._queue_drops += 1
+                pending.append(item)
+            if len(pending) > self._queue_max_depth:
+                self._queue_max_depth = len(pending)
+            self._queue_cond.notify()
+
+    def _invoke(self, data: bytes | memoryview, addr: tuple[str, int]) -> None:
+        started_ns = time.monotonic_ns()
+        try:
+            self.handler(data, addr)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._handler_errors += 1
+            print(f"[{self.name}] handler error: {exc}")
+        self.handler_latency.record(time.monotonic_ns() - started_ns)
+
+    def _work(self) -> None:
+        pending = self._pending
+        while True:
+            with self._queue_cond:
+                while not pending and not self._stop.is_set():
+                    self._queue_cond.wait()
+                if self._stop.is_set():
+                    return
+                if self._coalesce:
+                    _key, item = pending.popitem(last=False)
+                else:
+                    item = pending.popleft()
+            data, addr, queued_ns = item
+            self.queue_latency.record(time.monotonic_ns() - queued_ns)
+            self._invoke(data, addr)
+
     def _run(self) -> None:
         sock = self.socket.sock
+        if self.config.recv_into:
+            while not self._stop.is_set():
+                try:
+                    readable, _, _ = select.select([sock], [], [], self.config.timeout)
+                except (OSError, ValueError) as exc:
+                    if not self._stop.is_set():
+                        print(f"[{self.name}] select error: {exc}")
+                        time.sleep(0.1)
+                    continue
+                if readable:
+                    self._drain()
+            return
         while not self._stop.is_set():
             try:
                 data, addr = sock.recvfrom(self.config.recv_buffer)
@@ -98,10 +499,8 @@ class UdpListener:
                     print(f"[{self.name}] socket error: {exc}")
                     time.sleep(0.1)
                 continue
-            try:
-                self.handler(data, addr)
-            except Exception as exc:  # pylint: disable=broad-except
-                print(f"[{self.name}] handler error: {exc}")
+            self._count(len(data), 1)
+            self._dispatch(data, addr)
 
 
 class UdpSender:
@@ -125,14 +524,26 @@ class UdpSender:
         self.socket.close()
 
 
+def init_udp_reactor(name: str = "UdpReactor") -> UdpReactor:
+    """Initialize and start a shared UDP reactor."""
+    reactor = UdpReactor(name=name)
+    reactor.start()
+    return reactor
+
+
 __all__ = [
     "DEFAULT_ROV_HOST",
     "DEFAULT_BROADCAST",
     "BUFFER_SIZE",
+    "MAX_DRAIN_BATCH",
+    "QUEUE_POLICIES",
     "Handler",
+    "StreamKey",
     "next_sequence",
     "UdpConfig",
     "UdpSocket",
+    "UdpReactor",
     "UdpListener",
     "UdpSender",
+    "init_udp_reactor",
 ]
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import json
-import socket
 import threading
 import time
 from typing import Any
 
 from lib.json_data_handler import JSONDataHandler
+from lib.net_transport import UdpConfig, UdpListener, UdpReactor
 from lib.runtime_paths import log_path, logs_dir
 
 UDP_IP = "0.0.0.0"
 UDP_PORT = 5002
+IMU_SO_RCVBUF = 256 * 1024  # absorbs ~1 s of JSON packets while the reactor is busy
 LOG_DIR = logs_dir()
 IMU_LOG = log_path("imu_raw.ndjson")
 
@@ -40,14 +41,12 @@ def _build_remap(axes_cfg, valid_keys=("yaw", "pitch", "roll")):
 class IMUReceiver:
     """Background UDP receiver for VN-100S IMU data (yaw/pitch/roll) from Nucleo board."""
 
-    def __init__(self, host=UDP_IP, port=UDP_PORT, data_handler=None):
+    def __init__(self, host=UDP_IP, port=UDP_PORT, data_handler=None, reactor: UdpReactor | None = None):
         self.host = host
         self.port = port
         self.data_handler = data_handler or JSONDataHandler()
-
-        self._stop = threading.Event()
-        self._thread = threading.Thread(target=self._run, name="IMUReceiver", daemon=True)
-        self._sock = None
+        self.reactor = reactor
+        self._listener: UdpListener | None = None
 
         # Stats
         self._lock = threading.Lock()
@@ -77,26 +76,27 @@ class IMUReceiver:
 
     def start(self):
         """Start the receiver thread."""
-        if self._thread.is_alive():
+        if self._listener is not None:
             return
-        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self._sock.bind((self.host, self.port))
-        self._sock.settimeout(1.0)
-        self._thread.start()
+        cfg = UdpConfig(
+            host=self.host,
+            port=self.port,
+            broadcast=False,
+            timeout=1.0,
+            recv_buffer=2048,
+            so_rcvbuf=IMU_SO_RCVBUF,
+            recv_into=True,
+            queue_size=256,
+        )
+        self._listener = UdpListener("IMUReceiver", cfg, self._process_packet, reactor=self.reactor)
+        self._listener.start()
         print(f"IMU receiver started on {self.host}:{self.port}")
 
     def stop(self):
         """Stop the receiver thread."""
-        self._stop.set()
-        if self._thread.is_alive():
-            self._thread.join(timeout=2.0)
-        if self._sock:
-            try:
-                self._sock.close()
-            except Exception:
-                pass
-            self._sock = None
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
         print("IMU receiver stopped")
 
     def tare(self):
@@ -125,6 +125,7 @@ class IMUReceiver:
                 "last_data": self._last_data.copy(),
                 "age_ms": age_ms,
                 "tare_offset": self._tare_offset.copy(),
+                "transport": self._listener.get_stats() if self._listener else None,
             }
 
     def _apply_remap(self, sensor_yaw, sensor_pitch, sensor_roll):
@@ -147,23 +148,10 @@ class IMUReceiver:
             sensor_vals[remap["z"]["src"]] * remap["z"]["sign"],
         )
 
-    def _run(self):
-        """Main receiver loop."""
-        while not self._stop.is_set():
-            try:
-                data, addr = self._sock.recvfrom(2048)
-                self._process_packet(data, addr)
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if not self._stop.is_set():
-                    print(f"IMU receiver error: {e}")
-                time.sleep(0.1)
-
-    def _process_packet(self, data: bytes, addr: tuple):
+    def _process_packet(self, data: bytes | memoryview, addr: tuple):
         """Process incoming UDP packet with IMU data."""
         try:
-            text = data.decode("utf-8", errors="strict")
+            text = str(data, "utf-8", "strict")
             msg = json.loads(text)
         except Exception as e:
             print(f"IMU: Bad JSON from {addr}: {e}")
@@ -257,8 +245,8 @@ def _coerce_json_number(value: float, precision: int = 2) -> Any:
     return round(float(value), precision)
 
 
-def init_imu_receiver(host=UDP_IP, port=UDP_PORT, data_handler=None) -> IMUReceiver:
+def init_imu_receiver(host=UDP_IP, port=UDP_PORT, data_handler=None, reactor: UdpReactor | None = None) -> IMUReceiver:
     """Initialize and start the IMU receiver."""
-    receiver = IMUReceiver(host=host, port=port, data_handler=data_handler)
+    receiver = IMUReceiver(host=host, port=port, data_handler=data_handler, reactor=reactor)
     receiver.start()
     return receiver
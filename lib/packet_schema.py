@@ -0,0 +1,288 @@
+"""Declarative layouts for every UDP packet exchanged with the ROV.
+
+Each packet is described once as a :class:`PacketSchema`: an ordered list of
+fields, the byte order, and whether a CRC-32 trailer follows the body. The
+schema compiles its fields into cached :class:`struct.Struct` objects at import
+time, so encoders and decoders never re-parse format strings or slice the
+body; decoding is ``unpack_from`` on the caller's buffer (bytes or memoryview).
+
+The firmware mixes byte orders inside some packets (control telemetry carries
+a network-order header followed by little-endian floats). ``struct`` cannot
+express that in one format string, so consecutive fields sharing a byte order
+are compiled into one segment and a packet decodes with one ``unpack_from``
+per segment.
+
+All schemas are registered in :data:`PACKETS`; tests compare them against the
+sizes documented by the firmware so drift between modules is caught early.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Sequence
+
+from lib.crc import crc32_ieee
+
+BYTE_ORDERS = {"big": ">", "network": "!", "little": "<"}
+AXES = ("surge", "sway", "heave", "roll", "pitch", "yaw")
+
+
+@dataclass(frozen=True)
+class Field:
+    """One packet field.
+
+    ``code`` is a single ``struct`` format character. ``count`` repeats it and
+    yields a tuple, except for ``s`` (one bytes value of ``count`` length) and
+    ``x`` (``count`` padding bytes, no value). ``byteorder`` overrides the
+    schema default for this field.
+    """
+
+    name: str
+    code: str
+    count: int = 1
+    byteorder: str | None = None
+
+    @property
+    def value_count(self) -> int:
+        if self.code == "x":
+            return 0
+        if self.code == "s":
+            return 1
+        return self.count
+
+    @property
+    def fmt(self) -> str:
+        return f"{self.count}{self.code}" if self.count != 1 else self.code
+
+
+class PacketSchema:
+    """Compiled encoder/decoder for one packet layout."""
+
+    def __init__(self, name: str, fields: Sequence[Field], byteorder: str = "big", crc: str | None = None):
+        if byteorder not in BYTE_ORDERS or (crc is not None and crc not in BYTE_ORDERS):
+            raise ValueError(f"{name}: byte order must be one of {sorted(BYTE_ORDERS)}")
+        self.name = name
+        self.fields = tuple(fields)
+        self.byteorder = byteorder
+        self.crc = crc
+
+        segments: list[tuple[str, list[Field]]] = []
+        for fld in self.fields:
+            prefix = BYTE_ORDERS[fld.byteorder or byteorder]
+            if segments and segments[-1][0] == prefix:
+                segments[-1][1].append(fld)
+            else:
+                segments.append((prefix, [fld]))
+
+        # (Struct, byte offset, first value index, value count) per segment.
+        self._segments: list[tuple[struct.Struct, int, int, int]] = []
+        self.index: dict[str, int | slice] = {}
+        offset = 0
+        value_pos = 0
+        for prefix, seg_fields in segments:
+            codec = struct.Struct(prefix + "".join(fld.fmt for fld in seg_fields))
+            seg_start = value_pos
+            for fld in seg_fields:
+                if fld.code == "s" or (fld.count == 1 and fld.code != "x"):
+                    self.index[fld.name] = value_pos
+                elif fld.value_count:
+                    self.index[fld.name] = slice(value_pos, value_pos + fld.value_count)
+                value_pos += fld.value_count
+            self._segments.append((codec, offset, seg_start, value_pos - seg_start))
+            offset += codec.size
+
+        self.body_size = offset
+        self.value_count = value_pos
+        self._crc_struct = struct.Struct(BYTE_ORDERS[crc] + "I") if crc else None
+        self.size = self.body_size + (4 if crc else 0)
+        self._single = self._segments[0][0] if len(self._segments) == 1 else None
+
+    def __repr__(self) -> str:
+        return f"PacketSchema({self.name!r}, size={self.size})"
+
+    @property
+    def segment_formats(self) -> list[str]:
+        return [codec.format for codec, *_ in self._segments]
+
+    def pack(self, *values) -> bytes:
+        """Encode flat field *values* and append the CRC trailer if the schema has one."""
+        if self._single is not None:
+            body = self._single.pack(*values)
+        else:
+            body = b"".join(codec.pack(*values[start : start + n]) for codec, _off, start, n in self._segments)
+        if self._crc_struct is None:
+            return body
+        return body + self._crc_struct.pack(crc32_ieee(body))
+
+    def unpack(self, data: bytes | bytearray | memoryview) -> tuple:
+        """Decode the body of *data* into a flat tuple of field values.
+
+        *data* may include the CRC trailer (it is ignored here; see
+        :meth:`crc_pair`). Use :attr:`index` to locate a field in the tuple.
+        """
+        if self._single is not None:
+            return self._single.unpack_from(data)
+        values: tuple = ()
+        for codec, offset, _start, _n in self._segments:
+            values += codec.unpack_from(data, offset)
+        return values
+
+    def decode(self, data: bytes | bytearray | memoryview) -> dict:
+        """Decode *data* into ``{field name: value}`` (repeated fields become tuples)."""
+        values = self.unpack(data)
+        return {name: values[idx] for name, idx in self.index.items()}
+
+    def crc_pair(self, data: bytes | bytearray | memoryview) -> tuple[int, int]:
+        """Return ``(calculated, received)`` CRC for a complete packet."""
+        if self._crc_struct is None:
+            raise ValueError(f"{self.name} has no CRC trailer")
+        view = memoryview(data)
+        return crc32_ieee(view[: self.body_size]), self._crc_struct.unpack_from(view, self.body_size)[0]
+
+    def crc_ok(self, data: bytes | bytearray | memoryview) -> bool:
+        calculated, received = self.crc_pair(data)
+        return calculated == received
+
+
+PACKETS: dict[str, PacketSchema] = {}
+
+
+def register(schema: PacketSchema) -> PacketSchema:
+    if schema.name in PACKETS:
+        raise ValueError(f"Packet schema {schema.name!r} is already registered")
+    PACKETS[schema.name] = schema
+    return schema
+
+
+def get_schema(name: str) -> PacketSchema:
+    return PACKETS[name]
+
+
+# Topside -> MCU -----------------------------------------------------------
+
+# Pilot command bitmask (bitmask.c): seq, 8 biased axis bytes packed in a u64.
+BITMASK = register(
+    PacketSchema("bitmask", [Field("sequence", "I"), Field("payload", "Q")], byteorder="network", crc="network")
+)
+
+# PID gains SET/REQUEST and reply (pid_config.c), ARM-native byte order.
+PID_CONFIG = register(
+    PacketSchema("pid_config", [Field("type", "B"), Field("gains", "f", 18)], byteorder="little", crc="little")
+)
+
+# IMU axis remap + offset (axis_config.c).
+AXIS_CONFIG = register(
+    PacketSchema(
+        "axis_config",
+        [
+            Field("type", "B"),
+            Field("ypr", "B", 6),  # yaw/pitch/roll (src, sign) pairs
+            Field("accel", "B", 6),  # x/y/z (src, sign) pairs
+            Field("pad", "x"),
+            Field("offset", "f", 3),
+        ],
+        byteorder="little",
+        crc="little",
+    )
+)
+
+# Setpoint override SET/CLEAR.
+SETPOINT_OVERRIDE = register(
+    PacketSchema(
+        "setpoint_override",
+        [Field("type", "B"), Field("axis_mask", "B"), Field("values", "f", len(AXES))],
+        byteorder="little",
+        crc="little",
+    )
+)
+
+# MCU reset request.
+SYSTEM_RESET = register(
+    PacketSchema("system_reset", [Field("magic", "s", 4), Field("sequence", "I")], byteorder="network", crc="network")
+)
+
+# MCU -> Topside -----------------------------------------------------------
+
+# Resource monitor telemetry (resource_monitor.c).
+RESOURCE_TELEMETRY = register(
+    PacketSchema(
+        "resource_telemetry",
+        [
+            Field("sequence", "I"),
+            Field("uptime_ms", "I"),
+            Field("cpu_percent", "B"),
+            Field("heap_used_percent", "B"),
+            Field("heap_free_kb", "H"),
+            Field("heap_total_kb", "H"),
+            Field("thread_count", "B"),
+            Field("reserved", "B"),
+            Field("udp_rx_count", "I"),
+            Field("udp_rx_errors", "I"),
+        ],
+        byteorder="big",
+        crc="network",
+    )
+)
+
+# Control telemetry, legacy compact layout.
+CONTROL_TELEMETRY_V1 = register(
+    PacketSchema(
+        "control_telemetry_v1",
+        [
+            Field("sequence", "I", byteorder="network"),
+            Field("setpoint", "f", len(AXES)),
+            Field("output", "f", len(AXES)),
+            Field("error", "f", len(AXES)),
+            Field("manip_deg", "f"),
+            Field("manip_pulse_us", "H"),
+        ],
+        byteorder="little",
+        crc="network",
+    )
+)
+
+# Control telemetry with measurements, gains, pilot input and status flags.
+CONTROL_TELEMETRY_V2 = register(
+    PacketSchema(
+        "control_telemetry_v2",
+        [
+            Field("sequence", "I", byteorder="network"),
+            Field("mcu_uptime_ms", "I", byteorder="network"),
+            Field("last_command_age_ms", "I", byteorder="network"),
+            Field("flags", "B"),
+            Field("override_mask", "B"),
+            Field("pid_active_mask", "B"),
+            Field("pilot", "b", len(AXES)),
+            Field("light", "B"),
+            Field("manipulator_command", "b"),
+            Field("setpoint", "f", len(AXES)),
+            Field("measurement", "f", len(AXES)),
+            Field("output", "f", len(AXES)),
+            Field("error", "f", len(AXES)),
+            Field("gains", "f", len(AXES) * 3),
+            Field("manip_deg", "f"),
+            Field("manip_pulse_us", "H"),
+        ],
+        byteorder="little",
+        crc="network",
+    )
+)
+
+
+__all__ = [
+    "AXES",
+    "Field",
+    "PacketSchema",
+    "PACKETS",
+    "register",
+    "get_schema",
+    "BITMASK",
+    "PID_CONFIG",
+    "AXIS_CONFIG",
+    "SETPOINT_OVERRIDE",
+    "SYSTEM_RESET",
+    "RESOURCE_TELEMETRY",
+    "CONTROL_TELEMETRY_V1",
+    "CONTROL_TELEMETRY_V2",
+]
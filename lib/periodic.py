@@ -0,0 +1,134 @@
+"""Drift-free periodic scheduling for fixed-rate loops.
+
+``work(); time.sleep(period)`` runs slower than its nominal rate by however
+long the work took, and every stall delays all later ticks. A
+:class:`PeriodicScheduler` instead sleeps until absolute deadlines
+``start + n * period`` on ``time.monotonic_ns``:
+
+* Time spent working is absorbed, so the long-run rate is exact.
+* A late tick runs at once, but deadlines that passed entirely during an
+  overrun are skipped (and counted) rather than run back to back, so a
+  stall never produces a burst of packets.
+* Each wake-up records its lateness against the deadline, and the gap to the
+  previous tick its deviation from the nominal period, in
+  :class:`lib.latency_histogram.LatencyHistogram` objects, plus the mean achieved period.
+
+``time.sleep`` is used rather than ``Event.wait`` because it has
+sub-millisecond resolution on every supported platform, including Windows.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from lib.latency_histogram import LatencyHistogram
+
+IDLE_SLEEP = 0.05  # seconds waited per call while the period is 0 (paused)
+
+
+class PeriodicScheduler:
+    """Waits for successive deadlines ``period`` apart and records how well they were met."""
+
+    def __init__(self, period: float, clock=time.monotonic_ns, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._period_ns = 0
+        self._next_deadline = None
+        self.period = period
+        self.lateness = LatencyHistogram()
+        self.period_error = LatencyHistogram()
+        self.reset_stats()
+
+    @property
+    def period(self) -> float:
+        return self._period_ns / 1e9
+
+    @period.setter
+    def period(self, value: float) -> None:
+        """Change the period; the next tick is scheduled one new period after the next wait starts."""
+        with self._lock:
+            self._period_ns = max(0, int(float(value) * 1e9))
+            self._next_deadline = None
+            self._first_tick = self._last_tick = None
+            self._span_ticks = 0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.ticks = 0
+            self.overruns = 0
+            self._first_tick = self._last_tick = None
+            self._span_ticks = 0
+        self.lateness.reset()
+        self.period_error.reset()
+
+    def wait_next(self, wake: threading.Event | None = None) -> bool:
+        """Sleep until the next deadline and record the tick.
+
+        Returns ``False`` without ticking while the period is 0, after an
+        idle sleep of :data:`IDLE_SLEEP`, so callers can treat 0 as paused.
+        With *wake*, a wait for a deadline also ends, returning ``False``,
+        as soon as that event is set; the deadline stays pending for the
+        next call and the event is not cleared. ``Event.wait`` is coarser
+        than ``time.sleep`` on Windows, so ticks are only as precise as the
+        OS timer there.
+        """
+        with self._lock:
+            period = self._period_ns
+            now = self._clock()
+            if period <= 0:
+                deadline = None
+            else:
+                deadline = self._next_deadline
+                if deadline is None:
+                    deadline = now + period
+                elif deadline <= now:
+                    # Run once now for the latest passed deadline; skip the ones before it.
+                    missed = (now - deadline) // period
+                    self.overruns += missed
+                    deadline += missed * period
+                self._next_deadline = deadline
+        if deadline is None:
+            self._sleep(IDLE_SLEEP)
+            return False
+        if deadline > now:
+            if wake is None:
+                self._sleep((deadline - now) / 1e9)
+            elif wake.wait((deadline - now) / 1e9):
+                return False
+        woke = self._clock()
+        with self._lock:
+            if self._period_ns != period:
+                return True  # period changed while sleeping; stats restart with the new schedule
+            self._next_deadline = deadline + period
+            self.ticks += 1
+            if self._first_tick is None:
+                self._first_tick = woke
+            else:
+                self._span_ticks += 1
+                self.period_error.record(abs(woke - self._last_tick - period))
+            self._last_tick = woke
+        self.lateness.record(woke - deadline)
+        return True
+
+    def stats(self) -> dict:
+        """Nominal and achieved period, overruns, and lateness/period-error histograms (microseconds)."""
+        with self._lock:
+            period_ns = self._period_ns
+            ticks = self.ticks
+            overruns = self.overruns
+            span_ticks = self._span_ticks
+            achieved_ns = (self._last_tick - self._first_tick) / span_ticks if span_ticks else None
+        return {
+            "period_ms": period_ns / 1e6,
+            "ticks": ticks,
+            "achieved_period_ms": round(achieved_ns / 1e6, 3) if achieved_ns else None,
+            "achieved_hz": round(1e9 / achieved_ns, 3) if achieved_ns else None,
+            "overruns": overruns,
+            "lateness": self.lateness.snapshot(),
+            "period_error": self.period_error.snapshot(),
+        }
+
+
+__all__ = ["PeriodicScheduler"]
@@ -11,9 +11,9 @@ Both operations return a reply with the active gains.
 
 import socket
 import struct
-import zlib
 
 from lib.net_transport import DEFAULT_ROV_HOST
+from lib.packet_schema import PID_CONFIG
 
 MCU_IP = DEFAULT_ROV_HOST
 PID_CONFIG_PORT = 5003
@@ -24,8 +24,8 @@ PID_PKT_REQUEST = 0x02
 AXES = ["surge", "sway", "heave", "roll", "pitch", "yaw"]
 
 # type(1B) + 18 floats(72B) + crc32(4B) = 77 bytes, little-endian (ARM native)
-PACKET_FORMAT = "<B18fI"
-PACKET_SIZE = struct.calcsize(PACKET_FORMAT)  # 77
+PACKET_SIZE = PID_CONFIG.size  # 77
+_GAINS = PID_CONFIG.index["gains"]
 
 
 def _build_packet(pkt_type, gains):
@@ -37,9 +37,7 @@ def _build_packet(pkt_type, gains):
         g = gains.get(axis, {"kp": 0.0, "ki": 0.0, "kd": 0.0})
         floats.extend([float(g["kp"]), float(g["ki"]), float(g["kd"])])
 
-    header = struct.pack("<B18f", pkt_type, *floats)
-    crc = zlib.crc32(header) & 0xFFFFFFFF
-    return header + struct.pack("<I", crc)
+    return PID_CONFIG.pack(pkt_type, *floats)
 
 
 def _parse_packet(data):
@@ -47,14 +45,10 @@ def _parse_packet(data):
     if len(data) != PACKET_SIZE:
         return None
 
-    values = struct.unpack(PACKET_FORMAT, data)
-    recv_crc = values[19]
-
-    calc_crc = zlib.crc32(data[:-4]) & 0xFFFFFFFF
-    if calc_crc != recv_crc:
+    if not PID_CONFIG.crc_ok(data):
         return None
 
-    floats = values[1:19]
+    floats = PID_CONFIG.unpack(data)[_GAINS]
     gains = {}
     for i, axis in enumerate(AXES):
         gains[axis] = {
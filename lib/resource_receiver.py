@@ -12,17 +12,17 @@ matches the embedded ``crc32_calc()`` and ``net.c`` behavior exactly.
 from __future__ import annotations
 
 import json
-import struct
 import threading
 import time
 
-from lib.crc import crc32_ieee
 from lib.json_data_handler import JSONDataHandler
-from lib.net_transport import UdpConfig, UdpListener
+from lib.net_transport import UdpConfig, UdpListener, UdpReactor
+from lib.packet_schema import RESOURCE_TELEMETRY
 from lib.runtime_paths import log_path, logs_dir
 
 UDP_IP = "0.0.0.0"
 UDP_PORT = 12346
+RESOURCE_SO_RCVBUF = 64 * 1024
 LOG_DIR = logs_dir()
 RESOURCE_LOG = log_path("resource_monitor.ndjson")
 DIAG_LOG_EVERY_SEC = 5.0
@@ -42,17 +42,18 @@ DIAG_LOG_EVERY_SEC = 5.0
 #     uint32_t crc32;             /* CRC32 checksum */
 # } __attribute__((packed)) telemetry_packet_t;
 
-TELEMETRY_FORMAT = ">IIBBHHBBIII"  # Big-endian (network byte order)
-TELEMETRY_SIZE = struct.calcsize(TELEMETRY_FORMAT)
+# Big-endian (network byte order); layout lives in lib.packet_schema.
+TELEMETRY_SIZE = RESOURCE_TELEMETRY.size
 
 
 class ResourceReceiver:
     """Background UDP receiver for resource telemetry from Nucleo board."""
 
-    def __init__(self, host=UDP_IP, port=UDP_PORT, data_handler=None):
+    def __init__(self, host=UDP_IP, port=UDP_PORT, data_handler=None, reactor: UdpReactor | None = None):
         self.host = host
         self.port = port
         self.data_handler = data_handler or JSONDataHandler()
+        self.reactor = reactor
 
         self._stop = threading.Event()
         self._listener: UdpListener | None = None
@@ -74,8 +75,22 @@ class ResourceReceiver:
         """Start the receiver thread."""
         if self._listener is not None:
             return
-        cfg = UdpConfig(host=self.host, port=self.port, broadcast=False, timeout=1.0, recv_buffer=1024)
-        self._listener = UdpListener("ResourceReceiver", cfg, self._process_packet)
+        cfg = UdpConfig(
+            host=self.host,
+            port=self.port,
+            broadcast=False,
+            timeout=1.0,
+            recv_buffer=1024,
+            so_rcvbuf=RESOURCE_SO_RCVBUF,
+            recv_into=True,
+            # Decoding and the counters the uplink watchdog reads stay on the
+            # receive thread; store updates, the diag log and prints are queued
+            # so they never hold up recv for the receivers sharing the reactor.
+            queue_size=64,
+        )
+        self._listener = UdpListener(
+            "ResourceReceiver", cfg, self._persist, reactor=self.reactor, on_receive=self._receive_packet
+        )
         self._stop.clear()
         self._listener.start()
         print(f"Resource receiver started on {self.host}:{self.port}")
@@ -104,42 +119,43 @@ class ResourceReceiver:
                 "last_data": self._last_data.copy(),
                 "last_age_ms": age_ms,
                 "last_addr": list(self._last_addr) if self._last_addr else None,
+                "transport": self._listener.get_stats() if self._listener else None,
             }
 
-    def _process_packet(self, data: bytes, addr: tuple):
-        """Process incoming UDP telemetry packet."""
-        if len(data) != TELEMETRY_SIZE:
-            print(f"Resource: Invalid packet size from {addr}: {len(data)} (expected {TELEMETRY_SIZE})")
-            return
+    def _process_packet(self, data: bytes | memoryview, addr: tuple):
+        """Process incoming UDP telemetry packet (both stages inline)."""
+        item = self._receive_packet(data, addr, time.monotonic_ns())
+        if item is not None:
+            self._persist(item, addr)
 
-        # Unpack the data
-        try:
-            (
-                sequence,
-                uptime_ms,
-                cpu_percent,
-                heap_used_percent,
-                heap_free_kb,
-                heap_total_kb,
-                thread_count,
-                reserved,
-                udp_rx_count,
-                udp_rx_errors,
-                recv_crc,
-            ) = struct.unpack(TELEMETRY_FORMAT, data)
-        except struct.error as e:
-            print(f"Resource: Unpack error from {addr}: {e}")
-            return
+    def _receive_packet(self, data: bytes | memoryview, addr: tuple, received_ns: int):
+        """Receive-thread stage: validate, decode and update stats.
 
-        # Validate CRC (calculated over all fields except CRC itself)
-        crc_data = data[:-4]  # Everything except the last 4 bytes (CRC)
-        calculated_crc = crc32_ieee(crc_data)
+        Returns ``(telemetry, messages)`` for :meth:`_persist`; *telemetry* is
+        None for a rejected packet.
+        """
+        if len(data) != TELEMETRY_SIZE:
+            return None, [f"Resource: Invalid packet size from {addr}: {len(data)} (expected {TELEMETRY_SIZE})"]
 
+        # Validate CRC (calculated over all fields except CRC itself)
+        calculated_crc, recv_crc = RESOURCE_TELEMETRY.crc_pair(data)
         if calculated_crc != recv_crc:
             with self._lock:
                 self._crc_errors += 1
-            print(f"Resource: CRC mismatch! Expected: 0x{calculated_crc:08X}, Got: 0x{recv_crc:08X}")
-            return
+            return None, [f"Resource: CRC mismatch! Expected: 0x{calculated_crc:08X}, Got: 0x{recv_crc:08X}"]
+
+        (
+            sequence,
+            uptime_ms,
+            cpu_percent,
+            heap_used_percent,
+            heap_free_kb,
+            heap_total_kb,
+            thread_count,
+            _reserved,
+            udp_rx_count,
+            udp_rx_errors,
+        ) = RESOURCE_TELEMETRY.unpack(data)
 
         # Build telemetry dict
         telemetry = {
@@ -155,6 +171,7 @@ class ResourceReceiver:
         }
 
         # Update stats
+        messages = []
         with self._lock:
             self._packet_count += 1
 
@@ -165,12 +182,21 @@ class ResourceReceiver:
                     lost = sequence - expected
                     if lost > 0:
                         self._packets_lost += lost
-                        print(f"Resource: Packet loss detected, {lost} packets lost")
+                        messages.append(f"Resource: Packet loss detected, {lost} packets lost")
 
             self._last_seq = sequence
             self._last_data = telemetry.copy()
             self._last_received_ts = time.time()
             self._last_addr = addr
+        return telemetry, messages
+
+    def _persist(self, item: tuple, addr: tuple) -> None:
+        """Queued stage: prints, data.json update and the periodic diag log."""
+        telemetry, messages = item
+        for message in messages:
+            print(message)
+        if telemetry is None:
+            return
 
         # Update data.json with new resource values
         try:
@@ -203,8 +229,10 @@ class ResourceReceiver:
             return last.get("udp_rx_count", 0), last.get("udp_rx_errors", 0)
 
 
-def init_resource_receiver(host=UDP_IP, port=UDP_PORT, data_handler=None) -> ResourceReceiver:
+def init_resource_receiver(
+    host=UDP_IP, port=UDP_PORT, data_handler=None, reactor: UdpReactor | None = None
+) -> ResourceReceiver:
     """Initialize and start the resource receiver."""
-    receiver = ResourceReceiver(host=host, port=port, data_handler=data_handler)
+    receiver = ResourceReceiver(host=host, port=port, data_handler=data_handler, reactor=reactor)
     receiver.start()
     return receiver
@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-import struct
 import threading
 import time
 from dataclasses import dataclass, field
 from typing import Dict
 
-from lib.crc import crc32_ieee
 from lib.net_transport import DEFAULT_ROV_HOST, UdpSender
+from lib.packet_schema import SETPOINT_OVERRIDE
 
 AXES = ["surge", "sway", "heave", "roll", "pitch", "yaw"]
 AXIS_BITS = {axis: idx for idx, axis in enumerate(AXES)}
@@ -62,9 +61,7 @@ class SetpointOverrideClient:
             values[idx] = float(value)
         if axis_mask == 0:
             raise ValueError("No valid axes provided for override")
-        body = struct.pack("BB", TYPE_SET, axis_mask) + struct.pack("<" + "f" * len(values), *values)
-        crc = crc32_ieee(body)
-        packet = body + struct.pack("<I", crc & 0xFFFFFFFF)
+        packet = SETPOINT_OVERRIDE.pack(TYPE_SET, axis_mask, *values)
         for attempt in range(max(1, replay_attempts)):
             self.sender.send(packet)
             if attempt + 1 < replay_attempts:
@@ -80,9 +77,7 @@ class SetpointOverrideClient:
 
     def clear_override(self) -> dict:
         self._check_resource_health()
-        body = struct.pack("BB", TYPE_CLEAR, 0) + struct.pack("<" + "f" * len(AXES), *([0.0] * len(AXES)))
-        crc = crc32_ieee(body)
-        packet = body + struct.pack("<I", crc & 0xFFFFFFFF)
+        packet = SETPOINT_OVERRIDE.pack(TYPE_CLEAR, 0, *([0.0] * len(AXES)))
         self.sender.send(packet)
         with self._lock:
             self._state.active = False
@@ -1,19 +1,16 @@
 """Send system-level control commands to the MCU."""
 
-import struct
 import time
 
-from lib.crc import crc32_ieee
 from lib.net_transport import DEFAULT_ROV_HOST, UdpSender, next_sequence
+from lib.packet_schema import SYSTEM_RESET
 
 SYSTEM_CONTROL_PORT = 5008
 RESET_MAGIC = b"RST1"
 
 
 def build_reset_packet(sequence: int) -> bytes:
-    body = RESET_MAGIC + struct.pack("!I", sequence & 0xFFFFFFFF)
-    crc = crc32_ieee(body)
-    return body + struct.pack("!I", crc)
+    return SYSTEM_RESET.pack(RESET_MAGIC, sequence & 0xFFFFFFFF)
 
 
 class SystemControlClient:
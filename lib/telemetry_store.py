@@ -0,0 +1,174 @@
+"""In-memory telemetry state shared by the UDP receivers and HTTP routes.
+
+Receivers used to call ``JSONDataHandler.update_data`` for every packet, which
+re-read, re-parsed and re-wrote ``data/data.json`` each time. The store keeps
+the latest value of each section in memory instead and persists changed
+sections from a background thread, so disk I/O is bounded by the flush
+interval rather than by the packet rate.
+
+The store exposes the same ``update_data``/``get_section``/``read_data`` calls
+as :class:`JSONDataHandler`, so receivers and routes can use either one.
+When given an event bus, every updated section is also published on the topic
+of the same name for the ``/api/stream`` push channel.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from lib.event_bus import TopicBus
+from lib.json_data_handler import JSONDataHandler
+
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+MIN_FLUSH_INTERVAL = 0.05
+
+
+class TelemetryStore:
+    """Latest-value section store with write-behind persistence to a JSON file."""
+
+    def __init__(
+        self,
+        backing: JSONDataHandler | None = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        event_bus: TopicBus | None = None,
+    ):
+        self.backing = backing or JSONDataHandler()
+        self.flush_interval = max(MIN_FLUSH_INTERVAL, float(flush_interval))
+        self.event_bus = event_bus
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._sections: dict[str, object] = {}
+        self._versions: dict[str, int] = {}
+        self._flushed_versions: dict[str, int] = {}
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Stats
+        self._update_count = 0
+        self._flush_count = 0
+        self._flush_errors = 0
+        self._last_flush_ts = None
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TelemetryStoreFlush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and persist anything still pending."""
+        self._stop.set()
+        self._dirty.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.flush()
+
+    def update_data(self, new_data: dict) -> None:
+        """Replace the given top-level sections in memory and mark them dirty."""
+        with self._lock:
+            for section, value in new_data.items():
+                self._sections[section] = value
+                self._versions[section] = self._versions.get(section, 0) + 1
+            self._update_count += 1
+        self._dirty.set()
+        if self.event_bus is not None:
+            for section, value in new_data.items():
+                self.event_bus.publish(section, value)
+
+    def get_section(self, section):
+        """Return the latest value of *section*.
+
+        Sections that no receiver has written yet (thrusters, battery, ...) are
+        read from the backing JSON file. Returned values are shared with the
+        store, so callers must treat them as read-only.
+        """
+        with self._lock:
+            if section in self._sections:
+                return self._sections[section]
+        return self.backing.get_section(section)
+
+    def read_data(self) -> dict:
+        """Return the backing file contents overlaid with the in-memory sections."""
+        data = dict(self.backing.read_data())
+        with self._lock:
+            data.update(self._sections)
+        return data
+
+    def get_version(self, section: str) -> int:
+        """Return how many times *section* has been updated (0 if never)."""
+        with self._lock:
+            return self._versions.get(section, 0)
+
+    def flush(self) -> bool:
+        """Write sections changed since the last flush. Returns True if a write happened."""
+        with self._flush_lock:
+            with self._lock:
+                pending = {
+                    section: self._sections[section]
+                    for section, version in self._versions.items()
+                    if self._flushed_versions.get(section) != version
+                }
+                versions = dict(self._versions)
+            if not pending:
+                return False
+            try:
+                written = self.backing.update_data(pending)
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"Telemetry store: flush failed: {exc}")
+                written = False
+            if not written:
+                # Leave the sections dirty so the next flush retries them.
+                with self._lock:
+                    self._flush_errors += 1
+                return False
+            with self._lock:
+                self._flushed_versions.update(versions)
+                self._flush_count += 1
+                self._last_flush_ts = time.monotonic()
+            return True
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            dirty = [
+                section for section, version in self._versions.items() if self._flushed_versions.get(section) != version
+            ]
+            last_flush_age_ms = (
+                None if self._last_flush_ts is None else max(0.0, (time.monotonic() - self._last_flush_ts) * 1000.0)
+            )
+            return {
+                "updates": self._update_count,
+                "flushes": self._flush_count,
+                "flush_errors": self._flush_errors,
+                "flush_interval": self.flush_interval,
+                "dirty_sections": dirty,
+                "last_flush_age_ms": last_flush_age_ms,
+                "file": str(self.backing.file_path),
+            }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Wake on the first change, write it, then hold off for one interval
+            # so bursts of updates collapse into a single write.
+            self._dirty.wait()
+            if self._stop.is_set():
+                break
+            self._dirty.clear()
+            self.flush()
+            self._stop.wait(self.flush_interval)
+
+
+def init_telemetry_store(
+    backing: JSONDataHandler | None = None,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    event_bus: TopicBus | None = None,
+) -> TelemetryStore:
+    """Initialize and start the telemetry store."""
+    store = TelemetryStore(backing=backing, flush_interval=flush_interval, event_bus=event_bus)
+    store.start()
+    return store
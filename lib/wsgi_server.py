@@ -0,0 +1,424 @@
+"""Bounded thread-pool WSGI server for running the dashboard in production.
+
+Flask's development server (``app.run(threaded=True)``) starts one thread per
+connection with no upper limit, runs the debugger on every request, and MJPEG
+and SSE viewers hold their thread for as long as the tab is open.
+:class:`PooledWSGIServer` runs connections on a fixed pool instead:
+
+* ``request_workers`` threads are always left for ordinary requests.
+* Long-lived streaming responses (``multipart/x-mixed-replace`` video and
+  ``text/event-stream``) can hold at most ``stream_workers`` further threads.
+  Streams beyond that are refused with 503 rather than starving the API.
+* Connections are HTTP/1.1 keep-alive. Between requests they wait on the
+  shared selector rather than in a worker, and are closed after
+  ``keepalive_timeout`` idle seconds. A request that stalls (read or write)
+  for ``request_timeout`` seconds is dropped.
+* When every worker is busy, ready connections wait until one frees up.
+"""
+
+from __future__ import annotations
+
+import collections
+import queue
+import selectors
+import socket
+import threading
+import time
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from werkzeug.wsgi import LimitedStream
+
+DEFAULT_REQUEST_WORKERS = 16
+DEFAULT_STREAM_WORKERS = 8
+DEFAULT_REQUEST_TIMEOUT = 30.0  # seconds
+DEFAULT_KEEPALIVE_TIMEOUT = 5.0  # seconds
+STREAMING_MIMETYPES = ("multipart/x-mixed-replace", "text/event-stream")
+MAX_DISCARDED_BODY = 64 * 1024  # unread request body drained to keep a connection alive, in bytes
+_STREAMS_FULL_BODY = b"Too many open streams, try again later.\n"
+
+
+class _ReleasingIterable:
+    """Wraps a streaming app iterable and frees its stream slot when the server closes it."""
+
+    def __init__(self, app_iter, release):
+        self._app_iter = app_iter
+        self._release = release
+        self._released = False
+
+    def __iter__(self):
+        return iter(self._app_iter)
+
+    def close(self):
+        try:
+            close = getattr(self._app_iter, "close", None)
+            if close is not None:
+                close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class StreamLimiter:
+    """WSGI middleware that caps the number of concurrent streaming responses.
+
+    A response counts as streaming when its Content-Type is one of
+    :data:`STREAMING_MIMETYPES`, so routes need no registration.
+    """
+
+    def __init__(self, app, max_streams: int):
+        self.app = app
+        self.max_streams = max(1, int(max_streams))
+        self._slots = threading.BoundedSemaphore(self.max_streams)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._rejected = 0
+
+    def __call__(self, environ, start_response):
+        state = {"stream": False, "rejected": False}
+
+        def limited_start_response(status, headers, exc_info=None):
+            content_type = next((value for name, value in headers if name.lower() == "content-type"), "")
+            if content_type.startswith(STREAMING_MIMETYPES):
+                if not self._slots.acquire(blocking=False):
+                    state["rejected"] = True
+                    with self._lock:
+                        self._rejected += 1
+                    return start_response(
+                        "503 SERVICE UNAVAILABLE",
+                        [
+                            ("Content-Type", "text/plain; charset=utf-8"),
+                            ("Content-Length", str(len(_STREAMS_FULL_BODY))),
+                            ("Retry-After", "5"),
+                        ],
+                        exc_info,
+                    )
+                state["stream"] = True
+                with self._lock:
+                    self._active += 1
+            return start_response(status, headers, exc_info)
+
+        app_iter = self.app(environ, limited_start_response)
+        if state["rejected"]:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                close()
+            return [_STREAMS_FULL_BODY]
+        if state["stream"]:
+            return _ReleasingIterable(app_iter, self._release)
+        return app_iter
+
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"active": self._active, "max": self.max_streams, "rejected": self._rejected}
+
+
+class _NoTrailingInput:
+    """Stands in for ``rfile`` while werkzeug drains "leftover" input after a response.
+
+    Werkzeug reads whatever is readable on the socket once the response is
+    written, which on a keep-alive connection would swallow the next request.
+    The request body is framed by a :class:`LimitedStream` instead.
+    """
+
+    @staticmethod
+    def read(_size=-1):
+        return b""
+
+
+class _PooledRequestHandler(WSGIRequestHandler):
+    """Serves one request per :meth:`serve_one` call so the server can park the connection in between.
+
+    Werkzeug's handler closes every connection after one response. This one
+    keeps HTTP/1.1 connections open when the response has a Content-Length
+    and the request body is Content-Length framed; chunked (streaming)
+    responses and chunked uploads still close the connection.
+    """
+
+    _keep_alive = False
+    _body: LimitedStream | None = None
+
+    def __init__(self, request, client_address, server):  # pylint: disable=super-init-not-called
+        # BaseRequestHandler.__init__ would serve the whole connection; the server drives it instead.
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.setup()
+
+    def serve_one(self) -> bool:
+        """Handle one request. Returns True if the connection stays open for another."""
+        self.close_connection = True
+        self._keep_alive = False
+        self.connection.settimeout(self.server.request_timeout)
+        try:
+            self.handle_one_request()
+        except (ConnectionError, socket.timeout) as exc:
+            self.connection_dropped(exc)
+            return False
+        return not self.close_connection
+
+    def make_environ(self):
+        environ = super().make_environ()
+        self._keep_alive = False
+        if self.request_version != "HTTP/1.1" or self.close_connection or environ.get("wsgi.input_terminated"):
+            return environ
+        try:
+            length = max(0, int(environ.get("CONTENT_LENGTH") or 0))
+        except ValueError:
+            return environ
+        self._keep_alive = True
+        self._body = environ["wsgi.input"] = LimitedStream(self.rfile, length)
+        self.rfile = _NoTrailingInput
+        return environ
+
+    def run_wsgi(self) -> None:
+        rfile = self.rfile
+        try:
+            super().run_wsgi()
+        finally:
+            self.rfile = rfile
+        if not self._keep_alive or self.close_connection:
+            self.close_connection = True
+            return
+        body, self._body = self._body, None
+        if body.limit - body.tell() > MAX_DISCARDED_BODY:
+            self.close_connection = True
+            return
+        body.exhaust()
+        if not body.is_exhausted:
+            self.close_connection = True
+
+    def send_header(self, keyword, value):
+        if self._keep_alive:
+            name = keyword.lower()
+            if name == "transfer-encoding":
+                self._keep_alive = False
+            elif name == "connection" and value.lower() == "close":
+                # Werkzeug marks every response "close"; this one is framed, so the connection can stay open.
+                return
+        super().send_header(keyword, value)
+
+    def has_buffered_request(self) -> bool:
+        """Return True if the next request's bytes are already readable without blocking."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        try:
+            self.finish()
+        except OSError:
+            pass
+        self.server.shutdown_request(self.request)
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug WSGI server that serves requests on a bounded thread pool.
+
+    The listening socket and every idle keep-alive connection share one
+    selector, so a connection only occupies a worker while a request on it is
+    being served. Idle workers take turns waiting on the selector (one
+    "leader" at a time): the leader picks up the next ready connection and
+    serves it itself, so a request costs a single thread wake-up, as with one
+    thread per connection. Workers hand finished keep-alive connections back
+    through a queue and a socketpair wakes the leader to park them.
+    """
+
+    multithread = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        app,
+        request_workers: int = DEFAULT_REQUEST_WORKERS,
+        stream_workers: int = DEFAULT_STREAM_WORKERS,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ):
+        self.request_workers = max(1, int(request_workers))
+        self.stream_limiter = StreamLimiter(app, stream_workers)
+        self.max_workers = self.request_workers + self.stream_limiter.max_streams
+        self.request_timeout = float(request_timeout)
+        self.keepalive_timeout = float(keepalive_timeout)
+        self._poll_interval = 0.5
+        self._leader = threading.Lock()
+        # Only the leader touches the selector, _parked and _pending.
+        self._pending: collections.deque[_PooledRequestHandler] = collections.deque()
+        self._parked: dict[socket.socket, tuple[_PooledRequestHandler, float]] = {}
+        self._returned: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers: list[threading.Thread] = []
+        self._stop = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+        super().__init__(host, port, self.stream_limiter, handler=_PooledRequestHandler)
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.socket, selectors.EVENT_READ)
+        self._selector.register(self._wake_recv, selectors.EVENT_READ)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._poll_interval = poll_interval
+        self._stop.clear()
+        self._stopped.clear()
+        # Daemon threads, so open video/SSE streams never block interpreter exit.
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"HttpWorker-{idx}", daemon=True)
+            for idx in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        try:
+            while not self._stop.wait(poll_interval):
+                pass
+        except KeyboardInterrupt:
+            self._stop.set()
+        finally:
+            self._wake()
+            with self._leader:
+                for handler, _parked_at in self._parked.values():
+                    handler.close()
+                self._parked.clear()
+                while self._pending:
+                    self._pending.popleft().close()
+            self._stopped.set()
+            self.server_close()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._stopped.wait()
+
+    def _next_connection(self) -> _PooledRequestHandler | None:
+        """Block until a connection has a request to serve, or return None on shutdown."""
+        with self._leader:
+            while not self._stop.is_set():
+                if self._pending:
+                    return self._pending.popleft()
+                for key, _mask in self._selector.select(self._poll_interval):
+                    if key.fileobj is self.socket:
+                        self._accept()
+                    elif key.fileobj is self._wake_recv:
+                        self._drain_wakeups()
+                    else:
+                        self._selector.unregister(key.fileobj)
+                        self._pending.append(self._parked.pop(key.fileobj)[0])
+                self._park_returned()
+                self._expire_idle()
+        return None
+
+    def _accept(self) -> None:
+        try:
+            request, client_address = self.get_request()
+        except OSError:
+            return
+        # Werkzeug writes headers and body separately; without NODELAY, Nagle plus delayed ACKs stall keep-alive.
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            self._pending.append(self.RequestHandlerClass(request, client_address, self))
+        except Exception:  # pylint: disable=broad-except
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+
+    def _park_returned(self) -> None:
+        now = time.monotonic()
+        while True:
+            try:
+                handler = self._returned.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self._selector.register(handler.connection, selectors.EVENT_READ)
+            except (ValueError, OSError):
+                handler.close()
+                continue
+            self._parked[handler.connection] = (handler, now)
+
+    def _expire_idle(self) -> None:
+        deadline = time.monotonic() - self.keepalive_timeout
+        for sock, (handler, parked_at) in list(self._parked.items()):
+            if parked_at <= deadline:
+                self._selector.unregister(sock)
+                del self._parked[sock]
+                handler.close()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_send.send(b"\0")
+        except OSError:
+            # Buffer full (a wakeup is already pending) or server closed.
+            pass
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self._wake_recv.recv(512):
+                pass
+        except OSError:
+            pass
+
+    def _worker_loop(self) -> None:
+        while True:
+            handler = self._next_connection()
+            if handler is None:
+                return
+            try:
+                keep_alive = handler.serve_one()
+                while keep_alive and handler.has_buffered_request():
+                    keep_alive = handler.serve_one()
+            except Exception:  # pylint: disable=broad-except
+                self.handle_error(handler.request, handler.client_address)
+                keep_alive = False
+            if keep_alive and not self._stop.is_set():
+                self._returned.put(handler)
+                self._wake()
+            else:
+                handler.close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if hasattr(self, "_selector"):
+            self._selector.close()
+            for sock in (self._wake_recv, self._wake_send):
+                sock.close()
+
+    def get_stats(self) -> dict:
+        return {
+            "request_workers": self.request_workers,
+            "max_workers": self.max_workers,
+            "idle_connections": len(self._parked),
+            "streams": self.stream_limiter.get_stats(),
+        }
+
+
+def serve_production(
+    app,
+    host: str = "127.0.0.1",
+    port: int = 5000,
+    request_workers: int = DEFAULT_REQUEST_WORKERS,
+    stream_workers: int = DEFAULT_STREAM_WORKERS,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+) -> None:
+    """Serve *app* on a :class:`PooledWSGIServer` until interrupted."""
+    server = PooledWSGIServer(
+        host,
+        port,
+        app,
+        request_workers=request_workers,
+        stream_workers=stream_workers,
+        request_timeout=request_timeout,
+        keepalive_timeout=keepalive_timeout,
+    )
+    print(
+        f"Serving on http://{host}:{server.port} "
+        f"({server.request_workers} request + {server.stream_limiter.max_streams} stream workers)"
+    )
+    server.serve_forever()
@@ -4,13 +4,25 @@ import math
 import re
 import subprocess
 import time
+import uuid
+from functools import partial
 from pathlib import Path
 from urllib.parse import urlparse
 
-from flask import Response, current_app, jsonify, render_template, request, send_from_directory
+from flask import Response, current_app, jsonify, redirect, render_template, request, send_from_directory
 
 from lib.axis_config_sender import send_axis_config
-from lib.camera import generate_frames, generate_ip_camera_frames, generate_rpi_frames, init_ip_camera
+from lib.camera import (
+    DEFAULT_ARUCO_PROFILE,
+    DEFAULT_ARUCO_RATE_HZ,
+    generate_frames,
+    generate_ip_camera_frames,
+    generate_rpi_frames,
+    init_ip_camera,
+)
+from lib.camera_process import start_camera_process
+from lib.control_process import ControlProcessError
+from lib.event_bus import DEFAULT_MAX_RATE_HZ, STREAM_TOPICS
 from lib.json_data_handler import JSONDataHandler
 from lib.pid_config_client import AXES as PID_AXES
 from lib.pid_config_client import request_pid_gains, send_pid_gains
@@ -47,6 +59,24 @@ TRANSLATIONAL_AXES = ("surge", "sway", "heave")
 ATTITUDE_AXES = ("roll", "pitch", "yaw")
 DEFAULT_PID_SETPOINT_RATES = {axis: 90.0 for axis in ATTITUDE_AXES}
 DEFAULT_IP_CAMERA_IP = "10.77.0.4"
+STREAM_KEEPALIVE_S = 15.0
+STREAM_RETRY_MS = 2000
+SNAPSHOT_SECTIONS = (
+    "imu",
+    "imu_status",
+    "resources",
+    "udp",
+    "control_telemetry",
+    "control_state",
+    "lights",
+    "manipulator",
+    "command",
+    "uplink",
+    "aruco",
+    "connection",
+)
+# Section versions restart at 0 with the process, so ETags carry a per-process epoch.
+SNAPSHOT_EPOCH = uuid.uuid4().hex[:8]
 
 
 def _clamp(value, lower, upper):
@@ -200,18 +230,73 @@ def _git_info():
     return {"branch": branch}
 
 
+def _telemetry_data():
+    """Return the in-memory telemetry store when running, else the data.json handler."""
+    return current_app.config.get("TELEMETRY_STORE") or data_handler
+
+
+def _cursor_arg():
+    """Return the ``cursor`` (or legacy-named ``since_seq``) query parameter, or None."""
+    raw = request.args.get("cursor", request.args.get("since_seq"))
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _stream_topics_arg():
+    """Return the requested ``topics`` (comma separated, default all) or None if any is unknown."""
+    raw = request.args.get("topics", "")
+    topics = [topic.strip() for topic in raw.split(",") if topic.strip()] or list(STREAM_TOPICS)
+    if any(topic not in STREAM_TOPICS for topic in topics):
+        return None
+    return topics
+
+
+def _sse_event(topic, payload):
+    return f"event: {topic}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _stream_events(bus, topics, rate):
+    """Subscribe to *topics* and yield SSE frames until the client disconnects."""
+    subscription = bus.subscribe(topics, max_rate_hz=rate)
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while True:
+            events = subscription.get(timeout=STREAM_KEEPALIVE_S)
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            yield "".join(_sse_event(topic, payload) for topic, payload in events)
+    finally:
+        subscription.close()
+
+
 def _live_from_age(age_ms, max_age_ms):
     return age_ms is not None and age_ms <= max_age_ms
 
 
-def _connection_proof_payload():
+def _uplink_status():
     bm = current_app.config.get("BITMASK")
+    return bm.get_uplink_status() if bm else {}
+
+
+def _resource_stats():
     resource = current_app.config.get("RESOURCE")
+    return resource.get_stats() if resource and hasattr(resource, "get_stats") else {}
+
+
+def _imu_stats():
     imu = current_app.config.get("IMU")
+    return imu.get_stats() if imu and hasattr(imu, "get_stats") else {}
 
-    uplink = bm.get_uplink_status() if bm else {}
-    resource_stats = resource.get_stats() if resource and hasattr(resource, "get_stats") else {}
-    imu_stats = imu.get_stats() if imu and hasattr(imu, "get_stats") else {}
+
+def _connection_proof_payload(uplink=None, resource_stats=None, imu_stats=None):
+    uplink = _uplink_status() if uplink is None else uplink
+    resource_stats = _resource_stats() if resource_stats is None else resource_stats
+    imu_stats = _imu_stats() if imu_stats is None else imu_stats
 
     proofs = [
         {
@@ -247,6 +332,101 @@ def _connection_proof_payload():
     }
 
 
+class _SnapshotBuilder:
+    """Builds ``/api/snapshot`` sections for one request.
+
+    Receiver calls shared between sections (uplink status, receiver stats) run
+    once per request. ``version`` returns the producer's change counter for a
+    section, or None when the section holds ages and must always be rebuilt.
+    """
+
+    def __init__(self):
+        self.config = current_app.config
+        self._memo = {}
+
+    def _once(self, key, fn):
+        if key not in self._memo:
+            self._memo[key] = fn()
+        return self._memo[key]
+
+    def _udp_counters(self):
+        resource = self.config.get("RESOURCE")
+        return self._once("udp", lambda: resource.get_udp_counters() if resource else (0, 0))
+
+    def version(self, name):
+        store = self.config.get("TELEMETRY_STORE")
+        ctrl = self.config.get("CONTROLLER")
+        if name in ("imu", "resources", "control_telemetry"):
+            return store.get_version(name) if store else None
+        if name in ("control_state", "lights"):
+            return ctrl.get_state_version() if ctrl and hasattr(ctrl, "get_state_version") else None
+        if name == "aruco":
+            logger = self.config.get("ARUCO_LOGGER")
+            return logger.version if logger else None
+        if name == "udp":
+            # Both counters only grow, so their sum changes whenever either does.
+            return sum(self._udp_counters())
+        return None
+
+    def build(self, name):
+        ctrl = self.config.get("CONTROLLER")
+        bm = self.config.get("BITMASK")
+        if name == "imu":
+            return _telemetry_data().get_section("imu")
+        if name == "resources":
+            return _telemetry_data().get_section("resources") or DEFAULT_RESOURCES
+        if name == "control_telemetry":
+            receiver = self.config.get("CONTROL_TELEM")
+            return (receiver.get_latest() if receiver else _telemetry_data().get_section("control_telemetry")) or {}
+        if name == "imu_status":
+            return self._once("imu_stats", _imu_stats)
+        if name == "udp":
+            udp_rx, udp_err = self._udp_counters()
+            return {"udp_rx_count": udp_rx, "udp_rx_errors": udp_err}
+        if name == "control_state":
+            return ctrl.get_control_state() if ctrl and hasattr(ctrl, "get_control_state") else {}
+        if name == "lights":
+            pct = round((ctrl.get_light() if ctrl else 0.0) * 100)
+            return {"level": pct, "light": pct}
+        if name == "manipulator":
+            return _manipulator_payload(ctrl, self.config.get("CONTROL_TELEM"))
+        if name == "command":
+            return bm.get_command() if bm else {}
+        if name == "uplink":
+            return self._once("uplink", _uplink_status)
+        if name == "aruco":
+            logger = self.config.get("ARUCO_LOGGER")
+            return logger.snapshot() if logger else {}
+        if name == "connection":
+            return _connection_proof_payload(
+                uplink=self._once("uplink", _uplink_status),
+                resource_stats=self._once("resource_stats", _resource_stats),
+                imu_stats=self._once("imu_stats", _imu_stats),
+            )
+        raise KeyError(name)
+
+
+def _snapshot_etag(versions):
+    return SNAPSHOT_EPOCH + ":" + ",".join(f"{name}={ver}" for name, ver in versions.items() if ver is not None)
+
+
+def _known_snapshot_versions():
+    """Return the section versions encoded in the client's ``If-None-Match`` snapshot ETag."""
+    for tag in request.if_none_match.as_set():
+        epoch, _, encoded = tag.partition(":")
+        if epoch != SNAPSHOT_EPOCH:
+            continue
+        known = {}
+        for item in encoded.split(","):
+            name, _, ver = item.partition("=")
+            try:
+                known[name] = int(ver)
+            except ValueError:
+                continue
+        return known
+    return {}
+
+
 def _neutralize_thruster_command():
     """Force topside manual command output to neutral axes."""
     neutral = _neutral_axis_values()
@@ -319,6 +499,19 @@ def _camera_status_payload():
     return active_ip, active_url, status
 
 
+def _mjpeg_redirect():
+    """Send a video viewer to the asyncio MJPEG server when one is running, else return None."""
+    server = current_app.config.get("MJPEG_SERVER")
+    if server is None:
+        return None
+    url = server.url_for(request.path, urlparse(request.host_url).hostname or "127.0.0.1", request.scheme)
+    if request.query_string:
+        url = f"{url}?{request.query_string.decode('latin-1')}"
+    resp = redirect(url, code=307)
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
 def _get_ip_camera_config():
     section = config_handler.get_section("ip_camera") or {}
     raw_presets = section.get("presets", [])
@@ -357,6 +550,11 @@ DEFAULT_RESOURCES = {
 
 def register_routes(app):
 
+    @app.errorhandler(ControlProcessError)
+    def control_process_unavailable(exc):
+        # Forwarded controller calls fail this way while the control process is hung, dead or restarting.
+        return jsonify({"ok": False, "error": str(exc)}), 503
+
     @app.route("/")
     def dashboard():
         """Serve the main dashboard."""
@@ -429,6 +627,9 @@ def register_routes(app):
         rpi_cam = current_app.config.get("RPI_CAMERA")
         if rpi_cam is None:
             return "RPi camera not initialized", 503
+        redirect_resp = _mjpeg_redirect()
+        if redirect_resp is not None:
+            return redirect_resp
         resp = Response(
             generate_rpi_frames(rpi_cam),
             mimetype="multipart/x-mixed-replace; boundary=frame",
@@ -455,6 +656,9 @@ def register_routes(app):
         default_cam = current_app.config.get("DEFAULT_CAMERA")
         if default_cam is None:
             return "Default camera not initialized", 503
+        redirect_resp = _mjpeg_redirect()
+        if redirect_resp is not None:
+            return redirect_resp
         resp = Response(
             generate_frames(default_cam),
             mimetype="multipart/x-mixed-replace; boundary=frame",
@@ -479,6 +683,9 @@ def register_routes(app):
         ip_cam = current_app.config.get("IP_CAMERA")
         if ip_cam is None:
             return "IP camera not initialized", 503
+        redirect_resp = _mjpeg_redirect()
+        if redirect_resp is not None:
+            return redirect_resp
         resp = Response(
             generate_ip_camera_frames(ip_cam),
             mimetype="multipart/x-mixed-replace; boundary=frame",
@@ -556,15 +763,26 @@ def register_routes(app):
             old_camera.stop()
 
         settings = current_app.config.get("IP_CAMERA_SETTINGS") or {}
-        new_camera = init_ip_camera(
+        if current_app.config.get("CAMERA_PROCESSES"):
+            start = partial(start_camera_process, "ip")
+        else:
+            start = init_ip_camera
+        new_camera = start(
             url=url,
             out_width=settings.get("out_width", 960),
             out_height=settings.get("out_height", 540),
             jpeg_quality=settings.get("jpeg_quality", 70),
             flip_180=settings.get("flip_180", False),
             marker_logger=current_app.config.get("ARUCO_LOGGER"),
+            aruco_rate_hz=current_app.config.get("ARUCO_DETECT_HZ", DEFAULT_ARUCO_RATE_HZ),
+            aruco_profile=settings.get("aruco_profile", DEFAULT_ARUCO_PROFILE),
+            idle_release_s=current_app.config.get("CAMERA_IDLE_RELEASE_S", 0.0),
+            capture_options=settings.get("capture_options"),
         )
         current_app.config["IP_CAMERA"] = new_camera
+        mjpeg_server = current_app.config.get("MJPEG_SERVER")
+        if mjpeg_server:
+            mjpeg_server.set_camera("/ip_video_feed", new_camera)
         current_app.config["IP_CAMERA_ACTIVE_IP"] = ip
         current_app.config["IP_CAMERA_ACTIVE_URL"] = url
 
@@ -609,12 +827,12 @@ def register_routes(app):
     @app.route("/api/thrusters", methods=["GET"])
     def get_thrusters():
         """API route for thrusters data."""
-        return jsonify(data_handler.get_section("thrusters"))
+        return jsonify(_telemetry_data().get_section("thrusters"))
 
     @app.route("/api/sensors", methods=["GET"])
     def get_sensors():
         """API route for IMU sensor data (yaw/pitch/roll)."""
-        return jsonify(data_handler.get_section("imu"))
+        return jsonify(_telemetry_data().get_section("imu"))
 
     @app.route("/api/lights", methods=["GET"])
     def get_lights():
@@ -671,21 +889,57 @@ def register_routes(app):
     @app.route("/api/battery", methods=["GET"])
     def get_battery():
         """API route for battery status."""
-        return jsonify({"battery": data_handler.get_section("battery")})
+        return jsonify({"battery": _telemetry_data().get_section("battery")})
 
     @app.route("/api/depth", methods=["GET"])
     def get_depth():
         """API route for depth data."""
-        return jsonify(data_handler.get_section("depth"))
+        return jsonify(_telemetry_data().get_section("depth"))
 
     @app.route("/api/resources", methods=["GET"])
     def get_resources():
         """API route for resource monitor data (CPU, memory, etc.)."""
-        resources = data_handler.get_section("resources")
+        resources = _telemetry_data().get_section("resources")
         if resources is None:
             return jsonify(DEFAULT_RESOURCES)
         return jsonify(resources)
 
+    @app.route("/api/snapshot", methods=["GET"])
+    def dashboard_snapshot():
+        """Return several dashboard sections in one response.
+
+        Query: ``sections`` (comma separated subset of SNAPSHOT_SECTIONS, default
+        all). Send the previous ETag as ``If-None-Match``: sections whose version
+        is unchanged come back as ``{"version": n, "unchanged": true}``, and a
+        304 is returned when every requested section is versioned and unchanged.
+        """
+        raw = request.args.get("sections", "")
+        names = [name.strip() for name in raw.split(",") if name.strip()] or list(SNAPSHOT_SECTIONS)
+        unknown = [name for name in names if name not in SNAPSHOT_SECTIONS]
+        if unknown:
+            error = f"Unknown section '{unknown[0]}'"
+            return jsonify({"ok": False, "error": error, "sections": SNAPSHOT_SECTIONS}), 400
+
+        builder = _SnapshotBuilder()
+        # Versions are read before data so a concurrent update is re-sent on the next request.
+        versions = {name: builder.version(name) for name in names}
+        known = _known_snapshot_versions()
+        etag = _snapshot_etag(versions)
+        unchanged = {name for name, ver in versions.items() if ver is not None and known.get(name) == ver}
+        if len(unchanged) == len(names):
+            response = Response(status=304)
+        else:
+            sections = {
+                name: {"version": ver, "unchanged": True}
+                if name in unchanged
+                else {"version": ver, "data": builder.build(name)}
+                for name, ver in versions.items()
+            }
+            response = jsonify({"ok": True, "generated_at": time.time(), "sections": sections})
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
     @app.route("/api/command/status", methods=["GET"])
     def get_command_status():
         bm = current_app.config.get("BITMASK")
@@ -697,11 +951,13 @@ def register_routes(app):
         state = override.get_state() if override else {}
         controller_state = controller.get_input_status() if controller else {}
         control_state = controller.get_control_state() if controller and hasattr(controller, "get_control_state") else {}
+        controller_loop = controller.get_loop_stats() if controller and hasattr(controller, "get_loop_stats") else {}
         return jsonify(
             {
                 "ok": True,
                 "uplink": uplink,
                 "controller": controller_state,
+                "controller_loop": controller_loop,
                 "control_state": control_state,
                 "udp_rx_count": udp_rx,
                 "udp_rx_errors": udp_err,
@@ -726,7 +982,18 @@ def register_routes(app):
         ctrl = current_app.config.get("CONTROLLER")
         if not ctrl or not hasattr(ctrl, "kill"):
             return jsonify({"ok": False, "error": "Controller not available"}), 503
-        state = ctrl.kill()
+        killed_at = time.monotonic_ns()
+        state = burst = error = None
+        try:
+            if hasattr(ctrl, "emergency_stop"):
+                # Neutral burst goes out now; the scheduled uplink tick would be up to a period later.
+                stop = ctrl.emergency_stop()
+                state, burst = stop["state"], stop["burst"]
+            else:
+                state = ctrl.kill()
+        except ControlProcessError as exc:
+            # A hung or restarting control process is what the kill switch is for: still zero the MCU side.
+            error = str(exc)
         zero_gains = _zero_pid_gains()
         confirmed, attempts = send_pid_gains(zero_gains, timeout=0.5, max_retries=2)
         client = current_app.config.get("SETPOINT_OVERRIDE")
@@ -735,15 +1002,23 @@ def register_routes(app):
                 client.clear_override()
             except Exception:
                 pass
-        return jsonify(
-            {
-                "ok": True,
-                "state": state,
-                "pid_gains_zeroed": confirmed is not None,
-                "pid_zero_attempts": attempts,
-                "pid_gains": _attitude_pid_gains(confirmed or zero_gains),
-            }
+        telemetry = current_app.config.get("CONTROL_TELEM")
+        confirmation = (
+            telemetry.confirm_stopped(killed_at) if telemetry and hasattr(telemetry, "confirm_stopped") else None
         )
+        payload = {
+            "ok": error is None,
+            "state": state,
+            "burst": burst,
+            "confirmation": confirmation,
+            "pid_gains_zeroed": confirmed is not None,
+            "pid_zero_attempts": attempts,
+            "pid_gains": _attitude_pid_gains(confirmed or zero_gains),
+        }
+        if error is not None:
+            payload["error"] = error
+            return jsonify(payload), 503
+        return jsonify(payload)
 
     @app.route("/api/control/rearm", methods=["POST"])
     def control_rearm():
@@ -762,7 +1037,7 @@ def register_routes(app):
     @app.route("/api/control/telemetry", methods=["GET"])
     def control_telemetry():
         receiver = current_app.config.get("CONTROL_TELEM")
-        latest = receiver.get_latest() if receiver else data_handler.get_section("control_telemetry")
+        latest = receiver.get_latest() if receiver else _telemetry_data().get_section("control_telemetry")
         stats = receiver.get_stats() if receiver and hasattr(receiver, "get_stats") else {}
         return jsonify({"ok": bool(latest), "telemetry": latest or {}, "stats": stats})
 
@@ -770,6 +1045,9 @@ def register_routes(app):
     def control_telemetry_history():
         receiver = current_app.config.get("CONTROL_TELEM")
         limit = int(request.args.get("limit", "120"))
+        if receiver and hasattr(receiver, "get_history_since"):
+            result = receiver.get_history_since(_cursor_arg(), limit=limit)
+            return jsonify({"ok": True, **result})
         if receiver:
             history = receiver.get_history(limit=limit)
             return jsonify({"ok": True, "history": history})
@@ -780,10 +1058,42 @@ def register_routes(app):
         limit = int(request.args.get("limit", "100"))
         limit = max(1, min(500, limit))
         log_stream = current_app.config.get("LOG_STREAM")
-        entries = log_stream.get_recent(limit) if log_stream else []
         stats = log_stream.get_stats() if log_stream and hasattr(log_stream, "get_stats") else {}
+        if log_stream and hasattr(log_stream, "get_since"):
+            return jsonify({"ok": True, **log_stream.get_since(_cursor_arg(), limit), "stats": stats})
+        entries = log_stream.get_recent(limit) if log_stream else []
         return jsonify({"ok": True, "logs": entries, "stats": stats})
 
+    @app.route("/api/stream", methods=["GET"])
+    def telemetry_stream():
+        """Push live telemetry as Server-Sent Events.
+
+        Query: ``topics`` (comma separated subset of STREAM_TOPICS) and ``rate``
+        (max events per second per topic).
+        """
+        bus = current_app.config.get("EVENT_BUS")
+        if not bus:
+            return jsonify({"ok": False, "error": "Event bus unavailable"}), 503
+        topics = _stream_topics_arg()
+        if topics is None:
+            return jsonify({"ok": False, "error": "Unknown topic", "topics": list(STREAM_TOPICS)}), 400
+        try:
+            rate = float(request.args.get("rate", DEFAULT_MAX_RATE_HZ))
+        except ValueError:
+            return jsonify({"ok": False, "error": "Invalid 'rate'"}), 400
+        return Response(
+            _stream_events(bus, topics, rate),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.route("/api/stream/stats", methods=["GET"])
+    def telemetry_stream_stats():
+        bus = current_app.config.get("EVENT_BUS")
+        if not bus:
+            return jsonify({"ok": False, "error": "Event bus unavailable"}), 503
+        return jsonify({"ok": True, "stats": bus.get_stats()})
+
     @app.route("/api/system/reset", methods=["POST"])
     def system_reset():
         client = current_app.config.get("SYSTEM_CONTROL")
@@ -4,6 +4,7 @@
   "use strict";
 
   const POLL_MS = 100;
+  const TELEMETRY_BATCH = 50; // max telemetry samples fetched per poll
   let windowSec = 30;
   let paused = false;
 
@@ -184,6 +185,11 @@
   }
 
   var startTime = Date.now();
+  // Control telemetry is fetched incrementally: the server returns only samples
+  // after telemetryCursor, each plotted at its own receive time.
+  var telemetryCursor = null;
+  var streamImu = null;
+  var clockOffsetMs = null; // browser clock minus server clock, fixed on first sample
 
   function applyYLocks(key) {
     var yScale = charts[key].options.scales.y;
@@ -210,14 +216,21 @@
   async function poll() {
     if (paused) return;
     try {
+      var historyUrl = telemetryCursor === null
+        ? "/api/control/telemetry/history?limit=1"
+        : "/api/control/telemetry/history?limit=" + TELEMETRY_BATCH + "&cursor=" + telemetryCursor;
+      var streaming = window.TelemetryStream && window.TelemetryStream.isLive() && streamImu !== null;
       var responses = await Promise.all([
-        fetch("/api/sensors"),
-        fetch("/api/control/telemetry"),
+        streaming ? null : fetch("/api/sensors"),
+        fetch(historyUrl),
       ]);
-      if (!responses[0].ok) return;
-      var d = await responses[0].json();
+      if (!streaming && !responses[0].ok) return;
+      var d = streaming ? streamImu : await responses[0].json();
       var telemetry = responses[1].ok ? await responses[1].json() : {};
-      var setpoints = telemetry.ok && telemetry.telemetry ? telemetry.telemetry.setpoint || {} : {};
+      if (telemetry.ok) {
+        telemetryCursor = telemetry.cursor;
+        appendSetpoints(telemetry.history || []);
+      }
       var t = parseFloat(((Date.now() - startTime) / 1000).toFixed(2));
 
       var values = {
@@ -227,10 +240,6 @@
 
       for (var k in charts) {
         allData[k].push({ x: t, y: values[k] });
-        if (setpointData[k]) {
-          var setpoint = typeof setpoints[k] === "number" ? setpoints[k] : null;
-          setpointData[k].push({ x: t, y: setpoint });
-        }
         trimData(k);
         applyYLocks(k);
         charts[k].update("none");
@@ -240,6 +249,19 @@
     }
   }
 
+  function appendSetpoints(samples) {
+    samples.forEach(function (sample) {
+      if (typeof sample.timestamp !== "number") return;
+      if (clockOffsetMs === null) clockOffsetMs = Date.now() - sample.timestamp * 1000;
+      var x = parseFloat(((sample.timestamp * 1000 + clockOffsetMs - startTime) / 1000).toFixed(2));
+      var setpoints = sample.setpoint || {};
+      for (var k in setpointData) {
+        var setpoint = typeof setpoints[k] === "number" ? setpoints[k] : null;
+        setpointData[k].push({ x: x, y: setpoint });
+      }
+    });
+  }
+
   function clearAll() {
     for (var k in charts) {
       allData[k].length = 0;
@@ -335,6 +357,8 @@
 
   btnPause.addEventListener("click", function () {
     paused = !paused;
+    // Resume from the newest sample instead of back-filling the paused period.
+    telemetryCursor = null;
     updatePauseButton();
   });
 
@@ -395,6 +419,9 @@
     })(key);
   }
 
+  if (window.TelemetryStream) {
+    window.TelemetryStream.on("imu", function (d) { streamImu = d; }, { rate: 1000 / POLL_MS });
+  }
   setInterval(poll, POLL_MS);
   poll();
 })();
@@ -12,6 +12,7 @@
   let sendTimer = null;
   let latestImu = {};
   let latestTelemetry = null;
+  let lastStreamImuAt = 0;
   let latestControlState = {};
   const localSetpoints = { roll: NaN, pitch: NaN, yaw: NaN };
 
@@ -252,7 +253,31 @@
     else setBadge(telemetryAge, "STALE", "bg-danger");
   }
 
+  function streamLive() {
+    return Boolean(window.TelemetryStream && window.TelemetryStream.isLive());
+  }
+
+  function onStreamImu(data) {
+    latestImu = {
+      roll: Number(data.roll),
+      pitch: Number(data.pitch),
+      yaw: Number(data.yaw),
+    };
+    lastStreamImuAt = Date.now();
+  }
+
+  function onStreamTelemetry(snapshot) {
+    latestTelemetry = snapshot || null;
+  }
+
   async function pollImuAndTelemetry() {
+    if (streamLive()) {
+      // Values arrive over /api/stream; only the ages need re-rendering.
+      if (imuAge) imuAge.textContent = lastStreamImuAt ? (Date.now() - lastStreamImuAt).toFixed(0) : "--";
+      updateTelemetryAge(latestTelemetry);
+      updateTelemetryTable();
+      return;
+    }
     const imuReq = fetch("/api/imu/status").then((res) => res.json());
     const telemetryReq = fetch("/api/control/telemetry").then((res) => res.json());
     const results = await Promise.allSettled([imuReq, telemetryReq]);
@@ -276,14 +301,45 @@
     updateTelemetryTable();
   }
 
-  async function pollControlState() {
+  // One /api/snapshot request replaces separate control state and ROV status polls.
+  // Sections the server reports as unchanged keep their previous value. Only
+  // versioned sections go in the ETag-gated request so it can return 304; the
+  // uplink status carries ages and changes every send, so it is fetched apart.
+  const SNAPSHOT_URL = "/api/snapshot?sections=control_state,udp";
+  const UPLINK_URL = "/api/snapshot?sections=uplink";
+  const snapshotSections = {};
+  let snapshotEtag = null;
+
+  async function fetchSnapshot() {
+    const headers = snapshotEtag ? { "If-None-Match": snapshotEtag } : {};
+    const res = await fetch(SNAPSHOT_URL, { cache: "no-store", headers: headers });
+    if (res.status === 304) return false;
+    if (!res.ok) throw new Error("HTTP " + res.status);
+    const data = await res.json();
+    Object.entries(data.sections || {}).forEach(([name, section]) => {
+      if (!section.unchanged) snapshotSections[name] = section.data;
+    });
+    snapshotEtag = res.headers.get("ETag");
+    return true;
+  }
+
+  async function fetchUplink() {
+    const res = await fetch(UPLINK_URL, { cache: "no-store" });
+    if (!res.ok) throw new Error("HTTP " + res.status);
+    const data = await res.json();
+    snapshotSections.uplink = data.sections.uplink.data;
+  }
+
+  async function pollSnapshot() {
     try {
-      const res = await fetch("/api/control/state", { cache: "no-store" });
-      const data = await res.json();
-      if (data.ok) updateControlBanner(data.state || {});
+      await Promise.all([fetchSnapshot(), fetchUplink()]);
     } catch (err) {
-      console.debug("Control state polling failed:", err);
+      console.debug("Snapshot polling failed:", err);
+      if (rovStatus) rovStatus.textContent = "Error fetching status";
+      return;
     }
+    if (snapshotSections.control_state) updateControlBanner(snapshotSections.control_state);
+    renderRovStatus();
   }
 
   async function loadGitBranch() {
@@ -590,7 +646,15 @@
       resetOverrideUi();
       syncLocalSetpoints({});
       if (data.state) updateControlBanner(data.state);
-      setFeedback(res.ok ? "Controls killed." : data.error || "Killswitch failed.", res.ok ? "text-danger" : "text-warning");
+      if (!res.ok) {
+        setFeedback(data.error || "Killswitch failed.", "text-warning");
+      } else if (data.confirmation && data.confirmation.confirmed) {
+        setFeedback("Controls killed; MCU confirmed stop in " + data.confirmation.latency_ms.toFixed(0) + " ms.", "text-danger");
+      } else if (data.confirmation) {
+        setFeedback("Controls killed; no telemetry confirmation yet.", "text-warning");
+      } else {
+        setFeedback("Controls killed.", "text-danger");
+      }
     } catch (err) {
       setFeedback("Error: " + err.message, "text-danger");
     }
@@ -610,45 +674,38 @@
     }
   }
 
-  async function pollRovStatus() {
-    try {
-      const res = await fetch("/api/rov/status");
-      const data = await res.json();
-      const control = data.control_state || latestControlState || {};
-      const uplink = data.uplink || {};
-      if (data.control_state) updateControlBanner(data.control_state);
-      if (rovStatus) {
-        rovStatus.textContent = JSON.stringify(
-          {
-            control_path: controlPathLabel(control.control_path, control.killed === true),
-            pid_enabled: control.pid_enabled,
-            active_setpoints: control.pid_setpoints,
-            manual_command_before_pid: control.manual_command_before_pid,
-            mcu_flags: latestTelemetry && latestTelemetry.flags ? latestTelemetry.flags : {},
-            mcu_command_age_ms: latestTelemetry ? latestTelemetry.last_command_age_ms : null,
-            mcu_measurement: latestTelemetry && latestTelemetry.measurement ? latestTelemetry.measurement : {},
-            pid_output: latestTelemetry && latestTelemetry.output ? latestTelemetry.output : {},
-            pid_gains_mcu: latestTelemetry && latestTelemetry.gains ? latestTelemetry.gains : {},
-            final_topside_command: data.command,
-            raw_payload: uplink.last_packet_hex,
-            timestamp: uplink.last_send_timestamp,
-            sequence: uplink.sequence,
-            link: {
-              ack_age_ms: uplink.last_ack_age_ms,
-              watchdog_resends: uplink.watchdog_resends,
-            },
-            telemetry: {
-              sequence: latestTelemetry ? latestTelemetry.sequence : null,
-              timestamp: latestTelemetry ? latestTelemetry.timestamp : null,
-            },
-            resource: data.resource,
+  function renderRovStatus() {
+    const control = latestControlState || {};
+    const uplink = snapshotSections.uplink || {};
+    if (rovStatus) {
+      rovStatus.textContent = JSON.stringify(
+        {
+          control_path: controlPathLabel(control.control_path, control.killed === true),
+          pid_enabled: control.pid_enabled,
+          active_setpoints: control.pid_setpoints,
+          manual_command_before_pid: control.manual_command_before_pid,
+          mcu_flags: latestTelemetry && latestTelemetry.flags ? latestTelemetry.flags : {},
+          mcu_command_age_ms: latestTelemetry ? latestTelemetry.last_command_age_ms : null,
+          mcu_measurement: latestTelemetry && latestTelemetry.measurement ? latestTelemetry.measurement : {},
+          pid_output: latestTelemetry && latestTelemetry.output ? latestTelemetry.output : {},
+          pid_gains_mcu: latestTelemetry && latestTelemetry.gains ? latestTelemetry.gains : {},
+          final_topside_command: uplink.last_command,
+          raw_payload: uplink.last_packet_hex,
+          timestamp: uplink.last_send_timestamp,
+          sequence: uplink.sequence,
+          link: {
+            ack_age_ms: uplink.last_ack_age_ms,
+            watchdog_resends: uplink.watchdog_resends,
           },
-          null,
-          2
-        );
-      }
-    } catch (err) {
-      if (rovStatus) rovStatus.textContent = "Error fetching status";
+          telemetry: {
+            sequence: latestTelemetry ? latestTelemetry.sequence : null,
+            timestamp: latestTelemetry ? latestTelemetry.timestamp : null,
+          },
+          resource: snapshotSections.udp,
+        },
+        null,
+        2
+      );
     }
   }
 
@@ -805,12 +862,14 @@
   }
 
   wireEvents();
+  if (window.TelemetryStream) {
+    window.TelemetryStream.on("imu", onStreamImu, { rate: 20 });
+    window.TelemetryStream.on("control_telemetry", onStreamTelemetry, { rate: 20 });
+  }
   refreshConfigList();
   loadGitBranch();
-  pollControlState();
+  pollSnapshot();
   pollImuAndTelemetry();
-  pollRovStatus();
-  setInterval(pollControlState, 500);
+  setInterval(pollSnapshot, 500);
   setInterval(pollImuAndTelemetry, 200);
-  setInterval(pollRovStatus, 500);
 })();
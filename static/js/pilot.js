@@ -176,7 +176,12 @@
     }
   }
 
+  function streamLive() {
+    return Boolean(window.TelemetryStream && window.TelemetryStream.isLive());
+  }
+
   async function fetchArucoLog() {
+    if (streamLive()) return;
     try {
       const res = await fetch("/api/aruco-log");
       const data = await res.json();
@@ -242,6 +247,7 @@
     initCameraFeed();
     initArucoControls();
     initLightControls();
+    if (window.TelemetryStream) window.TelemetryStream.on("aruco", renderArucoLog);
 
     const header = document.querySelector("header.header");
     if (header) header.style.display = "none";
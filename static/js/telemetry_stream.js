@@ -0,0 +1,58 @@
+// Shared Server-Sent Events client for /api/stream.
+// Pages register topic handlers; one EventSource per page carries all of them.
+// Pollers check TelemetryStream.isLive() and only fetch while the stream is down.
+(function () {
+  "use strict";
+
+  const handlers = {};
+  let source = null;
+  let openTimer = null;
+  let rateHz = 10;
+
+  function dispatch(topic, event) {
+    let payload;
+    try {
+      payload = JSON.parse(event.data);
+    } catch (_) {
+      return;
+    }
+    (handlers[topic] || []).forEach((fn) => {
+      try {
+        fn(payload);
+      } catch (err) {
+        console.error("Telemetry stream handler failed for " + topic + ":", err);
+      }
+    });
+  }
+
+  function open() {
+    openTimer = null;
+    if (source) source.close();
+    source = null;
+    const topics = Object.keys(handlers);
+    if (topics.length === 0 || typeof EventSource === "undefined") return;
+    source = new EventSource("/api/stream?topics=" + encodeURIComponent(topics.join(",")) + "&rate=" + rateHz);
+    topics.forEach((topic) => {
+      source.addEventListener(topic, (event) => dispatch(topic, event));
+    });
+  }
+
+  // Register fn(payload) for topic. Append topics (logs) deliver an array of items.
+  function on(topic, fn, opts) {
+    if (!handlers[topic]) handlers[topic] = [];
+    handlers[topic].push(fn);
+    if (opts && opts.rate) rateHz = Math.max(rateHz, opts.rate);
+    // Batch registrations made during page setup into a single connection.
+    if (openTimer === null) openTimer = setTimeout(open, 0);
+  }
+
+  function isLive() {
+    return source !== null && source.readyState === EventSource.OPEN;
+  }
+
+  window.addEventListener("beforeunload", () => {
+    if (source) source.close();
+  });
+
+  window.TelemetryStream = { on: on, isLive: isLive };
+})();
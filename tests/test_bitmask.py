@@ -0,0 +1,111 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from lib.bitmask import BitmaskClient, Command, encode_payload
+from lib.packet_schema import BITMASK
+
+
+@pytest.fixture
+def sink():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+def _client(sink, **kwargs):
+    client = BitmaskClient(host="127.0.0.1", port=sink.getsockname()[1], **kwargs)
+    client.start()
+    return client
+
+
+def _receive(sock, seconds):
+    packets = []
+    end = time.monotonic() + seconds
+    while (remaining := end - time.monotonic()) > 0:
+        sock.settimeout(remaining)
+        try:
+            data, _addr = sock.recvfrom(64)
+        except socket.timeout:
+            break
+        packets.append((time.monotonic(), BITMASK.unpack(data)[1]))
+    return packets
+
+
+def test_uplink_status_reports_send_timing(sink):
+    client = _client(sink, rate_hz=100.0)
+    try:
+        time.sleep(0.5)
+        timing = client.get_uplink_status()["timing"]
+    finally:
+        client.stop()
+
+    assert timing["period_ms"] == 10.0
+    assert timing["ticks"] >= 20
+    assert 5.0 < timing["achieved_period_ms"] < 20.0
+    assert timing["lateness"]["count"] == timing["ticks"]
+
+
+def test_send_on_change_sends_right_away_within_the_rate_cap(sink):
+    client = _client(sink, rate_hz=1.0, send_on_change=True, min_send_gap=0.05)
+    try:
+        assert _receive(sink, 0.2)  # first keepalive
+        changed_at = time.monotonic()
+        client.set_from_axes(surge=0.5)
+        (arrived, payload), *_ = _receive(sink, 0.1)
+        assert payload == encode_payload(Command(surge=64))
+        assert arrived - changed_at < 0.04
+
+        packets = []
+        receiver = threading.Thread(target=lambda: packets.extend(_receive(sink, 0.3)))
+        receiver.start()
+        for step in range(1, 11):
+            client.set_from_axes(surge=step / 20.0)
+            time.sleep(0.01)
+        receiver.join()
+        status = client.get_uplink_status()
+    finally:
+        client.stop()
+
+    gaps = [b[0] - a[0] for a, b in zip(packets, packets[1:])]
+    assert 2 <= len(packets) <= 5
+    assert min(gaps) > 0.04
+    assert packets[-1][1] == encode_payload(Command(surge=64))  # the last change still goes out
+    assert status["send_on_change"] is True
+    assert status["command_latency"]["count"] >= 3
+
+
+def test_periodic_mode_holds_changes_for_the_next_tick(sink):
+    client = _client(sink, rate_hz=5.0)
+    try:
+        assert _receive(sink, 0.1)
+        client.set_from_axes(surge=0.5)
+        packets = _receive(sink, 0.05)
+        time.sleep(0.3)
+        latency = client.get_uplink_status()["command_latency"]
+    finally:
+        client.stop()
+
+    assert packets == []
+    assert latency["count"] == 1
+    assert latency["max_us"] > 50_000
+
+
+def test_send_burst_bypasses_the_schedule(sink):
+    client = _client(sink, rate_hz=1.0)
+    try:
+        assert _receive(sink, 0.2)  # first keepalive; the next tick is a second away
+        client.set_from_axes()
+        burst = client.send_burst(count=3, gap=0.005)
+        packets = _receive(sink, 0.1)
+    finally:
+        client.stop()
+
+    assert burst["packets"] == 3
+    assert len(packets) == 3
+    assert {payload for _arrived, payload in packets} == {encode_payload(Command())}
+    assert burst["last_sequence"] - burst["first_sequence"] == 2
@@ -3,9 +3,19 @@ import time
 
 import cv2
 import numpy as np
+import pytest
 
 from lib.aruco_logger import ArucoPipelineLogger
-from lib.camera import DefaultCameraReceiver, IPCameraReceiver
+from lib.camera import (
+    ArucoDetectionWorker,
+    ArUcoMarkerDetector,
+    DefaultCameraReceiver,
+    IPCameraReceiver,
+    RPiCameraReceiver,
+    ffmpeg_capture_options,
+    generate_frames,
+    generate_rpi_frames,
+)
 
 
 class FakeClosedCapture:
@@ -44,6 +54,148 @@ def test_default_camera_start_returns_before_device_opens(monkeypatch):
     assert status["listening"] is False
 
 
+class FakeOpenCapture:
+    def __init__(self):
+        self.reads = 0
+        self.grabs = 0
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        self.reads += 1
+        time.sleep(0.005)
+        if image is None:
+            image = np.empty((48, 64, 3), dtype=np.uint8)
+        image[:] = 0
+        return True, image
+
+    def grab(self):
+        self.grabs += 1
+        time.sleep(0.005)
+        return True
+
+    def release(self):
+        self.released = True
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_camera_only_encodes_frames_while_someone_needs_them(monkeypatch):
+    captures = []
+    monkeypatch.setattr(cv2, "VideoCapture", lambda device_index: captures.append(FakeOpenCapture()) or captures[-1])
+    logger = ArucoPipelineLogger()
+    camera = DefaultCameraReceiver(marker_logger=logger)
+    camera.start()
+    try:
+        assert _wait_for(lambda: captures and captures[0].grabs > 5)
+        assert captures[0].reads == 0
+        assert camera.get_latest_chunk() is None
+        assert camera.get_status()["connected"] is True
+
+        viewer = generate_frames(camera)
+        assert b"image/jpeg" in next(viewer)
+        assert _wait_for(lambda: camera.get_latest_chunk() is not None)
+        viewer.close()
+        assert camera.get_status()["demand"]["viewers"] == 0
+        assert _wait_for(lambda: camera.get_latest_chunk() is None)
+
+        logger.start()
+        assert _wait_for(lambda: camera.get_latest_chunk() is not None)
+    finally:
+        camera.stop()
+
+
+def test_camera_releases_idle_capture_and_reopens_for_a_viewer(monkeypatch):
+    captures = []
+    monkeypatch.setattr(cv2, "VideoCapture", lambda device_index: captures.append(FakeOpenCapture()) or captures[-1])
+    camera = DefaultCameraReceiver(idle_release_s=0.05)
+    camera.add_viewer()
+    camera.start()
+    try:
+        assert _wait_for(lambda: camera.get_latest_chunk() is not None)
+        camera.remove_viewer()
+        assert _wait_for(lambda: captures[0].released)
+        time.sleep(0.1)
+        assert len(captures) == 1
+        assert camera.get_status()["connected"] is False
+
+        camera.add_viewer()
+        assert _wait_for(lambda: len(captures) == 2 and camera.get_latest_chunk() is not None, timeout=1.0)
+    finally:
+        camera.stop()
+
+
+class RealTimeCapture(FakeOpenCapture):
+    """Emits a frame every *interval* seconds and, like FFmpeg, queues the ones not yet grabbed."""
+
+    def __init__(self, interval=0.02):
+        super().__init__()
+        self.interval = interval
+        self.started = time.monotonic()
+        self.next_index = 0
+        self.grabbed_index = None
+
+    def grab(self):
+        emitted_at = self.started + self.next_index * self.interval
+        time.sleep(max(0.0, emitted_at - time.monotonic()))
+        self.grabbed_index = self.next_index
+        self.next_index += 1
+        return True
+
+    def retrieve(self, image=None):
+        if image is None:
+            image = np.empty((48, 64, 3), dtype=np.uint8)
+        # A uniform picture, so the frame index survives resizing and rotation.
+        image[:] = (self.grabbed_index % 256, self.grabbed_index // 256, 0)
+        return True, image
+
+
+def test_ip_camera_drops_frames_instead_of_falling_behind(monkeypatch):
+    capture = RealTimeCapture()
+    monkeypatch.setattr(cv2, "VideoCapture", lambda url, backend: capture)
+    camera = IPCameraReceiver("rtsp://example.invalid/stream", out_width=160, out_height=120, flip_180=True)
+    latencies = []
+    frames = []
+
+    def slow_set_frame(frame):
+        frames.append(frame)
+        time.sleep(0.06)  # processing takes three frame intervals
+        index = int(frame[0, 0, 0]) + 256 * int(frame[0, 0, 1])
+        latencies.append(time.monotonic() - (capture.started + index * capture.interval))
+
+    monkeypatch.setattr(camera, "_set_frame", slow_set_frame)
+    camera.add_viewer()
+    camera.start()
+    try:
+        assert _wait_for(lambda: len(latencies) >= 15)
+    finally:
+        camera.stop()
+
+    assert max(latencies[-5:]) < 0.15
+    # Retrieve, resize and rotate all write into the same arrays every frame.
+    assert frames[0].shape == (120, 160, 3)
+    assert all(frame is frames[0] for frame in frames)
+    stats = camera.get_status()["capture"]
+    assert stats["frames_dropped"] > 0
+    assert stats["staleness_ms"]["p50"] >= 60
+
+
+def test_ffmpeg_capture_options_string():
+    assert ffmpeg_capture_options() == "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+    assert (
+        ffmpeg_capture_options(transport="udp", low_latency=False, probesize="32768", analyzeduration_us=0)
+        == "rtsp_transport;udp|probesize;32768|analyzeduration;0"
+    )
+    assert ffmpeg_capture_options(transport="", low_latency=False) == ""
+
+
 class FakeArucoDetector:
     def detect_markers(self, frame):
         return [], None, []
@@ -62,11 +214,142 @@ def test_ip_camera_frame_updates_aruco_logger():
     logger = ArucoPipelineLogger()
     logger.start()
     camera = IPCameraReceiver("rtsp://example.invalid/stream", marker_logger=logger)
-    camera._detector = FakeArucoDetector()
+    camera._aruco.detector = FakeArucoDetector()
 
     camera._set_frame(np.zeros((20, 20, 3), dtype=np.uint8))
 
+    deadline = time.monotonic() + 2.0
+    while not logger.snapshot()["entries"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    camera._aruco.stop()
     snapshot = logger.snapshot()
     assert [entry["id"] for entry in snapshot["entries"]] == [2, 3]
     assert snapshot["visible_ids"] == [2, 3]
     assert camera.get_latest_jpeg() is not None
+
+
+def test_frames_are_published_as_one_shared_multipart_chunk():
+    camera = RPiCameraReceiver()
+    received = []
+    camera.add_frame_listener(received.append)
+    viewers = [generate_rpi_frames(camera), generate_rpi_frames(camera)]
+
+    camera._set_jpeg_bytes(b"\xff\xd8jpeg\xff\xd9")
+
+    chunks = [next(viewer) for viewer in viewers]
+    assert chunks[0] == b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 8\r\n\r\n\xff\xd8jpeg\xff\xd9\r\n"
+    assert chunks[0] is chunks[1] is received[0]
+    assert camera.get_latest_jpeg() == b"\xff\xd8jpeg\xff\xd9"
+    seq = camera.wait_for_next_chunk(-1)[1]
+    assert camera.get_latest_jpeg_and_seq() == (b"\xff\xd8jpeg\xff\xd9", seq)
+    assert camera.wait_for_next_frame(-1) == (b"\xff\xd8jpeg\xff\xd9", seq)
+    assert camera.get_placeholder_jpeg().startswith(b"\xff\xd8")
+
+
+class SlowArucoDetector(FakeArucoDetector):
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self.drawn = []
+
+    def detect_markers(self, frame):
+        self.calls += 1
+        self.release.wait(timeout=2.0)
+        return ["corners"], np.array([[7]]), []
+
+    def marker_detections(self, corners, ids):
+        return [{"id": 7, "center": (10, 10)}]
+
+    def draw_detected_markers(self, frame, corners, ids):
+        self.drawn.append(corners)
+        return frame
+
+
+def test_aruco_worker_keeps_slow_detection_off_the_capture_thread():
+    detector = SlowArucoDetector()
+    worker = ArucoDetectionWorker(detector, rate_hz=0)
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+    try:
+        started = time.monotonic()
+        for _ in range(20):
+            worker.process(frame)
+        assert time.monotonic() - started < 0.5
+        assert detector.calls <= 1
+        assert worker.frames_skipped == 19
+        assert detector.drawn == []
+
+        detector.release.set()
+        deadline = time.monotonic() + 2.0
+        while worker.detections_run == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        worker.process(frame)
+        # Frames between detections carry the last detections.
+        assert detector.drawn == [["corners"]]
+    finally:
+        worker.stop()
+
+
+def test_aruco_worker_limits_detection_rate():
+    detector = SlowArucoDetector()
+    detector.release.set()
+    worker = ArucoDetectionWorker(detector, rate_hz=5)
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+    try:
+        assert worker.submit(frame) is True
+        time.sleep(0.05)
+        assert worker.submit(frame) is False
+        time.sleep(0.2)
+        assert worker.submit(frame) is True
+    finally:
+        worker.stop()
+
+
+def _marker_scene(positions, size=80):
+    """960x540 grayscale frame with a DICT_4X4_50 marker (plus quiet zone) at each ``{id: (x, y)}``."""
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_50)
+    frame = np.full((540, 960), 128, dtype=np.uint8)
+    border = size // 4
+    for marker_id, (x, y) in positions.items():
+        marker = cv2.aruco.generateImageMarker(dictionary, marker_id, size)
+        marker = cv2.copyMakeBorder(marker, border, border, border, border, cv2.BORDER_CONSTANT, value=255)
+        frame[y : y + marker.shape[0], x : x + marker.shape[1]] = marker
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+
+def _by_id(corners, ids):
+    return {int(i): c.reshape(-1, 2) for i, c in zip(ids.flatten(), corners, strict=True)}
+
+
+def test_downscaled_detection_reports_full_resolution_corners():
+    frame = _marker_scene({3: (100, 80), 7: (600, 300)})
+    accurate = ArUcoMarkerDetector(profile="accurate").detect_markers(frame)
+    fast = ArUcoMarkerDetector(profile="fast").detect_markers(frame)
+
+    expected = _by_id(accurate[0], accurate[1])
+    found = _by_id(fast[0], fast[1])
+    assert sorted(found) == [3, 7]
+    for marker_id, points in found.items():
+        assert np.abs(points - expected[marker_id]).max() < 3.0
+
+
+def test_fast_profile_tracks_markers_between_full_scans(monkeypatch):
+    detector = ArUcoMarkerDetector(profile="fast")
+    full_scans = []
+    detect_full = detector._detect_full
+    monkeypatch.setattr(detector, "_detect_full", lambda gray: full_scans.append(1) or detect_full(gray))
+
+    for step in range(5):
+        corners, ids, _rejected = detector.detect_markers(_marker_scene({3: (100 + 4 * step, 80)}))
+        assert ids.flatten().tolist() == [3]
+        assert abs(corners[0].reshape(-1, 2)[:, 0].min() - (120 + 4 * step)) < 2.0
+    assert len(full_scans) == 1
+
+    # Losing the tracked marker falls back to a full scan in the same frame.
+    corners, ids, _rejected = detector.detect_markers(_marker_scene({5: (500, 300)}))
+    assert ids.flatten().tolist() == [5]
+    assert len(full_scans) == 2
+
+
+def test_unknown_aruco_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown ArUco profile"):
+        ArUcoMarkerDetector(profile="turbo")
@@ -29,9 +29,9 @@ class EmptyStream:
     def __init__(self, receiver):
         self.receiver = receiver
 
-    def read(self, _size):
+    def readinto(self, _buffer):
         self.receiver._gst_proc = None  # pylint: disable=protected-access
-        return b""
+        return 0
 
 
 class ExitedProcess:
@@ -0,0 +1,58 @@
+import time
+
+import cv2
+import numpy as np
+
+from lib.aruco_logger import ArucoPipelineLogger
+from lib.camera_process import CONTROL_VIEWERS, SharedRing, start_camera_process
+
+
+def test_shared_ring_returns_newest_message_across_attachments():
+    writer = SharedRing.create(slots=4, slot_size=64)
+    reader = SharedRing.attach(writer.name)
+    try:
+        assert reader.read_latest() == (None, 0)
+        for index in range(1, 7):
+            assert writer.write(b"message %d" % index) == index
+
+        assert reader.read_latest() == (b"message 6", 6)
+        assert writer.write(b"x" * 65) == 0
+        assert writer.oversize_dropped == 1
+        assert reader.read_latest() == (b"message 6", 6)
+
+        reader.set_control(CONTROL_VIEWERS, 3)
+        assert writer.get_control(CONTROL_VIEWERS) == 3
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_camera_process_serves_frames_through_shared_memory(tmp_path):
+    clip = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(clip), cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240))
+    for index in range(60):
+        writer.write(np.full((240, 320, 3), index * 4, dtype=np.uint8))
+    writer.release()
+
+    camera = start_camera_process(
+        "ip", marker_logger=ArucoPipelineLogger(), url=str(clip), out_width=160, out_height=120
+    )
+    try:
+        assert camera.get_latest_chunk() is None
+        camera.add_viewer()
+        deadline = time.monotonic() + 20.0
+        while camera.get_latest_jpeg() is None and time.monotonic() < deadline:
+            camera.wait_for_next_chunk(-1, timeout=0.25)
+
+        jpg = camera.get_latest_jpeg()
+        assert jpg is not None
+        assert camera.get_latest_jpeg_and_seq()[0] is not None
+        assert camera.get_placeholder_jpeg().startswith(b"\xff\xd8")
+        assert cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_COLOR).shape == (120, 160, 3)
+        status = camera.get_status()
+        assert status["process"]["running"] is True
+        assert status["process"]["viewers"] == 1
+    finally:
+        camera.stop()
+
+    assert camera.get_status()["process"]["running"] is False
@@ -0,0 +1,154 @@
+import io
+import os
+import socket
+import time
+
+import pytest
+
+import lib.control_process as control_process_module
+from lib.bitmask import Command, encode_payload
+from lib.control_process import ControlProcess, init_control_process
+from lib.packet_schema import BITMASK
+
+
+class FakeSetpointClient:
+    def __init__(self, error=None):
+        self.sent = []
+        self.error = error
+
+    def send_override(self, setpoints, replay_attempts=3, replay_delay=0.05):
+        self.sent.append(setpoints)
+        if self.error:
+            raise OSError(self.error)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@pytest.fixture
+def uplink():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    yield sock
+    sock.close()
+
+
+@pytest.fixture
+def control(uplink):
+    process = init_control_process(rate_hz=50.0, host="127.0.0.1", port=uplink.getsockname()[1], cpu=0)
+    yield process
+    process.stop()
+
+
+def _next_payload(sock):
+    while True:
+        data, _addr = sock.recvfrom(64)
+        _seq, payload = BITMASK.unpack(data)
+        yield payload
+
+
+def test_control_process_sends_commands_and_mirrors_state(control, uplink):
+    controller, bitmask = control.controller, control.bitmask
+
+    output = controller.apply_manual_axes_once({"surge": 0.5, "yaw": -1.0})
+    assert output["surge"] == 0.5
+    assert controller.get_control_state()["topside_command"]["yaw"] == -1.0
+    expected = encode_payload(Command(surge=64, yaw=-127))
+    assert any(payload == expected for payload, _ in zip(_next_payload(uplink), range(20)))
+
+    state = controller.kill()
+    assert state["killed"] is True
+    assert controller.is_killed()
+    assert bitmask.get_command()["surge"] == 0
+    stop = controller.emergency_stop()
+    assert stop["state"]["killed"] is True
+    assert stop["burst"]["packets"] == 3
+    assert _wait_for(lambda: bitmask.get_uplink_status()["sequence"] > 3)
+    status = bitmask.get_uplink_status()["process"]
+    assert status["running"] is True
+    if hasattr(os, "sched_setaffinity"):
+        assert status["priority"]["cpu"] == 0
+
+
+def test_pid_setpoint_sends_go_through_the_web_process_client(control):
+    client = FakeSetpointClient()
+    control.controller.set_setpoint_client(client)
+
+    assert control.controller.start_pid({"yaw": 10.0}) == {"yaw": 10.0}
+    control.controller.apply_manual_axes_once({"yaw": 1.0})
+
+    assert _wait_for(lambda: client.sent)
+    assert set(client.sent[0]) == {"yaw"}
+
+
+def test_failed_forwarded_setpoint_send_is_recorded_once(control):
+    controller = control.controller
+    client = FakeSetpointClient(error="link down")
+    controller.set_setpoint_client(client)
+    controller.start_pid({"yaw": 10.0})
+
+    controller.apply_manual_axes_once({"yaw": 1.0})
+    assert _wait_for(lambda: controller.get_control_state().get("last_pid_error") == "link down")
+    version = controller.get_state_version()
+    for _ in range(5):
+        controller.apply_manual_axes_once({"yaw": 1.0})
+    time.sleep(0.3)
+
+    assert len(client.sent) >= 6
+    assert controller.get_control_state()["last_pid_error"] == "link down"
+    # One bump per send for the moving setpoint; the error must not also flip to None and back each time.
+    assert controller.get_state_version() - version <= 5
+
+
+def test_crashed_control_process_restarts_killed(control):
+    controller = control.controller
+    assert controller.is_killed() is False
+    controller.set_pid_rates({"yaw": 30.0})
+    version = controller.get_state_version()
+    old_pid = control.get_status()["pid"]
+
+    control._proc.kill()
+
+    assert _wait_for(lambda: control.restarts == 1 and control.get_status()["pid"] != old_pid)
+    started = time.monotonic()
+    state = controller.kill()
+    assert time.monotonic() - started < 1.0  # the reader thread is not stuck re-applying rates
+    assert state["pid_setpoint_rates"]["yaw"] == 30.0
+    assert _wait_for(controller.is_killed)
+    assert controller.get_state_version() > version
+    assert controller.rearm()["killed"] is False
+
+
+def test_reader_skips_a_truncated_last_line_and_restarts(monkeypatch):
+    class DeadChild:
+        pid = 1234
+        stdout = io.BytesIO(b'{"state": {"state_version": 3}}\n{"state": {"control_state": {"kil')
+
+        def wait(self):
+            return -9
+
+        def poll(self):
+            return -9
+
+    monkeypatch.setattr(control_process_module, "RESTART_DELAY", 0.0)
+    process = ControlProcess()
+    process._proc = DeadChild()
+    spawned = []
+
+    def fake_spawn(start_killed, pid_rates=None):
+        spawned.append(start_killed)
+        process._stopping.set()
+
+    process._spawn = fake_spawn
+    process._read_loop()
+
+    assert process.state() == {"state_version": 3}
+    assert spawned == [True]
+    assert process.restarts == 1
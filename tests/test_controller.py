@@ -8,6 +8,7 @@ import pytest
 
 import lib.controller as controller_module
 from lib.controller import Controller
+from lib.periodic import PeriodicScheduler
 
 
 class FakeBitmask:
@@ -71,10 +72,14 @@ class FakeJoystick:
         return self.hat
 
 
+# Full trigger for one 60 Hz tick: 45 deg/s * (1/60) s out of the 50 deg range.
+ONE_TICK_MANIP = Controller.MANIP_NUDGE_DEG_PER_SEC / 60.0 / Controller.MANIP_MAX_DEG
+
+
 def build_controller(controller=None, joystick=None):
     ctrl = Controller.__new__(Controller)
     ctrl.bm = FakeBitmask()
-    ctrl.delay_ms = 16
+    ctrl._scheduler = PeriodicScheduler(1.0 / 60.0)
     ctrl.controller = controller
     ctrl.joystick = joystick or FakeJoystick()
     ctrl.axis_offsets = {}
@@ -101,6 +106,7 @@ def build_controller(controller=None, joystick=None):
     ctrl._last_runtime_source = "PS4"
     ctrl._last_pid_error = None
     ctrl._setpoint_client = None
+    ctrl._state_version = 0
     return ctrl
 
 
@@ -141,7 +147,7 @@ def test_sdl_gamecontroller_mapping_normalizes_linux_playstation_layout(monkeypa
     assert command["yaw"] == pytest.approx(-0.375, rel=1e-3)
     assert command["pitch"] == 0.0
     assert command["roll"] == 0.0
-    assert command["manip"] == pytest.approx(-0.0144, rel=1e-3)
+    assert command["manip"] == pytest.approx(-ONE_TICK_MANIP, rel=1e-3)
     assert command["light"] == pytest.approx(0.1, rel=1e-3)
     status = ctrl.get_input_status()
     assert status["connected"] is True
@@ -198,7 +204,7 @@ def test_raw_joystick_mapping_remains_available_for_unsupported_devices(monkeypa
     assert command["sway"] == 0.25
     assert command["heave"] == 0.2
     assert command["yaw"] == -0.4
-    assert command["manip"] == pytest.approx(-0.0144, rel=1e-3)
+    assert command["manip"] == pytest.approx(-ONE_TICK_MANIP, rel=1e-3)
     assert command["light"] == pytest.approx(0.1, rel=1e-3)
     status = ctrl.get_input_status()
     assert status["source"] == "raw_joystick"
@@ -250,7 +256,7 @@ def test_l2_nudges_manipulator_counterclockwise(monkeypatch):
     ctrl.update()
 
     command = ctrl.bm.calls[-1]
-    assert command["manip"] == pytest.approx(0.0144, rel=1e-3)
+    assert command["manip"] == pytest.approx(ONE_TICK_MANIP, rel=1e-3)
     assert ctrl.get_manipulator()["source"] == "controller"
 
 
@@ -0,0 +1,81 @@
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from lib import crc
+
+
+def _reference_crc(data, state=0xFFFFFFFF):
+    """Bitwise IEEE 802.3 CRC-32 state update, independent of lib.crc."""
+    for byte in data:
+        state ^= byte
+        for _ in range(8):
+            state = (state >> 1) ^ 0xEDB88320 if state & 1 else state >> 1
+    return state
+
+
+def _random_payloads(count=200, max_len=300, seed=1234):
+    rng = random.Random(seed)
+    return [bytes(rng.getrandbits(8) for _ in range(rng.randrange(max_len))) for _ in range(count)]
+
+
+def test_crc32_ieee_matches_reference():
+    for payload in _random_payloads():
+        assert crc.crc32_ieee(payload) == _reference_crc(payload) ^ 0xFFFFFFFF
+
+
+def test_custom_initial_and_continue_match_reference():
+    for payload in _random_payloads(count=50):
+        for initial in (0, 0x12345678, 0xFFFFFFFF):
+            assert crc.crc32_ieee(payload, initial) == _reference_crc(payload, initial) ^ 0xFFFFFFFF
+            assert crc.crc32_continue(initial, payload) == _reference_crc(payload, initial)
+
+
+def test_streaming_helper_matches_one_shot_for_any_split():
+    payload = _random_payloads(count=1, max_len=400, seed=7)[0] + b"tail"
+    for split in (0, 1, 12, len(payload) // 2, len(payload)):
+        stream = crc.CRC32()
+        stream.update(payload[:split])
+        stream.update(memoryview(payload)[split:])
+        assert stream.digest() == crc.crc32_ieee(payload)
+        assert stream.hexdigest() == f"{crc.crc32_ieee(payload):08x}"
+        state = crc.crc32_continue(0xFFFFFFFF, payload[:split])
+        assert crc.crc32_continue(state, payload[split:]) ^ 0xFFFFFFFF == crc.crc32_ieee(payload)
+
+
+def test_accepts_bytearray_and_memoryview():
+    payload = bytearray(b"123456789")
+    assert crc.crc32_ieee(payload) == 0xCBF43926
+    assert crc.crc32_ieee(memoryview(payload)) == 0xCBF43926
+
+
+def test_batch_of_buffers_matches_single_calls():
+    payloads = _random_payloads(count=64)
+    assert crc.crc32_batch(payloads) == [crc.crc32_ieee(p) for p in payloads]
+
+
+@pytest.mark.parametrize("width", [12, 200])
+def test_batch_of_numpy_rows_matches_single_calls(width):
+    rows = np.random.default_rng(3).integers(0, 256, size=(128, width), dtype=np.uint8)
+    result = crc.crc32_batch(rows)
+    assert result.dtype == np.uint32
+    assert result.tolist() == [crc.crc32_ieee(row.tobytes()) for row in rows]
+
+
+@pytest.mark.parametrize("byteorder,fmt", [("big", "!I"), ("little", "<I")])
+def test_verify_batch_flags_corrupted_packets(byteorder, fmt):
+    bodies = [bytes(range(i, i + 12)) for i in range(10)]
+    packets = [body + struct.pack(fmt, crc.crc32_ieee(body)) for body in bodies]
+    packets[3] = packets[3][:-1] + bytes([packets[3][-1] ^ 0x01])
+    packets[7] = b"\x00" + packets[7][1:]
+    expected = [i not in (3, 7) for i in range(10)]
+
+    assert crc.verify_batch(packets, byteorder=byteorder) == expected
+    rows = np.frombuffer(b"".join(packets), dtype=np.uint8).reshape(10, 16)
+    assert crc.verify_batch(rows, byteorder=byteorder).tolist() == expected
+
+
+def test_verify_batch_rejects_short_packets():
+    assert crc.verify_batch([b"", b"abc"]) == [False, False]
@@ -0,0 +1,96 @@
+import json
+
+from flask import Flask
+
+from lib.aruco_logger import ArucoPipelineLogger
+from lib.event_bus import TopicBus
+from lib.json_data_handler import JSONDataHandler
+from lib.telemetry_store import TelemetryStore
+from routes import register_routes
+
+
+def test_state_topics_coalesce_to_latest_value():
+    bus = TopicBus()
+    sub = bus.subscribe(["imu"], max_rate_hz=50.0)
+
+    for idx in range(10):
+        bus.publish("imu", {"yaw": float(idx)})
+    bus.publish("resources", {"cpu_percent": 3})
+
+    assert sub.get(timeout=0.5) == [("imu", {"yaw": 9.0})]
+    assert sub.coalesced == 9
+    assert sub.get(timeout=0.05) == []
+
+
+def test_append_topics_batch_and_drop_oldest():
+    bus = TopicBus()
+    sub = bus.subscribe(["logs"], backlog=3)
+
+    for idx in range(5):
+        bus.publish("logs", {"id": idx}, append=True)
+
+    assert sub.get(timeout=0.5) == [("logs", [{"id": 2}, {"id": 3}, {"id": 4}])]
+    assert sub.dropped == 2
+
+
+def test_rate_limit_defers_next_delivery():
+    bus = TopicBus()
+    sub = bus.subscribe(["imu"], max_rate_hz=5.0)
+    bus.publish("imu", {"yaw": 1.0})
+    assert sub.get(timeout=0.5) == [("imu", {"yaw": 1.0})]
+
+    bus.publish("imu", {"yaw": 2.0})
+    assert sub.get(timeout=0.05) == []
+    assert sub.get(timeout=0.5) == [("imu", {"yaw": 2.0})]
+
+
+def test_new_subscribers_replay_retained_state_and_close_unregisters():
+    bus = TopicBus()
+    store = TelemetryStore(backing=JSONDataHandler(), event_bus=bus)
+    store.update_data({"imu": {"yaw": 4.0}})
+    logger = ArucoPipelineLogger(event_bus=bus)
+    logger.start()
+
+    sub = bus.subscribe(["imu", "aruco"])
+    events = dict(sub.get(timeout=0.5))
+    assert events["imu"] == {"yaw": 4.0}
+    assert events["aruco"]["enabled"] is True
+    assert bus.has_subscribers("imu")
+
+    sub.close()
+    assert not bus.has_subscribers("imu")
+    assert bus.get_stats()["subscribers"] == 0
+
+
+def _client_with_bus(bus):
+    app = Flask(__name__)
+    app.config["EVENT_BUS"] = bus
+    register_routes(app)
+    return app.test_client()
+
+
+def test_stream_route_sends_server_sent_events():
+    bus = TopicBus()
+    bus.publish("resources", {"cpu_percent": 12})
+    client = _client_with_bus(bus)
+
+    res = client.get("/api/stream?topics=resources&rate=20", buffered=False)
+    assert res.status_code == 200
+    assert res.mimetype == "text/event-stream"
+    frames = iter(res.response)
+    assert next(frames).startswith(b"retry:")
+    event = next(frames).decode()
+    assert event.startswith("event: resources\ndata: ")
+    assert json.loads(event.split("data: ", 1)[1]) == {"cpu_percent": 12}
+
+    res.close()
+    assert bus.get_stats()["subscribers"] == 0
+
+
+def test_stream_route_rejects_unknown_topics():
+    client = _client_with_bus(TopicBus())
+
+    res = client.get("/api/stream?topics=imu,bogus")
+
+    assert res.status_code == 400
+    assert res.get_json()["ok"] is False
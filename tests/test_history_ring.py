@@ -0,0 +1,64 @@
+import numpy as np
+
+from lib.history_ring import HistoryRing, dtype_from_schema, resolve_cursor
+from lib.packet_schema import PID_CONFIG
+
+DTYPE = np.dtype([("seq", "u4"), ("values", "f4", (2,))])
+
+
+def test_latest_returns_chronological_rows_across_wraparound():
+    ring = HistoryRing(DTYPE, capacity=3)
+    for seq in range(5):
+        ring.append((seq, (seq, -seq)))
+
+    assert len(ring) == 3
+    assert ring.written == 5
+    assert ring.latest(10)["seq"].tolist() == [2, 3, 4]
+    assert ring.latest(2)["seq"].tolist() == [3, 4]
+    assert ring.latest(0).shape == (0,)
+
+
+def test_latest_returns_a_copy():
+    ring = HistoryRing(DTYPE, capacity=4)
+    ring.append((1, (1.0, 2.0)))
+    rows = ring.latest(1)
+    rows["seq"][0] = 99
+
+    assert ring.latest(1)["seq"].tolist() == [1]
+    assert ring.nbytes == 4 * DTYPE.itemsize
+
+
+def test_dtype_from_schema_maps_repeated_fields_to_subarrays():
+    dtype = dtype_from_schema(PID_CONFIG, extra=[("timestamp", "f8")])
+
+    assert dtype.names == ("timestamp", "type", "gains")
+    assert dtype["gains"].shape == (18,)
+    assert dtype["type"] == np.dtype("u1")
+
+
+def test_since_returns_only_new_rows_and_reports_missed():
+    ring = HistoryRing(DTYPE, capacity=4)
+    for seq in range(3):
+        ring.append((seq, (0.0, 0.0)))
+
+    rows, cursor, missed = ring.since(None, limit=2)
+    assert rows["seq"].tolist() == [1, 2]
+    assert (cursor, missed) == (3, 0)
+
+    rows, cursor, missed = ring.since(cursor, limit=10)
+    assert rows.shape == (0,)
+    assert (cursor, missed) == (3, 0)
+
+    for seq in range(3, 9):
+        ring.append((seq, (0.0, 0.0)))
+    rows, cursor, missed = ring.since(3, limit=10)
+    assert rows["seq"].tolist() == [5, 6, 7, 8]
+    assert (cursor, missed) == (9, 2)
+
+
+def test_resolve_cursor_limits_and_resets_stale_cursors():
+    assert resolve_cursor(10, written=20, retained=20, limit=4) == (16, 6)
+    assert resolve_cursor(18, written=20, retained=20, limit=4) == (18, 0)
+    # A cursor from before a restart is ahead of the counter: start over from the latest.
+    assert resolve_cursor(50, written=20, retained=20, limit=4) == (16, 0)
+    assert resolve_cursor(-1, written=2, retained=2, limit=4) == (0, 0)
@@ -0,0 +1,60 @@
+from lib.jpeg_stream import JpegStreamSplitter
+
+
+class ChunkedStream:
+    """Binary stream whose ``readinto`` returns at most *chunk* bytes, like a pipe."""
+
+    def __init__(self, data, chunk):
+        self.data = data
+        self.chunk = chunk
+        self.pos = 0
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self.chunk, len(self.data) - self.pos)
+        buffer[:count] = self.data[self.pos : self.pos + count]
+        self.pos += count
+        return count
+
+
+def _jpeg(index, size=50):
+    return b"\xff\xd8" + bytes([index % 200 + 1]) * size + b"\xff\xd9"
+
+
+def _split_all(splitter):
+    frames = []
+    while (batch := splitter.read_frames()) is not None:
+        frames.extend(bytes(frame) for frame in batch)
+    return frames
+
+
+def test_splits_frames_with_markers_across_every_read_boundary():
+    expected = [_jpeg(i, size=37 + i) for i in range(6)]
+    data = b"junk\xff" + b"".join(expected[:3]) + b"\x00\xff\x00" + b"".join(expected[3:]) + b"\xff\xd8partial"
+
+    for chunk in range(1, 40):
+        splitter = JpegStreamSplitter(ChunkedStream(data, chunk), read_size=4096, buffer_size=8192)
+        assert _split_all(splitter) == expected, chunk
+
+
+def test_reuses_buffer_and_grows_only_for_large_frames():
+    frames = [_jpeg(i, size=3000) for i in range(50)] + [_jpeg(99, size=20000)]
+    splitter = JpegStreamSplitter(ChunkedStream(b"".join(frames), 4096), read_size=4096, buffer_size=8192)
+    initial_buffer = splitter._buf
+
+    got = []
+    while (batch := splitter.read_frames()) is not None:
+        if len(got) < 50:
+            assert splitter._buf is initial_buffer
+        got.extend(bytes(frame) for frame in batch)
+
+    assert got == frames
+    assert len(splitter._buf) > len(initial_buffer)
+    assert splitter.frames == 51
+
+
+def test_drops_oversize_frames_and_resyncs():
+    data = b"\xff\xd8" + b"\x01" * 30000 + _jpeg(1)
+    splitter = JpegStreamSplitter(ChunkedStream(data, 4096), read_size=4096, buffer_size=8192, max_frame_size=16384)
+
+    assert _split_all(splitter) == [_jpeg(1)]
+    assert splitter.oversize_dropped == 1
@@ -0,0 +1,65 @@
+import json
+import os
+
+import lib.json_data_handler as json_data_handler
+from lib.json_data_handler import JSONDataHandler
+
+
+def _count_loads(monkeypatch):
+    calls = {"count": 0}
+    real_load = json.load
+
+    def counting_load(fp):
+        calls["count"] += 1
+        return real_load(fp)
+
+    monkeypatch.setattr(json_data_handler.json, "load", counting_load)
+    return calls
+
+
+def _age_file(path, seconds=5.0):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - int(seconds * 1e9)))
+
+
+def test_unchanged_file_is_parsed_once(monkeypatch, tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"imu": {"yaw": 1.0}}))
+    _age_file(data_file)
+    calls = _count_loads(monkeypatch)
+    handler = JSONDataHandler(file_path=data_file)
+
+    for _ in range(10):
+        assert handler.get_section("imu") == {"yaw": 1.0}
+
+    assert calls["count"] == 1
+
+
+def test_external_change_invalidates_cache_for_all_handlers(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"depth": {"current": 1}}))
+    _age_file(data_file, seconds=10.0)
+    first = JSONDataHandler(file_path=data_file)
+    second = JSONDataHandler(file_path=data_file)
+    assert first.get_section("depth") == {"current": 1}
+
+    data_file.write_text(json.dumps({"depth": {"current": 22}}))
+    _age_file(data_file)
+    assert second.get_section("depth") == {"current": 22}
+    assert first.get_section("depth") == {"current": 22}
+
+    second.update_data({"depth": {"current": 3}})
+    assert first.get_section("depth") == {"current": 3}
+
+
+def test_returned_sections_do_not_alias_the_cache(tmp_path):
+    handler = JSONDataHandler(file_path=tmp_path / "config.json")
+    handler.update_data({"imu_offset": {"x": 0.0}})
+
+    offset = handler.get_section("imu_offset")
+    offset["x"] = 99.0
+    data = handler.read_data()
+    data["extra"] = True
+
+    assert handler.get_section("imu_offset") == {"x": 0.0}
+    assert "extra" not in handler.read_data()
@@ -0,0 +1,24 @@
+from lib.latency_histogram import LatencyHistogram
+
+
+def test_empty_histogram_reports_no_percentiles():
+    snapshot = LatencyHistogram().snapshot()
+
+    assert snapshot["count"] == 0
+    assert snapshot["p50_us"] is None
+    assert snapshot["max_us"] is None
+
+
+def test_percentiles_fall_in_power_of_two_buckets():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(3_000)  # 3 us -> (2, 4] bucket
+    histogram.record(900_000)  # 900 us -> (512, 1024] bucket
+    histogram.record(5_000_000)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 100
+    assert snapshot["p50_us"] == 4.0
+    assert snapshot["p99_us"] == 1024.0
+    assert snapshot["max_us"] == 5000.0
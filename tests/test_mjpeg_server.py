@@ -0,0 +1,156 @@
+import socket
+import time
+
+from flask import Flask
+
+from lib.camera import multipart_chunk
+from lib.mjpeg_server import MjpegStreamServer
+from routes import register_routes
+
+
+class FakeCamera:
+    def __init__(self, latest=None):
+        self.latest = latest
+        self.listeners = []
+        self.viewers = 0
+
+    def get_latest_chunk(self):
+        return None if self.latest is None else multipart_chunk(self.latest)
+
+    def get_placeholder_chunk(self):
+        return multipart_chunk(b"placeholder")
+
+    def add_frame_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_frame_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def add_viewer(self):
+        self.viewers += 1
+
+    def remove_viewer(self):
+        self.viewers -= 1
+
+    def emit(self, jpg):
+        self.latest = jpg
+        for callback in list(self.listeners):
+            callback(multipart_chunk(jpg))
+
+
+def _start(cameras, **kwargs):
+    server = MjpegStreamServer(port=0, **kwargs)
+    for path, camera in cameras.items():
+        server.set_camera(path, camera)
+    server.start()
+    return server
+
+
+def _request(server, path):
+    sock = socket.create_connection(("127.0.0.1", server.port), timeout=2.0)
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    return sock
+
+
+def _read_until(sock, marker):
+    data = b""
+    while marker not in data:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_streams_placeholder_then_published_frames():
+    camera = FakeCamera()
+    server = _start({"/video_feed": camera})
+    try:
+        sock = _request(server, "/video_feed?ts=1")
+        head = _read_until(sock, b"placeholder\r\n")
+        assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert b"multipart/x-mixed-replace; boundary=frame" in head
+
+        assert _wait_for(lambda: camera.listeners and camera.viewers == 1)
+        camera.emit(b"jpeg-1")
+        assert b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 6\r\n\r\njpeg-1\r\n" in _read_until(
+            sock, b"jpeg-1\r\n"
+        )
+        sock.close()
+        assert _wait_for(lambda: server.get_stats()["clients"] == 0)
+        assert camera.viewers == 0
+    finally:
+        server.stop()
+    assert camera.listeners == []
+
+
+def test_slow_viewer_skips_frames_instead_of_queueing():
+    camera = FakeCamera(latest=b"x" * 1000)
+    server = _start({"/video_feed": camera})
+    try:
+        sock = _request(server, "/video_feed")
+        assert _wait_for(lambda: server.get_stats()["clients"] == 1)
+
+        # The viewer reads nothing while 40 large frames are published.
+        frame = b"y" * 1_000_000
+        for _ in range(40):
+            camera.emit(frame)
+        time.sleep(0.2)
+
+        sock.settimeout(0.5)
+        received = b""
+        try:
+            while True:
+                chunk = sock.recv(1 << 20)
+                if not chunk:
+                    break
+                received += chunk
+        except socket.timeout:
+            pass
+        assert received.count(b"--frame") < 20
+        assert server.get_stats()["feeds"]["/video_feed"]["frames_skipped"] > 20
+        sock.close()
+    finally:
+        server.stop()
+
+
+def test_rejects_unknown_paths_and_viewers_over_capacity():
+    camera = FakeCamera(latest=b"jpeg")
+    server = _start({"/video_feed": camera, "/ip_video_feed": None}, max_clients=1)
+    try:
+        missing = _request(server, "/nope")
+        assert _read_until(missing, b"\n\n").startswith(b"HTTP/1.1 404")
+        missing.close()
+
+        uninitialized = _request(server, "/ip_video_feed")
+        assert _read_until(uninitialized, b"\n\n").startswith(b"HTTP/1.1 503")
+        uninitialized.close()
+
+        viewer = _request(server, "/video_feed")
+        _read_until(viewer, b"jpeg\r\n")
+        extra = _request(server, "/video_feed")
+        assert _read_until(extra, b"\n\n").startswith(b"HTTP/1.1 503")
+        extra.close()
+        viewer.close()
+        assert server.get_stats()["rejected"] == 1
+    finally:
+        server.stop()
+
+
+def test_flask_feed_routes_redirect_to_stream_server():
+    app = Flask(__name__)
+    app.config["DEFAULT_CAMERA"] = FakeCamera()
+    app.config["MJPEG_SERVER"] = MjpegStreamServer(port=5123)
+    register_routes(app)
+
+    res = app.test_client().get("/video_feed?ts=7", base_url="http://10.0.0.2:5000")
+
+    assert res.status_code == 307
+    assert res.headers["Location"] == "http://10.0.0.2:5123/video_feed?ts=7"
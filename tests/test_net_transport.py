@@ -0,0 +1,247 @@
+import socket
+import sys
+import threading
+import time
+
+from lib.net_transport import UdpConfig, UdpListener, UdpReactor
+
+
+def _free_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+class Collector:
+    def __init__(self, expected):
+        self.expected = expected
+        self.packets = []
+        self.done = threading.Event()
+
+    def __call__(self, data, addr):
+        self.packets.append(bytes(data))
+        if len(self.packets) >= self.expected:
+            self.done.set()
+
+
+def _send(port, payloads):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for payload in payloads:
+            sock.sendto(payload, ("127.0.0.1", port))
+    finally:
+        sock.close()
+
+
+def test_reactor_dispatches_to_every_registered_listener():
+    reactor = UdpReactor()
+    reactor.start()
+    first, second = Collector(2), Collector(1)
+    listeners = [
+        UdpListener("first", UdpConfig(host="127.0.0.1", port=_free_port()), first, reactor=reactor),
+        UdpListener("second", UdpConfig(host="127.0.0.1", port=_free_port()), second, reactor=reactor),
+    ]
+    try:
+        for listener in listeners:
+            listener.start()
+        _send(listeners[0].config.port, [b"a", b"b"])
+        _send(listeners[1].config.port, [b"c"])
+
+        assert first.done.wait(timeout=1.0)
+        assert second.done.wait(timeout=1.0)
+        assert first.packets == [b"a", b"b"]
+        assert second.packets == [b"c"]
+    finally:
+        for listener in listeners:
+            listener.stop()
+        reactor.stop()
+
+
+def test_reactor_stops_without_waiting_for_socket_timeouts():
+    reactor = UdpReactor()
+    reactor.start()
+    listener = UdpListener("idle", UdpConfig(host="127.0.0.1", port=_free_port(), timeout=5.0), Collector(1), reactor)
+    listener.start()
+
+    started_at = time.monotonic()
+    listener.stop()
+    reactor.stop()
+
+    assert time.monotonic() - started_at < 0.5
+    assert reactor.is_running() is False
+
+
+def test_standalone_listener_still_runs_its_own_thread():
+    collector = Collector(1)
+    listener = UdpListener("standalone", UdpConfig(host="127.0.0.1", port=_free_port(), timeout=0.1), collector)
+    listener.start()
+    try:
+        _send(listener.config.port, [b"ping"])
+        assert collector.done.wait(timeout=1.0)
+        assert collector.packets == [b"ping"]
+    finally:
+        listener.stop()
+
+
+def test_recv_into_listener_drains_a_burst_with_memoryviews():
+    seen_types = set()
+    collector = Collector(50)
+
+    def handler(data, addr):
+        seen_types.add(type(data))
+        collector(data, addr)
+
+    cfg = UdpConfig(host="127.0.0.1", port=_free_port(), timeout=0.1, recv_into=True, so_rcvbuf=256 * 1024)
+    listener = UdpListener("burst", cfg, handler)
+    payloads = [f"packet-{i}".encode() for i in range(50)]
+    listener.start()
+    try:
+        _send(cfg.port, payloads)
+        assert collector.done.wait(timeout=1.0)
+    finally:
+        listener.stop()
+
+    assert collector.packets == payloads
+    assert seen_types == {memoryview}
+    stats = listener.get_stats()
+    assert stats["mode"] == "recv_into"
+    assert stats["datagrams"] == 50
+    assert stats["bytes"] == sum(len(p) for p in payloads)
+    assert stats["batches"] <= 50
+    assert stats["truncated"] == 0
+
+
+def test_recv_into_listener_on_reactor_counts_truncated_datagrams():
+    reactor = UdpReactor()
+    reactor.start()
+    collector = Collector(2)
+    cfg = UdpConfig(host="127.0.0.1", port=_free_port(), recv_buffer=8, recv_into=True)
+    listener = UdpListener("small", cfg, collector, reactor=reactor)
+    listener.start()
+    try:
+        _send(cfg.port, [b"short", b"much-longer-than-eight"])
+        assert collector.done.wait(timeout=1.0)
+        stats = listener.get_stats()
+    finally:
+        listener.stop()
+        reactor.stop()
+
+    assert collector.packets == [b"short", b"much-lon"]
+    assert stats["truncated"] == 1
+
+
+def test_listener_stats_report_socket_buffer_and_kernel_drops():
+    cfg = UdpConfig(host="127.0.0.1", port=_free_port(), so_rcvbuf=64 * 1024)
+    listener = UdpListener("stats", cfg, Collector(1))
+    try:
+        stats = listener.get_stats()
+    finally:
+        listener.stop()
+
+    assert stats["so_rcvbuf"] >= 64 * 1024 or stats["so_rcvbuf"] is None
+    if sys.platform.startswith("linux"):
+        assert stats["kernel_drops"] == 0
+
+
+def _blocked_listener(config, handled):
+    """Listener whose handler blocks on the first datagram until released."""
+    release = threading.Event()
+    first = threading.Event()
+
+    def handler(data, addr):
+        if not first.is_set():
+            first.set()
+            release.wait(timeout=2.0)
+        handled.append(bytes(data))
+
+    return UdpListener("queued", config, handler), first, release
+
+
+def test_queue_drop_oldest_keeps_newest_packets_while_handler_stalls():
+    handled = []
+    cfg = UdpConfig(host="127.0.0.1", port=_free_port(), timeout=0.1, recv_into=True, queue_size=3)
+    listener, first, release = _blocked_listener(cfg, handled)
+    listener.start()
+    try:
+        _send(cfg.port, [b"stall"])
+        assert first.wait(timeout=1.0)
+        _send(cfg.port, [f"p{i}".encode() for i in range(10)])
+        deadline = time.monotonic() + 1.0
+        while listener.get_stats()["datagrams"] < 11 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        deadline = time.monotonic() + 1.0
+        while len(handled) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = listener.get_stats()
+    finally:
+        listener.stop()
+
+    assert handled == [b"stall", b"p7", b"p8", b"p9"]
+    assert stats["queue"]["drops"] == 7
+    assert stats["queue"]["max_depth"] == 3
+    assert stats["handler_latency"]["count"] == 4
+
+
+def test_queue_coalesce_keeps_latest_datagram_per_stream():
+    handled = []
+    cfg = UdpConfig(host="127.0.0.1", port=_free_port(), timeout=0.1, queue_size=8, queue_policy="coalesce")
+    listener, first, release = _blocked_listener(cfg, handled)
+    listener.stream_key = lambda data, addr: bytes(data[:1])
+    listener.start()
+    try:
+        _send(cfg.port, [b"s"])
+        assert first.wait(timeout=1.0)
+        _send(cfg.port, [b"a1", b"b1", b"a2", b"a3", b"b2"])
+        deadline = time.monotonic() + 1.0
+        while listener.get_stats()["datagrams"] < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        deadline = time.monotonic() + 1.0
+        while len(handled) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = listener.get_stats()
+    finally:
+        listener.stop()
+
+    assert handled == [b"s", b"a3", b"b2"]
+    assert stats["queue"]["coalesced"] == 3
+    assert stats["queue"]["drops"] == 0
+
+
+def test_on_receive_runs_while_the_queued_handler_stalls():
+    received = []
+    handled = []
+    release = threading.Event()
+
+    def on_receive(data, addr, received_ns):
+        received.append((bytes(data), received_ns))
+        return None if data == b"skip" else bytes(data).upper()
+
+    def handler(item, addr):
+        release.wait(timeout=2.0)
+        handled.append(item)
+
+    cfg = UdpConfig(host="127.0.0.1", port=_free_port(), timeout=0.1, recv_into=True, queue_size=8)
+    listener = UdpListener("hook", cfg, handler, on_receive=on_receive)
+    listener.start()
+    try:
+        _send(cfg.port, [b"a", b"skip", b"b"])
+        deadline = time.monotonic() + 1.0
+        while len(received) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert handled == []  # the receive side did not wait for the handler
+        release.set()
+        deadline = time.monotonic() + 1.0
+        while len(handled) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = listener.get_stats()
+    finally:
+        listener.stop()
+
+    assert [data for data, _ns in received] == [b"a", b"skip", b"b"]
+    assert all(ns <= time.monotonic_ns() for _data, ns in received)
+    assert handled == [b"A", b"B"]
+    assert stats["receive_latency"]["count"] == 3
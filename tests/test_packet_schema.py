@@ -0,0 +1,89 @@
+import struct
+
+import pytest
+
+import lib.control_telemetry as control_telem
+import lib.resource_receiver as resource_telem
+from lib import axis_config_sender, crc, packet_schema, pid_config_client, setpoint_override
+from lib.packet_schema import PACKETS, Field, PacketSchema
+
+# Sizes documented by the firmware headers; any layout change must update both sides.
+FIRMWARE_SIZES = {
+    "bitmask": 16,
+    "pid_config": 77,
+    "axis_config": 30,
+    "setpoint_override": 30,
+    "system_reset": 12,
+    "resource_telemetry": 28,
+    "control_telemetry_v1": 86,
+    "control_telemetry_v2": 201,
+}
+
+
+def test_registry_matches_firmware_packet_sizes():
+    assert {name: schema.size for name, schema in PACKETS.items()} == FIRMWARE_SIZES
+
+
+def test_module_constants_agree_with_schemas():
+    assert pid_config_client.PACKET_SIZE == packet_schema.PID_CONFIG.size
+    assert resource_telem.TELEMETRY_SIZE == packet_schema.RESOURCE_TELEMETRY.size
+    assert control_telem.PACKET_SIZE == packet_schema.CONTROL_TELEMETRY_V2.size
+    assert list(control_telem.AXES) == list(packet_schema.AXES)
+    assert list(setpoint_override.AXES) == list(packet_schema.AXES)
+    v2_little_endian = packet_schema.CONTROL_TELEMETRY_V2.segment_formats[1]
+    assert v2_little_endian.startswith(control_telem.NEW_META_FORMAT)
+    v2_floats = [f for f in packet_schema.CONTROL_TELEMETRY_V2.fields if f.code == "f" and f.name != "manip_deg"]
+    assert sum(f.count for f in v2_floats) == control_telem.NEW_FLOAT_COUNT
+
+
+def test_axis_packet_matches_hand_packed_layout():
+    pkt = axis_config_sender.build_axis_packet(
+        {"yaw": "-roll", "pitch": "+pitch", "roll": "-yaw"}, {"x": "+y", "y": "-x", "z": "+z"}, {"x": 1.5, "y": -2.0}
+    )
+    body = struct.pack("<13Bx3f", 0x01, 2, 1, 1, 0, 0, 1, 1, 0, 0, 1, 2, 0, 1.5, -2.0, 0.0)
+    assert pkt == body + struct.pack("<I", crc.crc32_ieee(body))
+
+
+def test_setpoint_override_packet_matches_hand_packed_layout():
+    sent = []
+    client = setpoint_override.SetpointOverrideClient(host="127.0.0.1", port=9)
+    client.sender.send = sent.append
+    try:
+        client.send_override({"heave": 0.5, "yaw": -1.0}, replay_attempts=1)
+    finally:
+        client.close()
+
+    body = struct.pack("<BB6f", 0x01, 0b100100, 0.0, 0.0, 0.5, 0.0, 0.0, -1.0)
+    assert sent == [body + struct.pack("<I", crc.crc32_ieee(body))]
+
+
+def test_pid_packet_round_trips_and_rejects_bad_crc():
+    gains = {axis: {"kp": i + 0.5, "ki": i + 0.25, "kd": i + 0.125} for i, axis in enumerate(pid_config_client.AXES)}
+    packet = pid_config_client._build_packet(pid_config_client.PID_PKT_SET, gains)  # pylint: disable=protected-access
+
+    assert packet[:1] == b"\x01"
+    assert pid_config_client._parse_packet(packet) == gains  # pylint: disable=protected-access
+    corrupted = packet[:5] + bytes([packet[5] ^ 0xFF]) + packet[6:]
+    assert pid_config_client._parse_packet(corrupted) is None  # pylint: disable=protected-access
+
+
+def test_mixed_byte_order_schema_compiles_to_segments_and_accepts_memoryview():
+    schema = PacketSchema(
+        "test_mixed",
+        [Field("seq", "I", byteorder="network"), Field("values", "h", 2), Field("tag", "s", 2), Field("pad", "x")],
+        byteorder="little",
+        crc="big",
+    )
+    packet = schema.pack(0x01020304, -2, 3, b"ok")
+
+    assert schema.segment_formats == ["!I", "<2h2sx"]
+    assert packet[:4] == b"\x01\x02\x03\x04"
+    assert packet[4:8] == struct.pack("<2h", -2, 3)
+    assert schema.crc_ok(memoryview(packet))
+    assert schema.decode(memoryview(packet)) == {"seq": 0x01020304, "values": (-2, 3), "tag": b"ok"}
+    assert not schema.crc_ok(packet[:-1] + b"\x00")
+
+
+def test_registering_a_duplicate_name_fails():
+    with pytest.raises(ValueError):
+        packet_schema.register(PacketSchema("bitmask", [Field("x", "B")]))
@@ -0,0 +1,82 @@
+import threading
+
+from lib.periodic import PeriodicScheduler
+
+PERIOD_NS = 50_000_000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000_000
+        self.wakeups = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += int(seconds * 1e9)
+        self.wakeups.append(self.now)
+
+    def work(self, ns):
+        self.now += ns
+
+
+def test_deadlines_absorb_work_time():
+    clock = FakeClock()
+    scheduler = PeriodicScheduler(0.05, clock=clock, sleep=clock.sleep)
+    start = clock.now
+
+    for _ in range(10):
+        clock.work(15_000_000)
+        assert scheduler.wait_next()
+
+    assert clock.wakeups == [start + 15_000_000 + PERIOD_NS * (k + 1) for k in range(10)]
+    stats = scheduler.stats()
+    assert stats["ticks"] == 10
+    assert stats["achieved_period_ms"] == 50.0
+    assert stats["overruns"] == 0
+    assert stats["period_error"]["max_us"] == 0.0
+
+
+def test_overrun_runs_once_late_and_skips_missed_deadlines():
+    clock = FakeClock()
+    scheduler = PeriodicScheduler(0.05, clock=clock, sleep=clock.sleep)
+    scheduler.wait_next()
+    first = clock.now
+
+    clock.work(int(3.5 * PERIOD_NS))  # stall across three deadlines
+    assert scheduler.wait_next()
+    assert clock.now == first + int(3.5 * PERIOD_NS)  # no sleep: ran at once for the missed deadline
+    scheduler.wait_next()
+
+    assert clock.now == first + 4 * PERIOD_NS  # back on the grid, not a burst of catch-up ticks
+    stats = scheduler.stats()
+    assert stats["overruns"] == 2
+    assert stats["lateness"]["max_us"] == 25_000.0
+
+
+def test_zero_period_pauses_without_ticking():
+    clock = FakeClock()
+    scheduler = PeriodicScheduler(0.0, clock=clock, sleep=clock.sleep)
+
+    assert scheduler.wait_next() is False
+    assert scheduler.stats()["ticks"] == 0
+
+    scheduler.period = 0.05
+    assert scheduler.wait_next() is True
+
+
+def test_wake_event_ends_the_wait_and_keeps_the_deadline():
+    clock = FakeClock()
+    scheduler = PeriodicScheduler(0.05, clock=clock, sleep=clock.sleep)
+    scheduler.wait_next()
+    wake = threading.Event()
+    wake.set()
+
+    assert scheduler.wait_next(wake=wake) is False
+    assert scheduler.stats()["ticks"] == 1
+
+    wake.clear()
+    clock.work(PERIOD_NS)  # the pending deadline is now due
+    assert scheduler.wait_next(wake=wake) is True
+    assert scheduler.stats()["ticks"] == 2
@@ -1,6 +1,9 @@
+import time
+
 from flask import Flask
 
 import routes
+from lib.control_process import ControlProcessError
 from routes import register_routes
 
 
@@ -236,6 +239,58 @@ def test_killswitch_zeroes_pid_gains_and_blocks_debug_override_until_rearm(monke
     assert res.get_json()["state"]["killed"] is False
 
 
+def test_killswitch_sends_burst_and_reports_telemetry_confirmation(monkeypatch):
+    class BurstController(FakeController):
+        def emergency_stop(self):
+            return {"state": self.kill(), "burst": {"packets": 3}}
+
+    class FakeTelemetry:
+        def confirm_stopped(self, since):
+            self.since = since
+            return {"confirmed": True, "latency_ms": 42.0}
+
+    monkeypatch.setattr(routes, "send_pid_gains", lambda gains, timeout=1.0, max_retries=3: (gains, 1))
+    client, ctrl, _override = make_client(ctrl=BurstController())
+    telemetry = FakeTelemetry()
+    client.application.config["CONTROL_TELEM"] = telemetry
+
+    before = time.monotonic_ns()
+    data = client.post("/api/control/killswitch").get_json()
+
+    assert ctrl.killed is True
+    assert data["burst"] == {"packets": 3}
+    assert data["confirmation"] == {"confirmed": True, "latency_ms": 42.0}
+    assert before <= telemetry.since <= time.monotonic_ns()
+
+
+def test_killswitch_still_zeroes_mcu_when_control_process_is_unavailable(monkeypatch):
+    class HungController(FakeController):
+        def emergency_stop(self):
+            raise ControlProcessError("control process did not answer controller.emergency_stop")
+
+        def rearm(self):
+            raise ControlProcessError("control process is not running")
+
+    sent = []
+    monkeypatch.setattr(
+        routes, "send_pid_gains", lambda gains, timeout=1.0, max_retries=3: (sent.append(gains) or gains, 1)
+    )
+    client, _ctrl, override = make_client(ctrl=HungController())
+
+    res = client.post("/api/control/killswitch")
+    data = res.get_json()
+    assert res.status_code == 503
+    assert data["ok"] is False
+    assert "did not answer" in data["error"]
+    assert data["pid_gains_zeroed"] is True
+    assert sent == [{axis: {"kp": 0.0, "ki": 0.0, "kd": 0.0} for axis in routes.PID_AXES}]
+    assert override.clear_count == 1
+
+    res = client.post("/api/control/rearm")
+    assert res.status_code == 503
+    assert res.get_json() == {"ok": False, "error": "control process is not running"}
+
+
 def test_clear_pid_axis_clears_all_then_resends_remaining():
     ctrl = FakeController()
     ctrl.start_pid({"roll": 10.0, "pitch": 20.0, "yaw": 30.0})
@@ -1,10 +1,21 @@
+import socket
 import struct
+import threading
+import time
 
 import pytest
 
 import lib.control_telemetry as control_telem
 import lib.resource_receiver as resource_telem
-from lib import axis_config_sender, bitmask, crc, net_transport, pid_config_client, system_control_client
+from lib import (
+    axis_config_sender,
+    bitmask,
+    crc,
+    log_udp_receiver,
+    net_transport,
+    pid_config_client,
+    system_control_client,
+)
 from lib.json_data_handler import JSONDataHandler
 
 
@@ -202,3 +213,164 @@ def test_json_data_handler_creates_parent_and_preserves_sections(tmp_path):
 
     assert handler.get_section("imu") == {"yaw": 12.5}
     assert handler.get_section("resources") == {"cpu_percent": 4}
+
+
+def test_control_telemetry_history_ring_is_bounded_and_matches_latest(monkeypatch, tmp_path):
+    monkeypatch.setattr(control_telem, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(control_telem, "CONTROL_LOG", tmp_path / "control_telemetry.ndjson")
+    receiver = control_telem.ControlTelemetryReceiver(data_handler=DummyHandler(), history_capacity=4)
+    receiver.disable_capture()
+
+    for sequence in range(1, 7):
+        body = (
+            struct.pack("!III", sequence, sequence * 10, 5)
+            + struct.pack(control_telem.NEW_META_FORMAT, 0x04, 0, 0x3F, *([sequence] * 6), 10, -3)
+            + struct.pack("<" + "f" * control_telem.NEW_FLOAT_COUNT, *([sequence / 3] * control_telem.NEW_FLOAT_COUNT))
+            + struct.pack("<fH", 1.25, 1500)
+        )
+        packet = body + struct.pack("!I", crc.crc32_ieee(body))
+        receiver._handle_packet(packet, ("10.77.0.2", 5005))  # pylint: disable=protected-access
+
+    history = receiver.get_history(limit=100)
+    assert [entry["sequence"] for entry in history] == [3, 4, 5, 6]
+    assert history[-1] == receiver.get_latest()
+    assert receiver.get_history(limit=2) == history[-2:]
+    assert receiver.get_stats()["history"]["capacity"] == 4
+
+    legacy_body = struct.pack("!I", 7) + struct.pack("<18f", *([0.5] * 18)) + struct.pack("<fH", 2.0, 1600)
+    receiver._handle_packet(legacy_body + struct.pack("!I", crc.crc32_ieee(legacy_body)), ("10.77.0.2", 5005))  # pylint: disable=protected-access
+    assert receiver.get_history(limit=1) == [receiver.get_latest()]
+    assert receiver.get_latest()["measurement"] == {}
+
+
+def test_log_stream_get_since_returns_new_entries_with_ids(monkeypatch, tmp_path):
+    monkeypatch.setattr(log_udp_receiver, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(log_udp_receiver, "LOG_FILE", tmp_path / "zephyr.log")
+    receiver = log_udp_receiver.LogStreamReceiver(max_entries=3)
+
+    receiver._handle_packet(b"[I] one\n[W] two\n", ("10.77.0.2", 5006))  # pylint: disable=protected-access
+    first = receiver.get_since(None, limit=10)
+    assert [entry["message"] for entry in first["logs"]] == ["one", "two"]
+    assert [entry["id"] for entry in first["logs"]] == [0, 1]
+    assert (first["cursor"], first["missed"]) == (2, 0)
+
+    receiver._handle_packet(b"three\nfour\nfive\n", ("10.77.0.2", 5006))  # pylint: disable=protected-access
+    update = receiver.get_since(first["cursor"], limit=10)
+    assert [entry["message"] for entry in update["logs"]] == ["three", "four", "five"]
+    assert (update["cursor"], update["missed"]) == (5, 0)
+
+    assert receiver.get_since(update["cursor"])["logs"] == []
+    assert receiver.get_since(1, limit=2)["missed"] == 2
+
+
+def test_control_telemetry_history_since_cursor(monkeypatch, tmp_path):
+    monkeypatch.setattr(control_telem, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(control_telem, "CONTROL_LOG", tmp_path / "control_telemetry.ndjson")
+    receiver = control_telem.ControlTelemetryReceiver(data_handler=DummyHandler(), history_capacity=8)
+    receiver.disable_capture()
+
+    def send(sequence):
+        body = struct.pack("!I", sequence) + struct.pack("<18f", *([0.5] * 18)) + struct.pack("<fH", 2.0, 1600)
+        receiver._handle_packet(body + struct.pack("!I", crc.crc32_ieee(body)), ("10.77.0.2", 5005))  # pylint: disable=protected-access
+
+    for sequence in range(1, 4):
+        send(sequence)
+    first = receiver.get_history_since(None, limit=1)
+    assert [entry["sequence"] for entry in first["history"]] == [3]
+    assert first["cursor"] == 3
+
+    send(4)
+    send(5)
+    update = receiver.get_history_since(first["cursor"])
+    assert [entry["sequence"] for entry in update["history"]] == [4, 5]
+    assert (update["cursor"], update["missed"]) == (5, 0)
+
+
+def test_control_telemetry_confirms_kill_from_fresh_neutral_packet(monkeypatch, tmp_path):
+    monkeypatch.setattr(control_telem, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(control_telem, "CONTROL_LOG", tmp_path / "control_telemetry.ndjson")
+    receiver = control_telem.ControlTelemetryReceiver(data_handler=DummyHandler())
+    receiver.disable_capture()
+
+    def send(sequence, command_age_ms, pilot, output, received_ns=None):
+        body = (
+            struct.pack("!III", sequence, 1000, command_age_ms)
+            + struct.pack(control_telem.NEW_META_FORMAT, 0, 0, 0, *([pilot] * 6), 0, 0)
+            + struct.pack("<" + "f" * control_telem.NEW_FLOAT_COUNT, *([0.0] * 12 + [output] * 6 + [0.0] * 24))
+            + struct.pack("<fH", 0.0, 1500)
+        )
+        packet = body + struct.pack("!I", crc.crc32_ieee(body))
+        receiver._receive_packet(packet, ("10.77.0.2", 5005), received_ns or time.monotonic_ns())  # pylint: disable=protected-access
+
+    send(1, 0, 0, 0.0)  # neutral, but before the kill
+    since = time.monotonic_ns()
+    send(2, 0, 0, 0.0, received_ns=since - 5_000_000)  # received before the kill, processed after it
+    assert receiver.confirm_stopped(since, timeout=0.05)["confirmed"] is False
+
+    send(3, 0, 50, 0.4)  # still driving
+    send(4, 60_000, 0, 0.0)  # neutral only because the link timed out long ago
+    send(5, 0, 0, 0.0, received_ns=since + 40_000_000)
+    result = receiver.confirm_stopped(since, timeout=0.05)
+
+    assert result["confirmed"] is True
+    assert result["sequence"] == 5
+    assert result["latency_ms"] == 40.0
+    assert result["last_command_age_ms"] == 0
+    stats = receiver.get_stats()["kill_confirmation"]
+    assert (stats["confirmed"], stats["unconfirmed"]) == (1, 1)
+    assert stats["latency"]["count"] == 1
+
+
+def test_receivers_publish_latest_state_while_persistence_stalls(monkeypatch, tmp_path):
+    monkeypatch.setattr(control_telem, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(control_telem, "CONTROL_LOG", tmp_path / "control_telemetry.ndjson")
+    monkeypatch.setattr(resource_telem, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(resource_telem, "RESOURCE_LOG", tmp_path / "resource_monitor.ndjson")
+    release = threading.Event()
+
+    class StalledHandler(DummyHandler):
+        def update_data(self, payload):
+            release.wait(timeout=5.0)  # a disk stall
+            super().update_data(payload)
+
+    def free_port():
+        probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        return port
+
+    reactor = net_transport.init_udp_reactor()
+    control_handler = StalledHandler()
+    control = control_telem.ControlTelemetryReceiver(
+        host="127.0.0.1", port=free_port(), data_handler=control_handler, reactor=reactor
+    )
+    control.disable_capture()
+    resource = resource_telem.ResourceReceiver(
+        host="127.0.0.1", port=free_port(), data_handler=StalledHandler(), reactor=reactor
+    )
+    control.start()
+    resource.start()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for sequence in (1, 2):
+            body = struct.pack(">IIBBHHBBII", sequence, 0, 0, 0, 0, 0, 0, 0, 40 + sequence, 0)
+            sender.sendto(body + struct.pack(">I", crc.crc32_ieee(body)), ("127.0.0.1", resource.port))
+            body = struct.pack("!I", sequence) + struct.pack("<18f", *([0.5] * 18)) + struct.pack("<fH", 2.0, 1600)
+            sender.sendto(body + struct.pack("!I", crc.crc32_ieee(body)), ("127.0.0.1", control.port))
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline and (
+            control.get_latest().get("sequence") != 2 or resource.get_udp_counters() != (42, 0)
+        ):
+            time.sleep(0.01)
+
+        assert control.get_latest()["sequence"] == 2
+        assert [entry["sequence"] for entry in control.get_history()] == [1, 2]
+        assert resource.get_udp_counters() == (42, 0)
+        assert control_handler.last_update is None  # still stuck behind the stall
+    finally:
+        release.set()
+        sender.close()
+        control.stop()
+        resource.stop()
+        reactor.stop()
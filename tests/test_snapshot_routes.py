@@ -0,0 +1,86 @@
+from flask import Flask
+
+from lib.aruco_logger import ArucoPipelineLogger
+from lib.json_data_handler import JSONDataHandler
+from lib.telemetry_store import TelemetryStore
+from routes import register_routes
+
+
+def _client(tmp_path):
+    store = TelemetryStore(backing=JSONDataHandler(file_path=tmp_path / "data.json"))
+    logger = ArucoPipelineLogger()
+    app = Flask(__name__)
+    app.config["TELEMETRY_STORE"] = store
+    app.config["ARUCO_LOGGER"] = logger
+    register_routes(app)
+    return app.test_client(), store, logger
+
+
+def test_snapshot_returns_versioned_sections_and_304_when_unchanged(tmp_path):
+    client, store, _logger = _client(tmp_path)
+    store.update_data({"imu": {"yaw": 1.0}})
+
+    res = client.get("/api/snapshot?sections=imu,aruco")
+    assert res.status_code == 200
+    sections = res.get_json()["sections"]
+    assert sections["imu"] == {"version": 1, "data": {"yaw": 1.0}}
+    assert sections["aruco"]["version"] == 0
+    assert sections["aruco"]["data"]["entries"] == []
+    etag = res.headers["ETag"]
+
+    res = client.get("/api/snapshot?sections=imu,aruco", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+
+
+def test_snapshot_sends_only_changed_sections(tmp_path):
+    client, store, logger = _client(tmp_path)
+    store.update_data({"imu": {"yaw": 1.0}})
+    etag = client.get("/api/snapshot?sections=imu,aruco").headers["ETag"]
+
+    logger.start()
+    res = client.get("/api/snapshot?sections=imu,aruco", headers={"If-None-Match": etag})
+
+    assert res.status_code == 200
+    sections = res.get_json()["sections"]
+    assert sections["imu"] == {"version": 1, "unchanged": True}
+    assert sections["aruco"]["version"] == 1
+    assert sections["aruco"]["data"]["enabled"] is True
+    assert res.headers["ETag"] != etag
+
+
+def test_snapshot_always_rebuilds_unversioned_sections(tmp_path):
+    client, _store, _logger = _client(tmp_path)
+    etag = client.get("/api/snapshot?sections=imu,uplink").headers["ETag"]
+
+    res = client.get("/api/snapshot?sections=imu,uplink", headers={"If-None-Match": etag})
+
+    assert res.status_code == 200
+    sections = res.get_json()["sections"]
+    assert sections["imu"]["unchanged"] is True
+    assert sections["uplink"] == {"version": None, "data": {}}
+
+
+def test_pid_page_snapshot_request_can_return_304(tmp_path):
+    class FakeController:
+        def get_state_version(self):
+            return 7
+
+        def get_control_state(self):
+            return {"killed": False}
+
+    client, _store, _logger = _client(tmp_path)
+    client.application.config["CONTROLLER"] = FakeController()
+    url = "/api/snapshot?sections=control_state,udp"  # static/js/pid_tuning.js SNAPSHOT_URL
+    etag = client.get(url).headers["ETag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_snapshot_rejects_unknown_sections(tmp_path):
+    client, _store, _logger = _client(tmp_path)
+
+    res = client.get("/api/snapshot?sections=imu,bogus")
+
+    assert res.status_code == 400
+    assert res.get_json()["ok"] is False
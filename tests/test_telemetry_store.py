@@ -0,0 +1,80 @@
+import json
+
+from flask import Flask
+
+from lib.json_data_handler import JSONDataHandler
+from lib.telemetry_store import TelemetryStore
+from routes import register_routes
+
+
+class CountingHandler(JSONDataHandler):
+    def __init__(self, file_path):
+        super().__init__(file_path=file_path)
+        self.writes = 0
+
+    def update_data(self, new_data):
+        self.writes += 1
+        return super().update_data(new_data)
+
+
+def test_updates_stay_in_memory_until_flush(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"battery": {"level": 80}}))
+    backing = CountingHandler(data_file)
+    store = TelemetryStore(backing=backing)
+
+    for idx in range(1000):
+        store.update_data({"imu": {"yaw": float(idx)}})
+
+    assert store.get_section("imu") == {"yaw": 999.0}
+    assert store.get_section("battery") == {"level": 80}
+    assert store.get_version("imu") == 1000
+    assert backing.writes == 0
+
+    assert store.flush() is True
+    assert backing.writes == 1
+    assert json.loads(data_file.read_text()) == {"battery": {"level": 80}, "imu": {"yaw": 999.0}}
+    assert store.flush() is False
+    assert backing.writes == 1
+
+
+def test_stop_flushes_pending_sections(tmp_path):
+    backing = CountingHandler(tmp_path / "data.json")
+    store = TelemetryStore(backing=backing, flush_interval=60.0)
+    store.start()
+    store.update_data({"resources": {"cpu_percent": 4}})
+    store.stop()
+
+    assert backing.get_section("resources") == {"cpu_percent": 4}
+    assert store.get_stats()["dirty_sections"] == []
+
+
+def test_failed_write_keeps_sections_dirty_for_retry(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    backing = CountingHandler(blocker / "data.json")  # parent is a file, so the write fails
+    store = TelemetryStore(backing=backing)
+    store.update_data({"imu": {"yaw": 1.0}})
+
+    assert store.flush() is False
+    stats = store.get_stats()
+    assert stats["flush_errors"] == 1
+    assert stats["flushes"] == 0
+    assert stats["dirty_sections"] == ["imu"]
+
+    blocker.unlink()
+    assert store.flush() is True
+    assert backing.get_section("imu") == {"yaw": 1.0}
+    assert store.get_stats()["dirty_sections"] == []
+
+
+def test_sensor_routes_read_from_store(tmp_path):
+    store = TelemetryStore(backing=JSONDataHandler(file_path=tmp_path / "data.json"))
+    store.update_data({"imu": {"yaw": 1.5}, "resources": {"cpu_percent": 7}})
+    app = Flask(__name__)
+    app.config["TELEMETRY_STORE"] = store
+    register_routes(app)
+    client = app.test_client()
+
+    assert client.get("/api/sensors").get_json() == {"yaw": 1.5}
+    assert client.get("/api/resources").get_json() == {"cpu_percent": 7}
@@ -0,0 +1,133 @@
+import http.client
+import threading
+import time
+
+from flask import Flask, Response, request
+
+from lib.wsgi_server import PooledWSGIServer
+
+
+def _build_app():
+    app = Flask(__name__)
+
+    @app.route("/ping")
+    def ping():
+        return "pong"
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return request.get_data()
+
+    @app.route("/ignore", methods=["POST"])
+    def ignore():
+        return "ignored"
+
+    @app.route("/stream")
+    def stream():
+        def events():
+            while True:
+                yield "data: tick\n\n"
+                time.sleep(0.05)
+
+        return Response(events(), mimetype="text/event-stream")
+
+    return app
+
+
+def _start_server(**kwargs):
+    server = PooledWSGIServer("127.0.0.1", 0, _build_app(), **kwargs)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    return server
+
+
+def _open_stream(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2.0)
+    conn.request("GET", "/stream")
+    return conn, conn.getresponse()
+
+
+def test_keep_alive_serves_several_requests_per_connection():
+    server = _start_server(request_workers=2, stream_workers=1)
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=2.0)
+        conn.request("GET", "/ping")
+        res = conn.getresponse()
+        assert res.getheader("Connection") is None
+        assert res.read() == b"pong"
+        sock = conn.sock
+
+        conn.request("POST", "/echo", body=b"hello")
+        assert conn.getresponse().read() == b"hello"
+        # An unread request body is discarded rather than parsed as the next request.
+        conn.request("POST", "/ignore", body=b"x" * 1000)
+        assert conn.getresponse().read() == b"ignored"
+        conn.request("GET", "/ping")
+        assert conn.getresponse().read() == b"pong"
+        assert conn.sock is sock
+        conn.close()
+    finally:
+        server.shutdown()
+
+
+def test_idle_keep_alive_connections_do_not_hold_workers():
+    server = _start_server(request_workers=1, stream_workers=1)
+    try:
+        conns = [http.client.HTTPConnection("127.0.0.1", server.port, timeout=2.0) for _ in range(6)]
+        for _ in range(2):
+            for conn in conns:
+                conn.request("GET", "/ping")
+                assert conn.getresponse().read() == b"pong"
+        deadline = time.monotonic() + 2.0
+        while server.get_stats()["idle_connections"] < 6 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert server.get_stats()["idle_connections"] == 6
+        for conn in conns:
+            conn.close()
+    finally:
+        server.shutdown()
+
+
+def test_streams_beyond_capacity_are_refused_without_blocking_requests():
+    server = _start_server(request_workers=2, stream_workers=1)
+    try:
+        conn, res = _open_stream(server.port)
+        assert res.status == 200
+        assert res.readline() == b"data: tick\n"
+
+        rejected_conn, rejected = _open_stream(server.port)
+        assert rejected.status == 503
+        rejected.close()
+        rejected_conn.close()
+
+        ping = http.client.HTTPConnection("127.0.0.1", server.port, timeout=2.0)
+        ping.request("GET", "/ping")
+        assert ping.getresponse().read() == b"pong"
+        ping.close()
+
+        res.close()
+        conn.close()
+        deadline = time.monotonic() + 2.0
+        while server.get_stats()["streams"]["active"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert server.get_stats()["streams"] == {"active": 0, "max": 1, "rejected": 1}
+    finally:
+        server.shutdown()
+
+
+def test_idle_keep_alive_connections_are_closed():
+    server = _start_server(request_workers=1, stream_workers=1, keepalive_timeout=0.2)
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=2.0)
+        conn.request("GET", "/ping")
+        assert conn.getresponse().read() == b"pong"
+        time.sleep(0.5)
+        assert server.get_stats()["idle_connections"] == 0
+
+        other = http.client.HTTPConnection("127.0.0.1", server.port, timeout=1.0)
+        other.request("GET", "/ping")
+        assert other.getresponse().read() == b"pong"
+        other.close()
+        conn.close()
+    finally:
+        server.shutdown()
@@ -0,0 +1,157 @@
+"""Benchmark the ArUco detector profiles: detections per second and recall.
+
+Every profile in ``lib.camera.ARUCO_PROFILES`` runs over the same frame
+sequence in order (ROI tracking depends on the previous frames). Recall is
+measured against the "accurate" profile, i.e. the original full-resolution
+path, and against ground truth when the frames are synthetic.
+
+Without --video/--frames a synthetic 960x540 sequence is rendered: four
+moving, rotating and tilted DICT_4X4_50 markers (48-140 px) under a blue-green
+tint, blur, low contrast and sensor noise, with a fifth marker entering
+half-way through.
+
+    python tools/bench_aruco.py [--video recording.mp4 | --frames 'frames/*.jpg'] [--limit 600]
+"""
+
+import argparse
+import glob
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from lib.camera import ARUCO_PROFILES, ArUcoMarkerDetector  # noqa: E402
+
+WIDTH, HEIGHT = 960, 540
+
+
+def _marker_image(dictionary, marker_id, size):
+    marker = cv2.aruco.generateImageMarker(dictionary, marker_id, size)
+    border = size // 8
+    return cv2.copyMakeBorder(marker, border, border, border, border, cv2.BORDER_CONSTANT, value=255)
+
+
+def synthetic_frames(count, seed=0):
+    """Yield ``(bgr_frame, visible_ids)`` for a synthetic underwater-looking sequence."""
+    rng = np.random.default_rng(seed)
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_50)
+    gradient = np.linspace(0.0, 1.0, HEIGHT, dtype=np.float32)[:, None]
+    background = np.empty((HEIGHT, WIDTH, 3), dtype=np.float32)
+    background[..., 0] = 110 + 40 * gradient
+    background[..., 1] = 90 + 30 * gradient
+    background[..., 2] = 40 + 10 * gradient
+    markers = []
+    for marker_id, size, start in ((0, 48, 0), (1, 72, 0), (2, 100, 0), (3, 140, 0), (4, 80, count // 2)):
+        markers.append(
+            {
+                "id": marker_id,
+                "image": _marker_image(dictionary, marker_id, size).astype(np.float32),
+                "pos": rng.uniform((60, 60), (WIDTH - 260, HEIGHT - 260)),
+                "vel": rng.uniform(-3.0, 3.0, 2),
+                "angle": rng.uniform(0, 360),
+                "spin": rng.uniform(-1.5, 1.5),
+                "start": start,
+            }
+        )
+    for index in range(count):
+        canvas = background.copy()
+        visible = []
+        for marker in markers:
+            if index < marker["start"]:
+                continue
+            image = marker["image"]
+            side = image.shape[0]
+            marker["pos"] += marker["vel"]
+            for axis, limit in ((0, WIDTH - side * 1.6), (1, HEIGHT - side * 1.6)):
+                if not 10 < marker["pos"][axis] < limit:
+                    marker["vel"][axis] *= -1
+                    marker["pos"][axis] = np.clip(marker["pos"][axis], 11, limit - 1)
+            marker["angle"] += marker["spin"]
+            src = np.float32([[0, 0], [side, 0], [side, side], [0, side]])
+            center = marker["pos"] + side * 0.8
+            rotation = cv2.getRotationMatrix2D((0, 0), marker["angle"], 1.0)[:, :2]
+            tilt = np.float32([[0, 0], [0, 0], [side * 0.08, -side * 0.05], [-side * 0.06, 0]])
+            dst = (src - side / 2) @ rotation.T + center + tilt
+            homography = cv2.getPerspectiveTransform(src, np.float32(dst))
+            warped = cv2.warpPerspective(image, homography, (WIDTH, HEIGHT), flags=cv2.INTER_LINEAR)
+            mask = cv2.warpPerspective(np.ones_like(image), homography, (WIDTH, HEIGHT))
+            for channel in range(3):
+                canvas[..., channel] = canvas[..., channel] * (1 - mask) + warped * mask
+            visible.append(marker["id"])
+        tint = np.float32((1.0, 0.85, 0.55))
+        frame = cv2.GaussianBlur(canvas * 0.6 * tint + 30, (5, 5), 0)
+        frame += rng.normal(0.0, 8.0, frame.shape).astype(np.float32)
+        yield np.clip(frame, 0, 255).astype(np.uint8), sorted(visible)
+
+
+def recorded_frames(video=None, pattern=None, limit=None):
+    if video:
+        cap = cv2.VideoCapture(video)
+        while limit is None or limit > 0:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield frame, None
+            limit = None if limit is None else limit - 1
+        cap.release()
+        return
+    for path in sorted(glob.glob(pattern))[:limit]:
+        frame = cv2.imread(path)
+        if frame is not None:
+            yield frame, None
+
+
+def _run(profile, frames):
+    detector = ArUcoMarkerDetector(profile=profile)
+    found = []
+    started = time.perf_counter()
+    for frame, _truth in frames:
+        _corners, ids, _rejected = detector.detect_markers(frame)
+        found.append(set() if ids is None else {int(i) for i in ids.flatten()})
+    return found, time.perf_counter() - started
+
+
+def _recall(found, reference):
+    expected = sum(len(ids) for ids in reference)
+    hits = sum(len(got & ids) for got, ids in zip(found, reference, strict=True))
+    return hits / expected if expected else float("nan")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", help="recorded video file")
+    source.add_argument("--frames", help="glob of recorded frame images")
+    parser.add_argument("--limit", type=int, default=600, help="maximum number of frames")
+    args = parser.parse_args()
+
+    if args.video or args.frames:
+        frames = list(recorded_frames(args.video, args.frames, args.limit))
+        label = args.video or args.frames
+    else:
+        frames = list(synthetic_frames(args.limit))
+        label = f"synthetic {WIDTH}x{HEIGHT}"
+    if not frames:
+        raise SystemExit("no frames to benchmark")
+    truth = [set(ids) for _frame, ids in frames] if frames[0][1] is not None else None
+
+    results = {profile: _run(profile, frames) for profile in ARUCO_PROFILES}
+    reference = results["accurate"][0]
+    print(f"{label}: {len(frames)} frames")
+    print(f"{'profile':10} {'frames/s':>9} {'markers/s':>10} {'recall vs accurate':>19} {'recall vs truth':>16}")
+    for profile, (found, elapsed) in results.items():
+        markers = sum(len(ids) for ids in found)
+        truth_recall = f"{_recall(found, truth):16.3f}" if truth else f"{'--':>16}"
+        print(
+            f"{profile:10} {len(frames) / elapsed:9.1f} {markers / elapsed:10.1f} "
+            f"{_recall(found, reference):19.3f} {truth_recall}"
+        )
+
+
+if __name__ == "__main__":
+    main()
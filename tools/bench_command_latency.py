@@ -0,0 +1,120 @@
+"""Measure command-to-wire latency of the bitmask uplink, periodic vs send-on-change.
+
+A simulated operator moves the stick at random times (exponential gaps,
+mean --event-ms). A 60 Hz poll loop, like Controller.update, applies the
+latest stick value with set_from_axes. A receiver thread timestamps every
+packet, and each change is matched to the first packet carrying it:
+
+* set-to-wire:   set_from_axes() -> packet received (what send_on_change fixes)
+* stick-to-wire: stick moved -> packet received (adds the 16 ms poll)
+
+Changes overwritten by a newer one before any packet carried them count as
+superseded.
+
+    python tools/bench_command_latency.py [--seconds 20] [--event-ms 60] [--min-gap-ms 10]
+"""
+
+import argparse
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+
+from lib.bitmask import Command, encode_payload, init_bitmask  # noqa: E402
+from lib.packet_schema import BITMASK  # noqa: E402
+from lib.periodic import PeriodicScheduler  # noqa: E402
+
+POLL_HZ = 60.0
+
+
+def receive(sock, arrivals, stop):
+    while not stop.is_set():
+        try:
+            data, _addr = sock.recvfrom(64)
+        except socket.timeout:
+            continue
+        arrivals.append((time.monotonic_ns(), BITMASK.unpack(data)[1]))
+
+
+def run(send_on_change, args):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.2)
+    arrivals = []
+    stop = threading.Event()
+    receiver = threading.Thread(target=receive, args=(sock, arrivals, stop), daemon=True)
+    receiver.start()
+    bitmask = init_bitmask(
+        rate_hz=20.0,
+        host="127.0.0.1",
+        port=sock.getsockname()[1],
+        send_on_change=send_on_change,
+        min_send_gap=args.min_gap_ms / 1000.0,
+    )
+
+    rng = random.Random(1)
+    changes = []  # (stick moved ns, set_from_axes ns, payload)
+    stick_value, stick_at = 0, None
+    next_event = time.monotonic_ns() + int(rng.expovariate(1000.0 / args.event_ms) * 1e9)
+    poll = PeriodicScheduler(1.0 / POLL_HZ)
+    end = time.monotonic_ns() + int(args.seconds * 1e9)
+    applied = 0
+    while time.monotonic_ns() < end:
+        now = time.monotonic_ns()
+        while next_event <= now:
+            stick_value = (stick_value + 1) % 200 - 100  # always a new value
+            stick_at = next_event
+            next_event += int(rng.expovariate(1000.0 / args.event_ms) * 1e9)
+        if stick_value != applied:
+            applied = stick_value
+            set_at = time.monotonic_ns()
+            bitmask.set_from_axes(surge=stick_value / 127.0)
+            changes.append((stick_at, set_at, encode_payload(Command(surge=stick_value))))
+        poll.wait_next()
+
+    time.sleep(0.2)
+    stop.set()
+    receiver.join()
+    bitmask.stop()
+    sock.close()
+
+    set_latency, stick_latency, superseded = [], [], 0
+    index = 0
+    for number, (stick_at, set_at, payload) in enumerate(changes):
+        next_set = changes[number + 1][1] if number + 1 < len(changes) else float("inf")
+        while index < len(arrivals) and arrivals[index][0] < set_at:
+            index += 1
+        match = next((t for t, p in arrivals[index:] if p == payload and t < next_set + 1_000_000), None)
+        if match is None:
+            superseded += 1
+            continue
+        set_latency.append((match - set_at) / 1e6)
+        stick_latency.append((match - stick_at) / 1e6)
+
+    label = f"on-change (gap {args.min_gap_ms:g} ms)" if send_on_change else "periodic 20 Hz"
+    packets_per_s = len(arrivals) / args.seconds
+    print(f"{label}: {len(changes)} changes, {superseded} superseded, {packets_per_s:.1f} packets/s")
+    for name, values in (("set-to-wire", set_latency), ("stick-to-wire", stick_latency)):
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        print(f"  {name:14s} p50 {p50:6.2f} ms  p90 {p90:6.2f} ms  p99 {p99:6.2f} ms  max {max(values):6.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--event-ms", type=float, default=60.0, help="mean gap between stick movements")
+    parser.add_argument("--min-gap-ms", type=float, default=10.0, help="send_on_change rate cap")
+    args = parser.parse_args()
+    for send_on_change in (False, True):
+        run(send_on_change, args)
+
+
+if __name__ == "__main__":
+    main()
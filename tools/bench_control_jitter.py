@@ -0,0 +1,136 @@
+"""Measure bitmask uplink tick jitter under synthetic camera load.
+
+Runs the controller and the 20 Hz bitmask sender either in this process
+(the default app layout) or through lib.control_process, while camera-like
+threads in this process encode JPEGs and do per-frame Python work. Packets
+are sent to a receiver in a separate process, which timestamps the first
+copy of each sequence number (watchdog resends are ignored);
+jitter is the deviation of each inter-arrival gap from the nominal period.
+
+    python tools/bench_control_jitter.py [--seconds 20] [--cameras 3] [--fps 30] [--cpu 0]
+"""
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from lib.packet_schema import BITMASK  # noqa: E402
+
+RATE_HZ = 20.0
+
+
+def receive(port, seconds):
+    from lib.control_process import apply_process_priority
+
+    # The receiver must not be the one falling behind the load.
+    apply_process_priority(high_priority=True)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", port))
+    sock.settimeout(1.0)
+    print("ready", flush=True)
+    arrivals = []
+    seen = set()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        try:
+            data, _addr = sock.recvfrom(64)
+        except socket.timeout:
+            continue
+        seq, _payload = BITMASK.unpack(data)
+        if seq not in seen:  # watchdog resends repeat the last sequence number
+            seen.add(seq)
+            arrivals.append(time.perf_counter())
+    print(json.dumps(arrivals), flush=True)
+
+
+def camera_load(stop, fps):
+    """One camera's worth of work: JPEG encode plus GIL-holding per-frame Python code."""
+    rng = np.random.default_rng()
+    frame = cv2.resize(rng.integers(0, 256, (135, 240, 3), dtype=np.uint8), (960, 540))
+    interval = 1.0 / fps
+    while not stop.is_set():
+        started = time.perf_counter()
+        cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
+        checksum = 0
+        for value in range(40000):  # stands in for chunk building, listeners, status dicts
+            checksum += value
+        remaining = interval - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+def start_control(mode, port, cpu):
+    if mode == "process":
+        from lib.control_process import init_control_process
+
+        process = init_control_process(rate_hz=RATE_HZ, host="127.0.0.1", port=port, cpu=cpu, high_priority=True)
+        return process.stop
+    from lib.bitmask import init_bitmask
+    from lib.controller import Controller
+
+    bitmask = init_bitmask(rate_hz=RATE_HZ, host="127.0.0.1", port=port)
+    controller = Controller(bitmask_client=bitmask, rate_hz=60.0)
+    controller.start()
+
+    def stop():
+        controller.stop()
+        bitmask.stop()
+
+    return stop
+
+
+def run(mode, args, port):
+    receiver = subprocess.Popen(
+        [sys.executable, __file__, "--receive", str(port), "--seconds", str(args.seconds)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    receiver.stdout.readline()
+    stop_control = start_control(mode, port, args.cpu)
+    stop_load = threading.Event()
+    loads = [threading.Thread(target=camera_load, args=(stop_load, args.fps), daemon=True) for _ in range(args.cameras)]
+    for thread in loads:
+        thread.start()
+    arrivals = json.loads(receiver.stdout.readline())
+    receiver.wait()
+    stop_load.set()
+    stop_control()
+
+    gaps = np.diff(np.asarray(arrivals[5:])) * 1000.0  # skip start-up
+    jitter = np.abs(gaps - 1000.0 / RATE_HZ)
+    p50, p99 = np.percentile(jitter, [50, 99])
+    print(
+        f"{mode:10s} {len(gaps):4d} ticks  jitter p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  max {jitter.max():6.2f} ms  "
+        f"mean period {gaps.mean():6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--cameras", type=int, default=3, help="synthetic camera threads")
+    parser.add_argument("--fps", type=float, default=30.0, help="frames per second per camera")
+    parser.add_argument("--cpu", type=int, default=None, help="pin the control process to this CPU")
+    parser.add_argument("--receive", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.receive:
+        receive(args.receive, args.seconds)
+        return
+
+    for index, mode in enumerate(("in-process", "process")):
+        run(mode, args, 47000 + index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Microbenchmark lib.crc against the previous pure-Python table loop.
+
+Covers the two hot packet shapes: the 12-byte bitmask uplink header
+(``bitmask.build_packet``) and the v2 control telemetry body checked by
+``ControlTelemetryReceiver``. Also times the batch API on a replay-sized block.
+
+    python tools/bench_crc.py [--iterations 20000] [--batch 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+
+from lib.control_telemetry import NEW_PACKET_SIZE  # noqa: E402
+from lib.crc import _ensure_table, crc32_batch, crc32_ieee  # noqa: E402
+
+
+def _table_crc32(data, table=_ensure_table()):
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc ^ 0xFFFFFFFF
+
+
+def _time_per_call(func, payload, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(payload)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=10000, help="packets per batch run")
+    args = parser.parse_args()
+
+    shapes = {
+        "uplink header (12 B)": os.urandom(12),
+        f"v2 telemetry body ({NEW_PACKET_SIZE - 4} B)": os.urandom(NEW_PACKET_SIZE - 4),
+    }
+    for label, payload in shapes.items():
+        assert _table_crc32(payload) == crc32_ieee(payload)
+        before = _time_per_call(_table_crc32, payload, args.iterations)
+        after = _time_per_call(crc32_ieee, payload, args.iterations)
+        print(f"{label:28s} table loop {before:8.2f} us   zlib {after:6.2f} us   speedup {before / after:6.1f}x")
+
+    for width in (12, NEW_PACKET_SIZE - 4):
+        rows = np.random.default_rng(0).integers(0, 256, size=(args.batch, width), dtype=np.uint8)
+        buffers = [row.tobytes() for row in rows]
+        for label, packets in (("buffers", buffers), ("numpy rows", rows)):
+            start = time.perf_counter()
+            crc32_batch(packets)
+            elapsed = time.perf_counter() - start
+            per_packet = elapsed / args.batch * 1e6
+            print(
+                f"batch of {label:18s} {args.batch} x {width:3d} B in {elapsed * 1e3:7.2f} ms ({per_packet:.2f} us/packet)"
+            )
+
+
+if __name__ == "__main__":
+    main()
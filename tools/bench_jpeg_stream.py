@@ -0,0 +1,154 @@
+"""Benchmark lib.jpeg_stream against the previous find/slice/delete loop.
+
+Feeds a concatenated JPEG stream (what ``gst-launch-1.0 ... ! jpegenc !
+fdsink`` writes) through a pipe in 64 KiB writes, the way the gst-launch
+backend receives it, and measures the reader thread's CPU time per frame:
+once as fast as the pipe allows and once paced at --fps.
+
+Without --input, 1920x1080 frames are synthesized and JPEG-encoded at
+quality 85. Record real output with e.g.
+``gst-launch-1.0 ... ! jpegenc ! filesink location=rpi.mjpeg``.
+
+    python tools/bench_jpeg_stream.py [--input rpi.mjpeg] [--frames 120] [--fps 60] [--seconds 5]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from lib.jpeg_stream import JpegStreamSplitter  # noqa: E402
+
+WRITE_SIZE = 64 * 1024
+
+
+def synthetic_stream(count):
+    rng = np.random.default_rng(0)
+    base = cv2.resize(rng.integers(0, 256, (135, 240, 3), dtype=np.uint8), (1920, 1080))
+    frames = []
+    for index in range(count):
+        frame = np.roll(base, index * 8, axis=1)
+        cv2.putText(frame, f"frame {index}", (80, 200), cv2.FONT_HERSHEY_SIMPLEX, 4, (255, 255, 255), 8)
+        ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+        frames.append(buf.tobytes())
+    return frames
+
+
+def split_frames(data):
+    frames = []
+    start = data.find(b"\xff\xd8")
+    while start >= 0:
+        end = data.find(b"\xff\xd9", start + 2)
+        if end < 0:
+            break
+        frames.append(data[start : end + 2])
+        start = data.find(b"\xff\xd8", end + 2)
+    return frames
+
+
+def legacy_reader(stream, on_frame):
+    """The gst-launch loop before lib.jpeg_stream."""
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(8192)
+        if not chunk:
+            return
+        buffer.extend(chunk)
+        while True:
+            start = buffer.find(b"\xff\xd8")
+            if start < 0:
+                if len(buffer) > 2:
+                    del buffer[:-2]
+                break
+            end = buffer.find(b"\xff\xd9", start + 2)
+            if end < 0:
+                if start > 0:
+                    del buffer[:start]
+                break
+            jpg = bytes(buffer[start : end + 2])
+            del buffer[: end + 2]
+            on_frame(jpg)
+
+
+def splitter_reader(stream, on_frame):
+    splitter = JpegStreamSplitter(stream)
+    while (frames := splitter.read_frames()) is not None:
+        for jpg in frames:
+            on_frame(jpg)
+
+
+def _writer(fd, frames, total, fps):
+    interval = 1.0 / fps if fps else 0.0
+    next_due = time.perf_counter()
+    with os.fdopen(fd, "wb", buffering=0) as out:
+        for index in range(total):
+            if interval:
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_due += interval
+            view = memoryview(frames[index % len(frames)])
+            for offset in range(0, len(view), WRITE_SIZE):
+                out.write(view[offset : offset + WRITE_SIZE])
+
+
+def run(reader, frames, total, fps=None):
+    read_fd, write_fd = os.pipe()
+    received = []
+    writer = threading.Thread(target=_writer, args=(write_fd, frames, total, fps), daemon=True)
+    started = time.perf_counter()
+    writer.start()
+    cpu_started = time.thread_time()
+    with os.fdopen(read_fd, "rb", buffering=0) as stream:
+        reader(stream, lambda jpg: received.append(len(jpg)))
+    cpu = time.thread_time() - cpu_started
+    wall = time.perf_counter() - started
+    writer.join()
+    expected = [len(frames[i % len(frames)]) for i in range(total)]
+    assert received == expected, f"{reader.__name__} lost or corrupted frames"
+    return cpu, wall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="recorded concatenated JPEG stream")
+    parser.add_argument("--frames", type=int, default=120, help="synthetic frames to encode")
+    parser.add_argument("--fps", type=float, default=60.0, help="paced frame rate")
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of the paced run")
+    args = parser.parse_args()
+
+    if args.input:
+        frames = split_frames(Path(args.input).read_bytes())
+        label = args.input
+    else:
+        frames = synthetic_stream(args.frames)
+        label = "synthetic 1920x1080 q85"
+    if not frames:
+        raise SystemExit("no JPEG frames in input")
+    mean_kib = sum(len(f) for f in frames) / len(frames) / 1024
+    print(f"{label}: {len(frames)} frames, mean {mean_kib:.0f} KiB")
+
+    paced_total = int(args.fps * args.seconds)
+    for reader in (legacy_reader, splitter_reader):
+        cpu, wall = run(reader, frames, len(frames) * 5)
+        print(
+            f"{reader.__name__:16s} unpaced: {len(frames) * 5 / wall:7.1f} frames/s, "
+            f"{cpu / (len(frames) * 5) * 1e3:6.3f} ms CPU/frame"
+        )
+        cpu, wall = run(reader, frames, paced_total, fps=args.fps)
+        print(
+            f"{reader.__name__:16s} {args.fps:.0f} fps:  {cpu / paced_total * 1e3:6.3f} ms CPU/frame, "
+            f"{cpu / wall * 100:5.1f}% of a core"
+        )
+
+
+if __name__ == "__main__":
+    main()
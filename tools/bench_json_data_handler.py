@@ -0,0 +1,60 @@
+"""Benchmark JSONDataHandler.get_section with and without the parse cache.
+
+Measures the per-request cost of the lookup behind ``/api/sensors`` and the
+other ``data.json`` GET routes. "uncached" replays the old behaviour (open and
+``json.load`` the whole file on every call); "cached" is the current handler.
+
+    python tools/bench_json_data_handler.py [--file data/data.json] [--iterations 20000]
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from lib.json_data_handler import JSONDataHandler  # noqa: E402
+
+
+def _uncached_get_section(path, section):
+    with open(path, "r") as json_file:
+        return json.load(json_file).get(section, {})
+
+
+def _time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default=str(PROJECT_ROOT / "data" / "data.json"))
+    parser.add_argument("--section", default="imu")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / "data.json"
+        shutil.copy(args.file, data_file)
+        handler = JSONDataHandler(file_path=data_file)
+        handler.get_section(args.section)
+
+        before = _time_per_call(lambda: _uncached_get_section(data_file, args.section), args.iterations)
+        after = _time_per_call(lambda: handler.get_section(args.section), args.iterations)
+
+    size = Path(args.file).stat().st_size
+    print(f"file: {args.file} ({size} bytes), section: {args.section!r}, iterations: {args.iterations}")
+    print(f"uncached get_section: {before:8.2f} us/request")
+    print(f"cached get_section:   {after:8.2f} us/request")
+    print(f"speedup:              {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
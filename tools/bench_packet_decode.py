@@ -0,0 +1,65 @@
+"""Benchmark control telemetry v2 field extraction before and after lib.packet_schema.
+
+"sliced" replays the previous decoder: four ``struct.unpack`` calls on byte
+slices of the body, re-parsing format strings each time. "schema" is the
+compiled ``CONTROL_TELEMETRY_V2.unpack`` (one ``unpack_from`` per byte-order
+segment on a memoryview). "receiver" is the full ``decode_snapshot`` including
+the history record and the nested snapshot dict.
+
+    python tools/bench_packet_decode.py [--iterations 50000]
+"""
+
+import argparse
+import struct
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from lib.control_telemetry import NEW_FLOAT_COUNT, NEW_META_FORMAT, NEW_META_SIZE, decode_snapshot  # noqa: E402
+from lib.packet_schema import CONTROL_TELEMETRY_V2  # noqa: E402
+
+
+def _sliced_unpack(data):
+    body = data[:-4]
+    header = struct.unpack("!III", body[:12])
+    meta_end = 12 + NEW_META_SIZE
+    meta = struct.unpack(NEW_META_FORMAT, body[12:meta_end])
+    float_end = meta_end + NEW_FLOAT_COUNT * 4
+    floats = struct.unpack("<" + "f" * NEW_FLOAT_COUNT, body[meta_end:float_end])
+    tail = struct.unpack("<fH", body[float_end:])
+    return header + meta + floats + tail
+
+
+def _time_per_call(func, arg, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    values = (
+        [1, 2, 3, 4, 5, 6] + list(range(-3, 3)) + [80, -10] + [float(i) for i in range(NEW_FLOAT_COUNT)] + [7.5, 1575]
+    )
+    packet = CONTROL_TELEMETRY_V2.pack(*values)
+    view = memoryview(bytearray(packet))
+    assert _sliced_unpack(packet) == CONTROL_TELEMETRY_V2.unpack(view)
+
+    sliced = _time_per_call(_sliced_unpack, packet, args.iterations)
+    schema = _time_per_call(CONTROL_TELEMETRY_V2.unpack, view, args.iterations)
+    full = _time_per_call(lambda data: decode_snapshot(data, ("10.77.0.2", 5005), 0.0), view, args.iterations)
+    print(f"control telemetry v2 ({CONTROL_TELEMETRY_V2.size} B), iterations: {args.iterations}")
+    print(f"sliced struct.unpack: {sliced:6.2f} us/packet")
+    print(f"schema unpack:        {schema:6.2f} us/packet ({sliced / schema:.1f}x)")
+    print(f"receiver snapshot:    {full:6.2f} us/packet")
+
+
+if __name__ == "__main__":
+    main()
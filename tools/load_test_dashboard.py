@@ -0,0 +1,176 @@
+"""Load test a running dashboard server with browser-like pollers and MJPEG viewers.
+
+Each "session" replays the polling timers of an open PID tuning + pilot tab
+over a pool of at most six keep-alive connections, like a browser.
+Each "viewer" holds one MJPEG video stream open and counts frames. Reports
+request latency percentiles per endpoint and per-viewer frame rates.
+
+    python app.py --production   # or --dev, in another terminal
+    python tools/load_test_dashboard.py [--url http://127.0.0.1:5000] [--sessions 5] [--viewers 3]
+"""
+
+import argparse
+import http.client
+import queue
+import statistics
+import threading
+import time
+from urllib.parse import urlparse
+
+# (path, interval in seconds) per open tab, from pid_tuning.js and pilot.js.
+SESSION_TIMERS = (
+    ("/api/snapshot?sections=control_state,command,uplink,udp", 0.5),
+    ("/api/imu/status", 0.2),
+    ("/api/control/telemetry", 0.2),
+    ("/api/control/telemetry/history?limit=120", 0.1),
+    ("/api/sensors", 0.1),
+    ("/api/manipulator", 0.25),
+    ("/api/depth", 1.0),
+    ("/api/aruco-log", 1.0),
+    ("/api/lights", 3.0),
+)
+FRAME_BOUNDARY = b"--frame"
+CONNECTIONS_PER_SESSION = 6  # browsers' per-host HTTP/1.1 limit
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def add(self, path: str, latency_ms: float | None) -> None:
+        with self._lock:
+            if latency_ms is None:
+                self.errors[path] = self.errors.get(path, 0) + 1
+            else:
+                self.latencies.setdefault(path, []).append(latency_ms)
+
+
+def _connect(url):
+    return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=10.0)
+
+
+def _poll_timer(url, path, interval, pool, recorder, stop):
+    next_due = time.monotonic()
+    while not stop.is_set():
+        conn = pool.get()
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            res = conn.getresponse()
+            res.read()
+            recorder.add(path, (time.perf_counter() - start) * 1000.0 if res.status < 500 else None)
+        except (OSError, http.client.HTTPException):
+            recorder.add(path, None)
+            conn.close()
+            conn = _connect(url)
+        pool.put(conn)
+        next_due += interval
+        stop.wait(max(0.0, next_due - time.monotonic()))
+
+
+def _view_stream(url, path, result, stop):
+    conn = _connect(url)
+    try:
+        start = time.perf_counter()
+        conn.request("GET", path)
+        res = conn.getresponse()
+        if res.status in (302, 307):
+            # Feeds served by the MJPEG stream server (MJPEG_STREAM_PORT) redirect there.
+            location = urlparse(res.getheader("Location"))
+            res.read()
+            conn.close()
+            conn = _connect(location)
+            conn.request("GET", location.path + (f"?{location.query}" if location.query else ""))
+            res = conn.getresponse()
+        result["status"] = res.status
+        result["first_byte_ms"] = (time.perf_counter() - start) * 1000.0
+        while not stop.is_set() and res.status == 200:
+            chunk = res.read1(65536)
+            if not chunk:
+                break
+            result["bytes"] += len(chunk)
+            result["frames"] += chunk.count(FRAME_BOUNDARY)
+    except (OSError, http.client.HTTPException) as exc:
+        result["error"] = str(exc)
+    finally:
+        conn.close()
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--viewers", type=int, default=3)
+    parser.add_argument("--video-path", default="/video_feed")
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = []
+    viewers = [{"status": None, "first_byte_ms": None, "bytes": 0, "frames": 0} for _ in range(args.viewers)]
+
+    for result in viewers:
+        threads.append(threading.Thread(target=_view_stream, args=(url, args.video_path, result, stop), daemon=True))
+    pools = []
+    for _ in range(args.sessions):
+        pool = queue.Queue()
+        for _ in range(CONNECTIONS_PER_SESSION):
+            pool.put(_connect(url))
+        pools.append(pool)
+        for path, interval in SESSION_TIMERS:
+            threads.append(
+                threading.Thread(target=_poll_timer, args=(url, path, interval, pool, recorder, stop), daemon=True)
+            )
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=2.0)
+    for pool in pools:
+        while not pool.empty():
+            pool.get().close()
+
+    print(f"{args.url}: {args.sessions} sessions, {args.viewers} viewers of {args.video_path}, {args.duration:.0f} s")
+    print(f"{'endpoint':56} {'req/s':>7} {'err':>5} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  (ms)")
+    every = []
+    for path, _interval in SESSION_TIMERS:
+        values = recorder.latencies.get(path, [])
+        every.extend(values)
+        errors = recorder.errors.get(path, 0)
+        if not values:
+            print(f"{path[:56]:56} {0:7.1f} {errors:5d}")
+            continue
+        print(
+            f"{path[:56]:56} {len(values) / args.duration:7.1f} {errors:5d} "
+            f"{statistics.median(values):7.2f} {_percentile(values, 95):7.2f} "
+            f"{_percentile(values, 99):7.2f} {max(values):7.2f}"
+        )
+    if every:
+        total_errors = sum(recorder.errors.values())
+        print(
+            f"{'all requests':56} {len(every) / args.duration:7.1f} {total_errors:5d} "
+            f"{statistics.median(every):7.2f} {_percentile(every, 95):7.2f} "
+            f"{_percentile(every, 99):7.2f} {max(every):7.2f}"
+        )
+    for idx, result in enumerate(viewers):
+        first = result["first_byte_ms"]
+        print(
+            f"viewer {idx}: status {result['status']}, first byte "
+            f"{'--' if first is None else f'{first:.1f} ms'}, {result['frames'] / args.duration:.1f} frames/s, "
+            f"{result['bytes'] / args.duration / 1024:.0f} KiB/s"
+            + (f", error: {result['error']}" if "error" in result else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
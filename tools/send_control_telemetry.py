@@ -1,14 +1,12 @@
 import socket
-import struct
 import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from lib.crc import crc32_ieee
+from lib.packet_schema import CONTROL_TELEMETRY_V1  # noqa: E402
 
-AXES = ["surge", "sway", "heave", "roll", "pitch", "yaw"]
 PORT = 5005
 
 
@@ -19,16 +17,10 @@ def build_packet() -> bytes:
     outputs = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
     errors = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
 
-    body = struct.pack(">I", sequence)
-    body += struct.pack("<6f", *setpoints)
-    body += struct.pack("<6f", *outputs)
-    body += struct.pack("<6f", *errors)
-    body += struct.pack("<fH", 0.0, 1500)
+    packet = CONTROL_TELEMETRY_V1.pack(sequence, *setpoints, *outputs, *errors, 0.0, 1500)
+    crc = CONTROL_TELEMETRY_V1.crc_pair(packet)[0]
 
-    crc = crc32_ieee(body)
-    packet = body + struct.pack(">I", crc)
-
-    print(f"Packet size: {len(packet)} bytes (expected 86)")
+    print(f"Packet size: {len(packet)} bytes (expected {CONTROL_TELEMETRY_V1.size})")
     print(f"CRC: 0x{crc:08X}")
     return packet
 